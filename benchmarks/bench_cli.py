@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from reddit_get.cache import ListingCache
+from reddit_get.types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+
+def run_reddit_get(*args: str, env: dict[str, str]) -> str:
+    result = subprocess.run(
+        [sys.executable, '-c', 'from reddit_get.cli import main; main()', *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return result.stdout
+
+
+@pytest.fixture
+def env(tmp_path):
+    environment = {**os.environ, 'XDG_CACHE_HOME': str(tmp_path / 'cache'), 'XDG_DATA_HOME': str(tmp_path)}
+    for name in ('REDDIT_CLIENT_ID', 'REDDIT_CLIENT_SECRET'):
+        environment.pop(name, None)
+    return environment
+
+
+@pytest.mark.parametrize('limit', [10, 1000])
+def bench_post_against_stub_reddit(benchmark, stub_reddit_config, env, limit):
+    """A whole `reddit-get post` run, from interpreter start to output, against a local fake Reddit."""
+    benchmark.group = 'cli'
+    args = ('post', 'python', '--limit', str(limit), '--no-cache', '--config', str(stub_reddit_config))
+    output = benchmark.pedantic(run_reddit_get, args=args, kwargs={'env': env}, rounds=5, warmup_rounds=1)
+    assert len(output.splitlines()) == limit + 1
+
+
+def bench_post_from_cache(benchmark, env, tmp_path):
+    """A `reddit-get post` run that is answered from the listing cache."""
+    benchmark.group = 'cli'
+    key = ListingCache.key('python', SortingOption.TOP, TimeFilterOption.ALL, 10)
+    ListingCache(tmp_path / 'cache' / 'reddit-get').set(key, [{'title': f'Post {i}'} for i in range(10)], ttl=3600)
+    args = ('post', 'python', '--config', 'tests/.exampleconfig')
+    output = benchmark.pedantic(run_reddit_get, args=args, kwargs={'env': env}, rounds=10, warmup_rounds=1)
+    assert len(output.splitlines()) == 11
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from reddit_get.utils import load_configs
+
+
+def bench_load_configs(benchmark, monkeypatch):
+    for name in ('REDDIT_CLIENT_ID', 'REDDIT_CLIENT_SECRET'):
+        monkeypatch.delenv(name, raising=False)
+    benchmark.group = 'config'
+    _, configs = benchmark(load_configs, 'tests/.exampleconfig')
+    assert configs['reddit-get']['client_id'] == 'testid'
+
+
+def bench_load_configs_from_environment(benchmark, monkeypatch):
+    monkeypatch.setenv('REDDIT_CLIENT_ID', 'id')
+    monkeypatch.setenv('REDDIT_CLIENT_SECRET', 'secret')
+    benchmark.group = 'config'
+    _, configs = benchmark(load_configs, 'tests/.exampleconfig')
+    assert configs['reddit-get']['client_id'] == 'id'
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.templates import compile_template
+from reddit_get.types import (
+    SortingOption,
+    TimeFilterOption,
+)
+from reddit_get.utils import (
+    create_post_output,
+    get_template_keys,
+)
+
+OUTPUT_FORMAT = '- [{title}]({url}) by {author} ({score} points, {num_comments} comments)'
+
+
+@pytest.mark.parametrize('count', [10, 1_000, 100_000])
+def bench_create_post_output(benchmark, submissions, count):
+    posts = submissions(count)
+    benchmark.group = 'create_post_output'
+    rounds = 5 if count >= 100_000 else None
+    if rounds:
+        result = benchmark.pedantic(create_post_output, args=(OUTPUT_FORMAT, posts), rounds=rounds, warmup_rounds=1)
+    else:
+        result = benchmark(create_post_output, OUTPUT_FORMAT, posts)
+    assert len(result) == count
+
+
+def bench_get_template_keys(benchmark):
+    benchmark.group = 'templates'
+    assert benchmark(get_template_keys, OUTPUT_FORMAT) == {'title', 'url', 'author', 'score', 'num_comments'}
+
+
+def bench_compile_template_uncached(benchmark):
+    benchmark.group = 'templates'
+    benchmark(compile_template.__wrapped__, OUTPUT_FORMAT)
+
+
+def bench_create_header(benchmark):
+    benchmark.group = 'templates'
+    cli = RedditCli('tests/.exampleconfig')
+    header = benchmark(
+        cli.create_header,
+        '#### The {sorting} Posts for {time} from {subreddit}',
+        sorting=SortingOption.TOP,
+        time=TimeFilterOption.WEEK,
+        subreddit='python',
+    )
+    assert header == '#### The Top Posts for the Last Week from r/python'
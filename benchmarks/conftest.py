@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from reddit_get.projection import get_record_type
+from reddit_get.stub import StubRedditServer
+
+SUBMISSION_FIELDS = ('author', 'created_utc', 'num_comments', 'score', 'title', 'url')
+
+
+def make_submissions(count: int) -> list:
+    """Records shaped like the projected posts `post` renders."""
+    record_type = get_record_type(SUBMISSION_FIELDS)
+    return [
+        record_type(
+            f'user{index % 97}',
+            1_700_000_000.0 - index * 60,
+            index % 13,
+            1000 - index % 1000,
+            f'A reasonably long post title number {index} with some words in it',
+            f'https://example.com/{index}',
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(scope='session')
+def submissions():
+    """Synthetic submissions by count, built once per session."""
+    cache: dict[int, list] = {}
+
+    def get(count: int) -> list:
+        if count not in cache:
+            cache[count] = make_submissions(count)
+        return cache[count]
+
+    return get
+
+
+@pytest.fixture(scope='session')
+def stub_reddit_config(tmp_path_factory):
+    """A stub Reddit API running for the whole session, and a config file pointing at it."""
+    server = StubRedditServer(posts_per_subreddit=1000)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    config = tmp_path_factory.mktemp('stub') / 'config'
+    config.write_text(
+        '[reddit-get]\n'
+        'client_id = "stubid"\n'
+        'client_secret = "stubsecret"\n'
+        'user_agent = "reddit-get benchmarks"\n'
+        f'oauth_url = "{server.url}"\n'
+        f'reddit_url = "{server.url}"\n',
+    )
+    yield config
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    cast,
+)
+
+from .errors import (
+    fire_error,
+    is_fire_error,
+)
+from .utils import get_reddit_query_function
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Callable,
+        Iterator,
+        Sequence,
+    )
+    from contextlib import AbstractContextManager
+
+    from .types import SortingOption
+
+    ListingQuery = tuple[str, SortingOption, str, int]
+    RetryDelay = Callable[[Exception, int, int], float]
+
+
+def _import_asyncpraw() -> Any:
+    try:
+        import asyncpraw  # noqa: PLC0415
+    except ImportError as e:
+        msg = 'The async backend needs asyncpraw, install it with `pip install reddit-get[async]`'
+        raise fire_error(msg) from e
+    return asyncpraw
+
+
+def _subreddit_error(subreddit: str, error: Exception) -> Exception | None:
+    if any(
+        item.error_type in ('SUBREDDIT_NOEXIST', 'SUBREDDIT_NOTALLOWED') for item in getattr(error, 'items', ())
+    ):
+        failure: Exception = fire_error(f"Subreddit 'r/{subreddit}' does not exist or is private/restricted")
+        return failure
+    return None
+
+
+async def _with_retry(
+    make_call: Callable[[], Any],
+    retry_delay: RetryDelay,
+    api_exception: type[Exception],
+    max_retries: int = 3,
+) -> Any:
+    """Await `make_call()`, retrying rate limited calls like `RedditCli._execute_with_retry`."""
+    for attempt in range(max_retries):
+        try:
+            return await make_call()
+        except api_exception as e:
+            await asyncio.sleep(retry_delay(e, attempt, max_retries))
+        except Exception as e:  # pragma: no cover
+            if is_fire_error(e):
+                raise
+            msg = f'Error communicating with Reddit: {e!s}'
+            raise fire_error(msg) from e
+    msg = 'Maximum retry attempts exceeded'  # pragma: no cover
+    raise fire_error(msg)  # pragma: no cover
+
+
+async def _open_listing(
+    reddit: Any, query: ListingQuery, retry_delay: RetryDelay, api_exception: type[Exception],
+) -> AsyncIterator[Any]:
+    subreddit, sorting, time_filter, limit = query
+    try:
+        subreddit_obj = await reddit.subreddit(subreddit)
+    except api_exception as e:
+        error = _subreddit_error(subreddit, e)
+        if error:
+            raise error from e
+        raise
+    query_fn = get_reddit_query_function(subreddit_obj, time_filter, sorting)
+    # asyncpraw's subreddits have the same listing methods as PRAW's, which return async iterators
+    listing = aiter(cast('AsyncIterable[Any]', query_fn(limit=limit)))
+
+    async def next_post() -> Any:
+        return await anext(listing, None)
+
+    while (post := await _with_retry(next_post, retry_delay, api_exception)) is not None:
+        yield post
+
+
+async def fetch_listings(
+    configs: dict[str, str],
+    queries: Sequence[ListingQuery],
+    retry_delay: RetryDelay,
+    concurrency: int = 4,
+    guard: Callable[[str], AbstractContextManager[Any]] = lambda _: contextlib.nullcontext(),
+) -> list[list[Any]]:
+    """Fetch several listings concurrently over one asyncpraw session.
+
+    Args:
+        configs: The `reddit-get` section of the configs
+        queries: `(subreddit, sorting, time_filter, limit)` for each
+        listing
+        retry_delay: Decides how long to wait before retrying a failed
+        request, see `RedditCli._retry_delay`
+        concurrency: The maximum number of listings in flight at once
+        guard: Gets the context manager each listing is fetched in,
+        given its subreddit, e.g. to handle the errors of that listing
+
+    Returns:
+        The posts of each listing, in the order of `queries`. A listing
+        whose error the guard suppressed has no posts.
+
+    """
+    asyncpraw = _import_asyncpraw()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with asyncpraw.Reddit(**configs) as reddit:
+
+        async def fetch(query: ListingQuery) -> list[Any]:
+            async with semaphore:
+                # Stays empty when the guard handles an error of this listing, without failing the others
+                posts: list[Any] = []
+                with guard(query[0]):
+                    listing = _open_listing(reddit, query, retry_delay, asyncpraw.exceptions.RedditAPIException)
+                    posts.extend([post async for post in listing])
+                return posts
+
+        return list(await asyncio.gather(*(fetch(query) for query in queries)))
+
+
+def iter_listing(configs: dict[str, str], query: ListingQuery, retry_delay: RetryDelay) -> Iterator[Any]:
+    """Lazily get the posts of one listing with asyncpraw.
+
+    The listing is driven from synchronous code on a private event
+    loop, one post at a time, so streamed output works the same way it
+    does with the sync backend.
+    """
+    asyncpraw = _import_asyncpraw()
+    loop = asyncio.new_event_loop()
+
+    async def open_reddit() -> Any:
+        return asyncpraw.Reddit(**configs)
+
+    reddit = loop.run_until_complete(open_reddit())
+    try:
+        listing = _open_listing(reddit, query, retry_delay, asyncpraw.exceptions.RedditAPIException)
+        while (post := loop.run_until_complete(anext(listing, None))) is not None:
+            yield post
+    finally:
+        loop.run_until_complete(reddit.close())
+        loop.close()
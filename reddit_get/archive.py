@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from .cache import JSON_SCALARS
+from .errors import fire_error
+from .types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Iterator,
+    )
+
+# Rows written per transaction
+BATCH_SIZE = 500
+TIME_FILTER_SECONDS = {
+    TimeFilterOption.HOUR: 60 * 60,
+    TimeFilterOption.DAY: 24 * 60 * 60,
+    TimeFilterOption.WEEK: 7 * 24 * 60 * 60,
+    TimeFilterOption.MONTH: 30 * 24 * 60 * 60,
+    TimeFilterOption.YEAR: 365 * 24 * 60 * 60,
+    TimeFilterOption.ALL: None,
+}
+ORDER_BY = {
+    SortingOption.TOP: 'score DESC, created_utc DESC',
+    SortingOption.NEW: 'created_utc DESC',
+}
+# Submission attributes that are objects in PRAW and archived as their names
+NAMED_FIELDS = ('author', 'subreddit')
+
+# `pk` names the rowid, so that VACUUM keeps it and the full-text index stays in step
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS submissions (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    subreddit TEXT NOT NULL,
+    created_utc REAL NOT NULL,
+    score INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    archived_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_subreddit_created ON submissions (subreddit, created_utc);
+CREATE INDEX IF NOT EXISTS submissions_subreddit_score ON submissions (subreddit, score);
+'''
+
+# Archives from before `pk` keyed the submissions by id alone. Their table is copied into one
+# with `pk`, and their full-text index, keyed on the implicit rowid, is rebuilt.
+ADD_PK = '''
+BEGIN;
+DROP TRIGGER IF EXISTS submissions_text_insert;
+DROP TRIGGER IF EXISTS submissions_text_update;
+DROP TABLE IF EXISTS submissions_text;
+DROP INDEX IF EXISTS submissions_subreddit_created;
+DROP INDEX IF EXISTS submissions_subreddit_score;
+ALTER TABLE submissions RENAME TO submissions_without_pk;
+''' + SCHEMA + '''
+INSERT INTO submissions (id, subreddit, created_utc, score, data, archived_at)
+SELECT id, subreddit, created_utc, score, data, archived_at FROM submissions_without_pk ORDER BY rowid;
+DROP TABLE submissions_without_pk;
+COMMIT;
+'''
+
+# A full-text index of the title and selftext of each archived post, kept up to date by
+# triggers. Its rows share their rowid with the `pk` of the submission they index.
+SEARCH_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS submissions_text USING fts5(
+    title, selftext, tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS submissions_text_insert AFTER INSERT ON submissions BEGIN
+    INSERT INTO submissions_text (rowid, title, selftext)
+    VALUES (new.pk, json_extract(new.data, '$.title'), json_extract(new.data, '$.selftext'));
+END;
+CREATE TRIGGER IF NOT EXISTS submissions_text_update AFTER UPDATE OF data ON submissions
+WHEN json_extract(old.data, '$.title') IS NOT json_extract(new.data, '$.title')
+    OR json_extract(old.data, '$.selftext') IS NOT json_extract(new.data, '$.selftext')
+BEGIN
+    DELETE FROM submissions_text WHERE rowid = old.pk;
+    INSERT INTO submissions_text (rowid, title, selftext)
+    VALUES (new.pk, json_extract(new.data, '$.title'), json_extract(new.data, '$.selftext'));
+END;
+'''
+# Indexes the posts archived before the index existed
+BACKFILL_SEARCH = '''
+INSERT INTO submissions_text (rowid, title, selftext)
+SELECT pk, json_extract(data, '$.title'), json_extract(data, '$.selftext') FROM submissions
+'''
+# Matches in titles count this many times more than matches in the selftext
+TITLE_WEIGHT = 10.0
+
+UPSERT = '''
+INSERT INTO submissions (id, subreddit, created_utc, score, data, archived_at)
+VALUES (:id, :subreddit, :created_utc, :score, :data, :archived_at)
+ON CONFLICT (id) DO UPDATE SET
+    subreddit = excluded.subreddit,
+    created_utc = excluded.created_utc,
+    score = excluded.score,
+    data = excluded.data,
+    archived_at = excluded.archived_at
+'''
+
+
+def get_archive_path(path: str | None = None) -> Path:
+    """Get the SQLite database submissions are archived in.
+
+    Defaults to `$XDG_DATA_HOME/reddit-get/archive.sqlite3`, falling
+    back to `~/.local/share/reddit-get/archive.sqlite3`.
+    """
+    if path:
+        return Path(path).expanduser()
+    data_home = Path(os.getenv('XDG_DATA_HOME') or '~/.local/share').expanduser()
+    return data_home / 'reddit-get' / 'archive.sqlite3'
+
+
+def match_query(terms: str) -> str:
+    """Turn search terms into an FTS5 query that matches posts with all of them.
+
+    Each term is quoted, so that characters FTS5 treats as syntax are
+    searched for as text. A trailing '*' matches any word starting
+    with the term.
+
+    >>> match_query('rust async* C++')
+    '"rust" "async"* "C++"'
+    """
+    quoted = []
+    for term in terms.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*')
+        if term:
+            quoted.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(quoted)
+
+
+def archive_row(post: object, subreddit: str, archived_at: float) -> dict[str, Any] | None:
+    """Get the row to archive for `post`, or None if it has no id.
+
+    Only the data already loaded from the listing is archived, so this
+    never makes a request.
+    """
+    data = {
+        key: value
+        for key, value in vars(post).items()
+        if not key.startswith('_') and isinstance(value, JSON_SCALARS)
+    }
+    for field in NAMED_FIELDS:
+        value = vars(post).get(field)
+        if value is not None:
+            data[field] = str(value)
+    if 'id' not in data:
+        return None
+    data.setdefault('subreddit', subreddit)
+    return {
+        'id': data['id'],
+        'subreddit': str(data['subreddit']).lower(),
+        'created_utc': float(data.get('created_utc') or 0),
+        'score': int(data.get('score') or 0),
+        'data': json.dumps(data),
+        'archived_at': archived_at,
+    }
+
+
+class Archive:
+    """Every submission reddit-get has fetched, kept in a local SQLite database.
+
+    Submissions are keyed by their id, so archiving a post again
+    updates its score and other data. The database is opened in WAL
+    mode so that queries can run while another process is archiving.
+    The title and selftext of each post are kept in a full-text index,
+    see `search`.
+
+    Args:
+        path: The SQLite database file
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(self, path: Path, clock: Any = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.searchable = False
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+                columns = {row[1] for row in connection.execute('PRAGMA table_info(submissions)')}
+                connection.executescript(ADD_PK if columns and 'pk' not in columns else SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                raise fire_error(f'Could not open the archive {self.path}: {e}') from e
+            self.searchable = self._create_search_index(connection)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _create_search_index(connection: sqlite3.Connection) -> bool:
+        """Create the full-text index, returning whether SQLite supports it."""
+        exists = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'submissions_text'").fetchone()
+        try:
+            connection.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            # This SQLite was built without FTS5, posts are still archived
+            return False
+        if not exists:
+            with connection:
+                connection.execute(BACKFILL_SEARCH)
+        return True
+
+    def upsert(self, rows: Iterable[dict[str, Any]]) -> int:
+        """Insert or update `rows`, in one transaction per batch.
+
+        Returns:
+            The number of rows written
+
+        """
+        count = 0
+        batch: list[dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                count += self._write(batch)
+                batch = []
+        if batch:
+            count += self._write(batch)
+        return count
+
+    def _write(self, batch: list[dict[str, Any]]) -> int:
+        with self._lock, self.connection:
+            self.connection.executemany(UPSERT, batch)
+        return len(batch)
+
+    def archive(self, subreddit: str, posts: Iterable[object]) -> Iterator[object]:
+        """Pass `posts` through unchanged, archiving them in batches as they go by.
+
+        Whatever has gone by is archived even if iterating stops early.
+        """
+        pending: list[dict[str, Any]] = []
+        try:
+            for post in posts:
+                row = archive_row(post, subreddit, self.clock())
+                if row is not None:
+                    pending.append(row)
+                if len(pending) == BATCH_SIZE:
+                    self._write(pending)
+                    pending = []
+                yield post
+        finally:
+            if pending:
+                self._write(pending)
+
+    def query(
+        self, subreddit: str, sorting: SortingOption, time_filter: TimeFilterOption, limit: int,
+    ) -> list[SimpleNamespace]:
+        """Get the archived posts of `subreddit` the way Reddit would list them.
+
+        Raises:
+            fire.core.FireError: If the listing can not be answered from the archive
+
+        """
+        if sorting not in ORDER_BY:
+            msg = f'The archive can only sort posts by {" or ".join(option.value for option in ORDER_BY)}'
+            raise fire_error(msg)
+        sql = 'SELECT data FROM submissions WHERE subreddit = ?'
+        params: list[Any] = [subreddit.lower()]
+        window = TIME_FILTER_SECONDS[time_filter]
+        if window is not None:
+            sql += ' AND created_utc >= ?'
+            params.append(self.clock() - window)
+        sql += f' ORDER BY {ORDER_BY[sorting]} LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [SimpleNamespace(**json.loads(data)) for (data,) in rows]
+
+    def search(
+        self, terms: str, subreddit: str | None, time_filter: TimeFilterOption, limit: int, syntax: bool = False,
+    ) -> list[SimpleNamespace]:
+        """Get the archived posts whose title or selftext match `terms`, best match first.
+
+        Matches are ranked with BM25, a match in the title counting
+        `TITLE_WEIGHT` times as much as one in the selftext. Words are
+        matched regardless of case, accents and word endings, e.g.
+        "cats" finds "cat".
+
+        Args:
+            terms: The words every post must contain, see `match_query`
+            subreddit: Only search the posts of this subreddit
+            time_filter: Only search posts created within this window
+            limit: The most posts to get
+            syntax: Pass `terms` to FTS5 as a query instead, for OR,
+            NOT, "phrases" and NEAR
+
+        Raises:
+            fire.core.FireError: If the query is not valid or SQLite has
+            no full-text search
+
+        """
+        query = terms if syntax else match_query(terms)
+        if not query.strip():
+            raise fire_error('You must pass something to search for')
+        connection = self.connection
+        if not self.searchable:
+            raise fire_error('The SQLite library Python uses was built without full-text search (FTS5)')
+        sql = (
+            'SELECT s.data FROM submissions_text JOIN submissions AS s ON s.pk = submissions_text.rowid '
+            'WHERE submissions_text MATCH ?'
+        )
+        params: list[Any] = [query]
+        if subreddit:
+            sql += ' AND s.subreddit = ?'
+            params.append(subreddit.lower())
+        window = TIME_FILTER_SECONDS[time_filter]
+        if window is not None:
+            sql += ' AND s.created_utc >= ?'
+            params.append(self.clock() - window)
+        sql += f' ORDER BY bm25(submissions_text, {TITLE_WEIGHT}, 1.0), s.created_utc DESC, s.id LIMIT ?'
+        params.append(limit)
+        try:
+            with self._lock:
+                rows = connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise fire_error(f'Invalid search query {terms!r}: {e}') from e
+        return [SimpleNamespace(**json.loads(data)) for (data,) in rows]
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
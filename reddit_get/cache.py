@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from .projection import OPTIONAL_FIELDS
+from .revalidate import Validator
+from .types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterable,
+    )
+
+    from praw.models import Submission
+
+# How long, in seconds, a listing stays fresh. Sortings that only depend
+# on a time window (top, controversial) use the time filter TTLs below.
+SORTING_TTLS: dict[SortingOption, int] = {
+    SortingOption.GILDED: 60 * 60,
+    SortingOption.HOT: 5 * 60,
+    SortingOption.NEW: 30,
+    SortingOption.RANDOM_RISING: 0,
+    SortingOption.RISING: 60,
+}
+TIME_FILTER_TTLS: dict[TimeFilterOption, int] = {
+    TimeFilterOption.HOUR: 60,
+    TimeFilterOption.DAY: 10 * 60,
+    TimeFilterOption.WEEK: 60 * 60,
+    TimeFilterOption.MONTH: 3 * 60 * 60,
+    TimeFilterOption.YEAR: 12 * 60 * 60,
+    TimeFilterOption.ALL: 24 * 60 * 60,
+}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def get_cache_dir(cache_dir: str | None = None) -> Path:
+    """Get the directory reddit-get keeps its cached data in.
+
+    Defaults to `$XDG_CACHE_HOME/reddit-get`, falling back to
+    `~/.cache/reddit-get`.
+    """
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+    return Path(os.getenv('XDG_CACHE_HOME') or '~/.cache').expanduser() / 'reddit-get'
+
+
+def get_listing_ttl(sorting: SortingOption, time_filter: TimeFilterOption) -> int:
+    """Get the number of seconds a listing may be served from the cache.
+
+    >>> get_listing_ttl(SortingOption.NEW, TimeFilterOption.ALL)
+    30
+    >>> get_listing_ttl(SortingOption.TOP, TimeFilterOption.WEEK)
+    3600
+    """
+    if sorting in SORTING_TTLS:
+        return SORTING_TTLS[sorting]
+    return TIME_FILTER_TTLS[time_filter]
+
+
+def serialize_submission(post: Submission, fields: Iterable[str]) -> dict[str, Any]:
+    """Get the raw fields of a submission that can be stored as JSON.
+
+    All scalar fields PRAW already loaded from the listing are kept so
+    that other output templates can be served from the same entry. The
+    fields in `fields` are always included, objects such as the author
+    being stored as their display name.
+    """
+    record = {
+        key: value
+        for key, value in vars(post).items()
+        if not key.startswith('_') and isinstance(value, JSON_SCALARS)
+    }
+    for field in fields:
+        value = vars(post).get(field) if field in OPTIONAL_FIELDS else getattr(post, field)
+        record[field] = value if isinstance(value, JSON_SCALARS) else str(value)
+    return record
+
+
+class ListingCache:
+    """A size bounded, least recently used, on-disk cache of listings.
+
+    Each listing is stored as one JSON file named after a hash of its
+    query key. Reading an entry refreshes its modification time, which
+    is what the least recently used eviction is based on. Expired
+    listings stay until they are evicted, so that they can be
+    revalidated with Reddit, see `get_stale`.
+
+    Args:
+        directory: The directory to store the listings in
+        max_bytes: Once the listings take more space than this, the
+        least recently used ones are removed
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory / 'listings'
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+    @staticmethod
+    def key(subreddit: str, sorting: SortingOption, time_filter: TimeFilterOption, limit: int) -> str:
+        raw = json.dumps([subreddit.lower(), sorting.value, time_filter.value, limit])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, fields: Iterable[str]) -> list[SimpleNamespace] | None:
+        """Get the posts stored for `key`.
+
+        Returns:
+            The cached posts, or None if there is no fresh entry that
+            has all of `fields` for every post
+
+        """
+        entry = self._read(key, fields)
+        if entry is None or entry.get('expires_at', 0) <= self.clock():
+            return None
+        return [SimpleNamespace(**post) for post in entry['posts']]
+
+    def get_stale(self, key: str, fields: Iterable[str]) -> tuple[list[SimpleNamespace], Validator] | None:
+        """Get the posts of an expired entry for `key`, along with what is needed to revalidate them.
+
+        Returns:
+            The posts and their validator, or None if there is no
+            expired entry with a validator that has all of `fields`
+            for every post
+
+        """
+        entry = self._read(key, fields)
+        if entry is None or entry.get('expires_at', 0) > self.clock() or not entry.get('validator'):
+            return None
+        return [SimpleNamespace(**post) for post in entry['posts']], Validator(*entry['validator'])
+
+    def _read(self, key: str, fields: Iterable[str]) -> dict[str, Any] | None:
+        path = self.directory / f'{key}.json'
+        try:
+            entry = json.loads(path.read_text())
+            posts = entry['posts']
+            # Anything but the shape `set` writes is a miss, not an error
+            if not isinstance(entry.get('expires_at', 0), int | float) or not isinstance(posts, list):
+                return None
+            if entry.get('validator') is not None:
+                Validator(*entry['validator'])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if not all(isinstance(post, dict) and all(field in post for field in fields) for post in posts):
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def set(self, key: str, posts: list[dict[str, Any]], ttl: int, validator: Validator | None = None) -> None:
+        """Store the serialized `posts` for `key` for `ttl` seconds.
+
+        Args:
+            key: See `key`
+            posts: The serialized posts
+            ttl: Seconds the posts stay fresh
+            validator: Lets the entry be revalidated once it expired
+
+        """
+        if ttl <= 0:
+            return
+        now = self.clock()
+        self._write(key, {'stored_at': now, 'expires_at': now + ttl, 'posts': posts, 'validator': validator})
+
+    def refresh(self, key: str, ttl: int) -> None:
+        """Keep the entry for `key` for another `ttl` seconds, Reddit having confirmed it is still current."""
+        entry = self._read(key, ())
+        if entry is None or ttl <= 0:
+            return
+        entry['expires_at'] = self.clock() + ttl
+        self._write(key, entry)
+
+    def _write(self, key: str, entry: dict[str, Any]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(entry, tmp)
+            Path(tmp_name).replace(self.directory / f'{key}.json')
+        except OSError:  # pragma: no cover
+            # The cache is an optimization, failing to write it must never fail the command
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used listings until the cache fits in `max_bytes`."""
+        entries = []
+        for path in self.directory.glob('*.json'):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+            total -= size
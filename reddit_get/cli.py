@@ -1,16 +1,87 @@
 from __future__ import annotations
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+from pathlib import Path
 import sys
+import threading
 import time
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
-import fire
-import praw
-from praw.exceptions import (
-    MissingRequiredAttributeException,
-    RedditAPIException,
+from .archive import (
+    Archive,
+    get_archive_path,
+)
+from .cache import (
+    ListingCache,
+    get_cache_dir,
+    get_listing_ttl,
+    serialize_submission,
+)
+from .comments import (
+    COMMENT_SORT,
+    DEFAULT_COMMENT_CONCURRENCY,
+    DEFAULT_COMMENT_FORMAT,
+    CommentOptions,
+    flatten_comments,
+    map_ordered,
+    render_comments,
+)
+from .dedupe import (
+    DEDUPE_FIELDS,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WINDOW_DAYS,
+    DedupeIndex,
+)
+from .errors import (
+    fire_error,
+    is_fire_error,
+)
+from .fastpath import parse_fast_path
+from .filters import PostFilter
+from .marks import (
+    TIME_ORDERED_SORTINGS,
+    HighWaterMarks,
+    iter_unseen,
+    newest_mark,
+    remember_seen,
+)
+from .output import (
+    check_output_format,
+    export_records,
+    parse_fields,
+)
+from .projection import (
+    SubmissionRecord,
+    project_posts,
+)
+from .ratelimit import RateLimitScheduler
+from .revalidate import (
+    MAX_REVALIDATED_LIMIT,
+    ListingUnchanged,
+    Revalidation,
+    Validator,
+)
+from .subreddits import (
+    AVAILABLE,
+    SubredditCache,
+    SubredditInfo,
+    unavailable_status,
+)
+from .templates import (
+    CompiledTemplate,
+    compile_template,
+)
+from .timings import (
+    TRACE_FORMATS,
+    Timings,
+)
+from .tokens import (
+    TokenCache,
+    get_token_cache_path,
 )
-
 from .types import (
     SortingOption,
     TimeFilterOption,
@@ -22,14 +93,43 @@ from .utils import (
     get_response,
     get_template_keys,
     get_time_filter_option,
+    iter_post_output,
     load_configs,
+    parse_submission_ids,
+    parse_subreddits,
+)
+from .watch import (
+    DEFAULT_BUDGET,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    WatchedListing,
+    Watcher,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import (
+        Callable,
+        Collection,
+        Iterable,
+        Iterator,
+        Sequence,
+    )
+
+    import praw
+    from praw.exceptions import RedditAPIException
+    from praw.models import Submission
+    from prawcore.exceptions import TooManyRequests
+
+    from .aio import ListingQuery
 
 T = TypeVar('T')
 
+# Reddit stops paginating listings after about 1000 posts
+MAX_LIMIT = 1000
+# The most fullnames /api/info accepts per request
+INFO_BATCH_SIZE = 100
+BACKENDS = ('sync', 'async')
+
 
 class RedditCli:
     """Get content from reddit.
@@ -74,12 +174,119 @@ class RedditCli:
     Args:
         config: The path on your system for your reddit credentials config file.
         Default: ~/.redditgetrc. Ignored if environment variables are set.
+        cache_dir: Where to cache fetched listings. Default:
+        $XDG_CACHE_HOME/reddit-get or ~/.cache/reddit-get.
+        no_cache: Always fetch listings from Reddit instead of reusing
+        a recently cached copy. Use --no-cache to disable the cache.
+        backend: How to talk to Reddit, 'sync' (the default) uses PRAW
+        while 'async' uses asyncpraw and asyncio, which lets `batch`
+        keep many listings in flight over one connection pool. The async
+        backend needs `pip install reddit-get[async]`. It is only used
+        for listings, comments, `info` and `about` always use PRAW.
+        archive: Also keep every fetched post in the local archive, which
+        `reddit-get query` answers from. Use --archive to enable it.
+        archive_db: The SQLite database of the archive. Default:
+        $XDG_DATA_HOME/reddit-get/archive.sqlite3 or
+        ~/.local/share/reddit-get/archive.sqlite3.
+        record: Write every response from Reddit to this file, for
+        --replay. Access tokens are not written.
+        replay: Answer requests with the responses recorded in this file
+        instead of going to Reddit, e.g. to profile reddit-get offline.
+        The caches, high-water marks and archive start out empty and
+        are thrown away afterwards, unless --cache-dir or --archive-db
+        is given. Only the sync backend can record and replay.
+        replay_latency: Seconds to wait before each replayed response,
+        default 0. A negative value waits as long as the recorded
+        request took.
+        timings: Print how long loading the config, authenticating, each
+        listing and HTTP request, retry and rate limit waits and
+        rendering took to stderr once the command is done. Use --timings
+        to enable it. HTTP requests are only timed with the sync
+        backend.
+        trace: Also write the timings to this file as a JSON trace
+        trace_format: 'chrome' (the default) for the Trace Event Format
+        read by chrome://tracing and Perfetto, or 'otlp' for an
+        OpenTelemetry OTLP/JSON export
+        no_token_cache: Always request a new access token instead of
+        reusing one another reddit-get process got in the past hour.
+        Tokens are kept next to the config file, e.g. in
+        ~/.redditgetrc.tokens.json. Only the sync backend shares tokens.
+        dedupe: Drop posts that were already printed, by this or an
+        earlier run: the same post, posts linking to the same page
+        (which includes crossposts) and posts with nearly the same
+        title. Printed posts are remembered in dedupe.sqlite3 in the
+        cache directory.
+        dedupe_threshold: How similar two titles must be, between 0
+        and 1, for the later post to be dropped. Default 0.8
+        dedupe_days: How many days printed posts are remembered,
+        default 30
 
     """
 
-    def __init__(self, config: str = '~/.redditgetrc') -> None:
-        self.config_path, self.configs = load_configs(config)
-        self.reddit = self.get_authenticated_reddit_instance()
+    def __init__(
+        self,
+        config: str = '~/.redditgetrc',
+        cache_dir: str | None = None,
+        no_cache: bool = False,
+        backend: str = 'sync',
+        archive: bool = False,
+        archive_db: str | None = None,
+        record: str | None = None,
+        replay: str | None = None,
+        replay_latency: float = 0.0,
+        timings: bool = False,
+        trace: str | None = None,
+        trace_format: str = 'chrome',
+        no_token_cache: bool = False,
+        dedupe: bool = False,
+        dedupe_threshold: float = DEFAULT_THRESHOLD,
+        dedupe_days: float = DEFAULT_WINDOW_DAYS,
+    ) -> None:
+        self.timings = Timings(enabled=timings or bool(trace))
+        if trace_format not in TRACE_FORMATS:
+            raise fire_error(f'{trace_format} is not a valid trace format, choose from {", ".join(TRACE_FORMATS)}')
+        if self.timings.enabled:
+            # Fire prints the result after the command returns, report once everything is done
+            trace_path = Path(trace).expanduser() if trace else None
+            atexit.register(self._report_timings, timings, trace_path, trace_format)
+        if backend not in BACKENDS:
+            raise fire_error(f'{backend} is not a valid backend, choose from {", ".join(BACKENDS)}')
+        if record and replay:
+            raise fire_error('Use either --record or --replay, not both')
+        if (record or replay) and backend != 'sync':
+            raise fire_error('Only the sync backend can record and replay')
+        self.backend = backend
+        with self.timings.span('load_configs'):
+            self.config_path, self.configs = load_configs(config)
+        if replay:
+            import tempfile  # noqa: PLC0415
+
+            # Replayed responses may be stale and must never be served as live data later, nor may
+            # earlier cache hits stand in for them, so replays get stores of their own
+            self._replay_dir = tempfile.TemporaryDirectory(prefix='reddit-get-replay-')
+            cache_dir = cache_dir or self._replay_dir.name
+            archive_db = archive_db or str(Path(self._replay_dir.name) / 'archive.sqlite3')
+        self.cache_dir = get_cache_dir(cache_dir)
+        # One scheduler per process, shared by every request and persisted for the next run
+        # Replayed rate limit headers must not end up in the state of the real budget
+        self.scheduler = RateLimitScheduler(None if replay else self.cache_dir / 'ratelimit.json')
+        self.recording = Path(record).expanduser() if record else None
+        self.replaying = Path(replay).expanduser() if replay else None
+        self.replay_latency = replay_latency
+        # Replays never send the token request, so there is nothing to share
+        self.token_cache = (
+            None if no_token_cache or replay else TokenCache(get_token_cache_path(self.config_path))
+        )
+        self.cache = None if no_cache else ListingCache(self.cache_dir)
+        self.subreddits = None if no_cache else SubredditCache(self.cache_dir / 'subreddits.json')
+        self.revalidation = Revalidation()
+        self._reddit_lock = threading.Lock()
+        self.marks = HighWaterMarks(self.cache_dir / 'marks.json')
+        self.archive = Archive(get_archive_path(archive_db))
+        self.archive_posts = archive
+        self.dedupe = (
+            DedupeIndex(self.cache_dir / 'dedupe.sqlite3', dedupe_threshold, dedupe_days) if dedupe else None
+        )
 
         self.valid_header_variables: dict[str, dict[SortingOption | TimeFilterOption, str]] = {
             'sorting': {
@@ -101,6 +308,24 @@ class RedditCli:
             },
         }
 
+    @functools.cached_property
+    def reddit(self) -> praw.Reddit:
+        """The authenticated Reddit instance, only created once a request has to be made.
+
+        Creating it imports PRAW, which is skipped entirely when
+        everything can be answered from the cache. Threads that need it
+        at the same time share the one instance.
+        """
+        with self._reddit_lock:
+            # Another thread may have created it while this one waited
+            if 'reddit' in self.__dict__:
+                return self.__dict__['reddit']
+            with self.timings.span('authenticate'):
+                reddit = self.get_authenticated_reddit_instance()
+            # Stored before the lock is released, cached_property only stores it once this returns
+            self.__dict__['reddit'] = reddit
+            return reddit
+
     def get_authenticated_reddit_instance(self) -> praw.Reddit:
         """Create authenticated Reddit instance using OAuth2.
 
@@ -116,8 +341,30 @@ class RedditCli:
         Raises:
             fire.core.FireError: If required credentials are missing or invalid
         """
+        import praw  # noqa: PLC0415
+        from praw.exceptions import MissingRequiredAttributeException  # noqa: PLC0415
+
+        from .replay import (  # noqa: PLC0415
+            Recorder,
+            Replayer,
+        )
+        from .requestor import RedditGetRequestor  # noqa: PLC0415
+
+        requestor_kwargs = {
+            'scheduler': self.scheduler,
+            'recorder': Recorder(self.recording) if self.recording else None,
+            'replayer': Replayer(self.replaying, self.replay_latency) if self.replaying else None,
+            'timings': self.timings if self.timings.enabled else None,
+            'token_cache': self.token_cache,
+            'revalidation': self.revalidation,
+        }
+
         try:
-            reddit = praw.Reddit(**self.configs['reddit-get'])
+            reddit = praw.Reddit(
+                **self.configs['reddit-get'],
+                requestor_class=RedditGetRequestor,
+                requestor_kwargs=requestor_kwargs,
+            )
 
             # Check if we have username/password (user auth) or just client credentials (read-only)
             has_user_auth = 'username' in self.configs['reddit-get'] and 'password' in self.configs[
@@ -126,7 +373,7 @@ class RedditCli:
 
             if has_user_auth and not reddit.user.me():  # pragma: no cover
                 msg = 'Failed to authenticate with Reddit. Check your username and password.'
-                raise fire.core.FireError(msg)
+                raise fire_error(msg)
 
             # For read-only access, PRAW automatically uses application-only OAuth2
             # No need to verify - it will fail on first API call if credentials are invalid
@@ -137,7 +384,7 @@ class RedditCli:
                 f'Ensure client_id, client_secret, and user_agent are set via environment '
                 f'variables or config file.'
             )
-            raise fire.core.FireError(msg) from e
+            raise fire_error(msg) from e
 
     def config_location(self):
         """Get the path of the reddit-get config.
@@ -146,10 +393,14 @@ class RedditCli:
         """
         if self.config_path:
             return self.config_path.resolve()
-        raise fire.core.FireError('No config_path has been set!')
+        raise fire_error('No config_path has been set!')
 
     def _execute_with_retry(self, func: Callable[[], T], max_retries: int = 3) -> T:
-        """Execute a function with exponential backoff retry logic for rate limits.
+        """Execute a function with retry logic for rate limits.
+
+        Rate limited calls are retried once the rate limit window has
+        reset, or with exponential backoff when the reset time is not
+        known, see `RateLimitScheduler.retry_delay`.
 
         Args:
             func: Function to execute (should return an iterable)
@@ -161,32 +412,53 @@ class RedditCli:
         Raises:
             fire.core.FireError: If max retries exceeded or other API errors occur
         """
+        from praw.exceptions import RedditAPIException  # noqa: PLC0415
+        from prawcore.exceptions import TooManyRequests  # noqa: PLC0415
+
         for attempt in range(max_retries):
             try:
                 return func()
-            except RedditAPIException as e:
-                # Check if it's a rate limit error
-                if any(item.error_type == 'RATELIMIT' for item in e.items):
-                    if attempt < max_retries - 1:
-                        wait_time = 2**attempt  # Exponential backoff: 1s, 2s, 4s
-                        time.sleep(wait_time)
-                        continue
-                    msg = (
-                        'Reddit API rate limit exceeded. Please wait a minute and try again. '
-                        'Consider reducing the number of requests or using a higher tier API key.'
-                    )
-                    raise fire.core.FireError(msg) from e
-
-                # Handle other Reddit API errors
-                error_details = ', '.join(f'{item.error_type}: {item.message}' for item in e.items)
-                msg = f'Reddit API error: {error_details}'
-                raise fire.core.FireError(msg) from e
+            except ListingUnchanged:
+                raise
+            except (RedditAPIException, TooManyRequests) as e:
+                delay = self._retry_delay(e, attempt, max_retries)
+                with self.timings.span('retry_sleep', attempt=attempt + 1, error=type(e).__name__):
+                    time.sleep(delay)
             except Exception as e:  # pragma: no cover
                 # Handle network errors and other exceptions
                 msg = f'Error communicating with Reddit: {e!s}'
-                raise fire.core.FireError(msg) from e
+                raise fire_error(msg) from e
         msg = 'Maximum retry attempts exceeded'
-        raise fire.core.FireError(msg)
+        raise fire_error(msg)
+
+    def _retry_delay(
+        self, error: RedditAPIException | TooManyRequests, attempt: int, max_retries: int,
+    ) -> float:
+        """Get how many seconds to wait before retrying a request that failed with `error`.
+
+        Both backends share this, asyncpraw raises its own exception
+        class with the same `items`.
+
+        Raises:
+            fire.core.FireError: If the request should not be retried
+
+        """
+        # Check if it's a rate limit error, HTTP 429 responses have no items
+        items = getattr(error, 'items', None)
+        if items is None or any(item.error_type == 'RATELIMIT' for item in items):
+            if attempt < max_retries - 1:
+                retry_after = getattr(error, 'retry_after', None)
+                return float(retry_after) if retry_after else self.scheduler.retry_delay(attempt)
+            msg = (
+                'Reddit API rate limit exceeded. Please wait a minute and try again. '
+                'Consider reducing the number of requests or using a higher tier API key.'
+            )
+            raise fire_error(msg) from error
+
+        # Handle other Reddit API errors
+        error_details = ', '.join(f'{item.error_type}: {item.message}' for item in items or ())
+        msg = f'Reddit API error: {error_details}'
+        raise fire_error(msg) from error
 
     def create_header(
         self, template: str, sorting: SortingOption, time: TimeFilterOption, subreddit: str,
@@ -194,7 +466,7 @@ class RedditCli:
         valid_keys = {'sorting', 'time', 'subreddit'}
         keys = get_template_keys(template)
         if keys and not keys.issubset(valid_keys):
-            raise fire.core.FireError(
+            raise fire_error(
                 f'Invalid keys passed into header template: {", ".join(keys - valid_keys)}',
             )
         format_params = {
@@ -202,7 +474,7 @@ class RedditCli:
             'time': self.valid_header_variables['time_filter'][time],
             'subreddit': f'r/{subreddit}',
         }
-        return template.format(**format_params)
+        return compile_template(template).render(format_params, dict.__getitem__)
 
     def post(
         self,
@@ -213,7 +485,25 @@ class RedditCli:
         header: bool = True,
         custom_header: str = '#### The {sorting} Posts for {time} from {subreddit}',
         output_format: str = '- {title}',
-    ) -> list[str]:
+        stream: bool = False,
+        incremental: bool = False,
+        output: str = 'text',
+        fields: str | list[str] | tuple[str, ...] | None = None,
+        output_file: str | None = None,
+        comments: int = 0,
+        comment_depth: int = 1,
+        replace_more: int = 0,
+        comment_format: str = DEFAULT_COMMENT_FORMAT,
+        comment_concurrency: int = DEFAULT_COMMENT_CONCURRENCY,
+        min_score: int | None = None,
+        min_comments: int | None = None,
+        flair: str | list[str] | tuple[str, ...] | None = None,
+        domain: str | None = None,
+        nsfw: bool | None = None,
+        title_pattern: str | None = None,
+        max_age: float | None = None,
+        min_age: float | None = None,
+    ) -> list[str] | None:
         r"""Get Reddit post titles optionally formatted as markdown.
 
         This is a handy script for someone who is looking to get reddit
@@ -231,7 +521,8 @@ class RedditCli:
             choose the date range between 'hour', 'day', 'week',
             'month', 'year', or 'all'
             limit: Limit of the number of posts to get, default 10,
-            limit 25
+            limit 1000. Reddit returns listings in pages of 100 posts
+            so larger limits take one request per page.
             header: Whether or not to include a header in the result.
             Default is true, use --noheader if you do not want a header.
             custom_header: Template to use for a custom header for the
@@ -263,44 +554,1243 @@ class RedditCli:
                 Text - Nothing, they fast
                  👍
 
+            stream: Print each post as soon as its page has been
+            fetched instead of returning all of them at the end. Memory
+            use stays the same no matter the limit, which makes this
+            the best choice for large limits. Streamed listings are
+            read from but not written to the cache.
+            incremental: Only get posts that no previous incremental run
+            for the same subreddit and sorting returned. Meant for
+            polling 'new', where paginating stops as soon as an already
+            seen post is reached. With other sortings the posts returned
+            are remembered and left out. Nothing, not even the header,
+            is returned when there are no new posts. Incremental runs
+            never use the cache.
+            output: 'text' (the default) renders each post with
+            output_format. 'ndjson' and 'csv' write the chosen fields of
+            each post as one JSON object or CSV row per line, as soon as
+            the post has been fetched. 'parquet' and 'arrow' (an Arrow
+            IPC stream) write them as columns, which needs
+            `pip install reddit-get[arrow]`. Neither the header nor the
+            output_format template is used for these.
+            fields: The post fields to write with a non-text output,
+            e.g. "title,score,url". Defaults to the fields used in
+            output_format.
+            output_file: Where to write a non-text output to, instead of
+            standard output.
+            comments: Print up to this many top-level comments under
+            each post, in Reddit's default ("best") order. The comments
+            of several posts are fetched at the same time, and with
+            --stream each post is printed as soon as its comments have
+            arrived. Only for text output.
+            comment_depth: How many levels of comments to print, 1 (the
+            default) for top-level comments only. Replies are indented
+            under the comment they reply to.
+            replace_more: How many "load more comments" links to follow
+            for each post, each costing one more request. Default 0.
+            comment_format: The template for each comment, like
+            output_format but with the fields of a comment, e.g. body,
+            author and score. Default "  - {author}: {body}"
+            comment_concurrency: The most comment trees to fetch at the
+            same time, default 8
+            min_score: Only include posts with at least this score
+            min_comments: Only include posts with at least this many
+            comments
+            flair: Only include posts with one of these flairs, ignoring
+            case, e.g. "News,Discussion"
+            domain: Only include posts linking to this domain or one of
+            its subdomains, e.g. "github.com"
+            nsfw: Use --nonsfw to leave out posts marked NSFW, or --nsfw
+            to only include them
+            title_pattern: Only include posts whose title matches this
+            regular expression, e.g. "(?i)rust"
+            max_age: Only include posts created at most this many hours
+            ago
+            min_age: Only include posts created at least this many hours
+            ago
+
+            With any of these filters, limit is the number of matching
+            posts to get. Posts are checked as the listing is read,
+            which stops as soon as enough posts matched, once 'new'
+            posts are older than max_age, or after 1000 posts. Filtered
+            listings are not written to the cache.
+
         Returns:
             The number of post titles from the specified subreddit
-            formatted as specified
+            formatted as specified, or None when streaming or writing a
+            non-text output
+
+        """
+        if not 0 < limit <= MAX_LIMIT:
+            raise fire_error(f'You may only get between 1 and {MAX_LIMIT} submissions')
+
+        sorting = get_post_sorting_option(post_sorting)
+        comment_options = None
+        if comments:
+            if output != 'text':
+                raise fire_error('Comments can only be included in text output')
+            comment_options = CommentOptions(comments, comment_depth, replace_more, comment_format, comment_concurrency)
+            comment_options.check()
+        post_filter = PostFilter(min_score, min_comments, flair, domain, nsfw, title_pattern, max_age, min_age)
+        # Comments are fetched by post id
+        extra_fields = ('id',) if comment_options else ()
+        if output != 'text':
+            self._export_listing(
+                subreddit=subreddit,
+                sorting=sorting,
+                time_filter=time_filter,
+                limit=limit,
+                output=output,
+                fields=parse_fields(fields) if fields else compile_template(output_format).field_names,
+                output_file=output_file,
+                incremental=incremental,
+                post_filter=post_filter,
+            )
+            return None
+        if stream:
+            self._stream_listing(
+                subreddit=subreddit,
+                sorting=sorting,
+                time_filter=time_filter,
+                limit=limit,
+                header=header,
+                custom_header=custom_header,
+                output_format=output_format,
+                incremental=incremental,
+                comments=comment_options,
+                post_filter=post_filter,
+            )
+            return None
+
+        template = compile_template(output_format)
+        post_fields = self._post_fields(template.keys | frozenset(extra_fields))
+        if incremental or post_filter.active:
+            posts = list(
+                self._iter_posts(
+                    subreddit,
+                    sorting,
+                    get_time_filter_option(time_filter),
+                    limit,
+                    post_fields,
+                    incremental,
+                    post_filter,
+                    cacheable=not template.nested,
+                ),
+            )
+            if incremental and not posts:
+                return []
+        else:
+            posts = self._fetch_posts(subreddit, sorting, time_filter, limit, template, extra_fields)
+        return self._render_listing(
+            subreddit=subreddit,
+            sorting=sorting,
+            time_filter=time_filter,
+            posts=posts,
+            header=header,
+            custom_header=custom_header,
+            output_format=output_format,
+            comments=comment_options,
+        )
+
+    def batch(
+        self,
+        subreddits: str | list[str] | tuple[str, ...] = (),
+        manifest: str | None = None,
+        post_sorting: str = 'top',
+        time_filter: str = 'all',
+        limit: int = 10,
+        header: bool = True,
+        custom_header: str = '#### The {sorting} Posts for {time} from {subreddit}',
+        output_format: str = '- {title}',
+        concurrency: int = 4,
+    ) -> list[str]:
+        """Get posts from several subreddits in one run.
+
+        All listings are fetched concurrently over the single
+        authenticated Reddit session held by this instance, so only one
+        OAuth token is requested no matter how many subreddits are
+        queried. The output is always in the order the subreddits were
+        given, regardless of which listing finished first.
+
+        Args:
+            subreddits: The subreddits to get posts from, either as a
+            comma separated string (e.g. "news,worldnews") or a list
+            manifest: Optional path to a file with one subreddit per
+            line. Blank lines and lines starting with '#' are ignored.
+            Subreddits from the manifest are appended to `subreddits`.
+            post_sorting: See `reddit-get post --help`
+            time_filter: See `reddit-get post --help`
+            limit: See `reddit-get post --help`
+            header: Whether or not to include a header for each
+            subreddit
+            custom_header: See `reddit-get post --help`
+            output_format: See `reddit-get post --help`
+            concurrency: The maximum number of listings to fetch at the
+            same time, default 4
+
+        Returns:
+            The output of `reddit-get post` for each subreddit, in input
+            order
+
+        """
+        names = parse_subreddits(subreddits, manifest)
+        if not names:
+            raise fire_error('You must pass at least one subreddit to batch')
+        if concurrency < 1:
+            raise fire_error('Concurrency must be at least 1')
+        names = self._skip_unavailable(names)
+
+        if not 0 < limit <= MAX_LIMIT:
+            raise fire_error(f'You may only get between 1 and {MAX_LIMIT} submissions')
+
+        sorting = get_post_sorting_option(post_sorting)
+        skipped: set[str] = set()
+        listings = self._fetch_many(
+            [(name, sorting, time_filter, limit) for name in names],
+            template=compile_template(output_format),
+            concurrency=concurrency,
+            skipped=skipped,
+        )
+        return [
+            line
+            for name, posts in zip(names, listings, strict=True)
+            if name not in skipped
+            for line in self._render_listing(
+                subreddit=name,
+                sorting=sorting,
+                time_filter=time_filter,
+                posts=posts,
+                header=header,
+                custom_header=custom_header,
+                output_format=output_format,
+            )
+        ]
+
+    def watch(
+        self,
+        subreddits: str | list[str] | tuple[str, ...] = (),
+        manifest: str | None = None,
+        post_sorting: str = 'new',
+        time_filter: str = 'all',
+        limit: int = 25,
+        output_format: str = '- r/{subreddit}: {title}',
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        budget: float = DEFAULT_BUDGET,
+        max_polls: int | None = None,
+    ) -> None:
+        """Keep polling subreddits and print their new posts as they appear.
+
+        This replaces running `reddit-get post --incremental` in a
+        loop: the config is loaded and the OAuth token requested once,
+        and each subreddit is polled as often as it gets new posts. A
+        busy subreddit is polled up to every `min_interval` seconds,
+        a quiet one backs off to every `max_interval` seconds. Polls of
+        all subreddits together stay within `budget` per minute, on top
+        of the pacing based on Reddit's rate limit headers. Posts are
+        only printed once, the high-water marks are the ones
+        `reddit-get post --incremental` uses. Stop it with Ctrl-C.
+
+        Args:
+            subreddits: The subreddits to watch, either as a comma
+            separated string (e.g. "news,worldnews") or a list
+            manifest: See `reddit-get batch --help`
+            post_sorting: See `reddit-get post --help`, default new
+            time_filter: See `reddit-get post --help`
+            limit: The most posts to get per poll, default 25
+            output_format: See `reddit-get post --help`, default
+            "- r/{subreddit}: {title}"
+            min_interval: The shortest time between two polls of a
+            subreddit, in seconds, default 30
+            max_interval: The longest time between two polls of a
+            subreddit, in seconds, default 900
+            budget: The most polls per minute over all subreddits,
+            default 60
+            max_polls: Stop after this many polls instead of running
+            until interrupted
 
         """
-        if not 0 < limit <= 25:
-            raise fire.core.FireError('You may only get between 1 and 25 submissions')
+        names = parse_subreddits(subreddits, manifest)
+        if not names:
+            raise fire_error('You must pass at least one subreddit to watch')
+        if not 0 < limit <= MAX_LIMIT:
+            raise fire_error(f'You may only get between 1 and {MAX_LIMIT} submissions')
+        if not 0 < min_interval <= max_interval:
+            raise fire_error('The minimum interval must be positive and at most the maximum interval')
+        if budget <= 0:
+            raise fire_error('The budget must be positive')
+        sorting = get_post_sorting_option(post_sorting)
+        template = compile_template(output_format)
+        listings = [WatchedListing(name, sorting, limit, min_interval, max_interval) for name in names]
+
+        def poll(listing: WatchedListing) -> int:
+            try:
+                unseen = self._iter_unseen(listing.subreddit, sorting, time_filter, limit)
+                posts = list(project_posts(unseen, self._post_fields(template.keys)))
+            except Exception as e:
+                if not is_fire_error(e):
+                    raise
+                # Keep watching the other subreddits, this one backs off
+                print(f'Could not poll r/{listing.subreddit}: {e}', file=sys.stderr, flush=True)  # noqa: T201
+                return 0
+            # Oldest first, so the output reads like a feed
+            for line in iter_post_output(output_format, self._deduplicated(reversed(posts))):
+                print(line, flush=True)  # noqa: T201
+            return len(posts)
+
+        with contextlib.suppress(KeyboardInterrupt):
+            Watcher(listings, budget).run(poll, max_polls)
+
+    def feed(
+        self,
+        subreddits: str | list[str] | tuple[str, ...] = (),
+        manifest: str | None = None,
+        post_sorting: str = 'hot',
+        time_filter: str = 'day',
+        limit: int = 100,
+        top: int = 25,
+        rank: str = 'score',
+        header: bool = True,
+        custom_header: str = '#### The {sorting} Posts for {time} from {subreddit}',
+        output_format: str = '- r/{subreddit}: {title}',
+        concurrency: int = 4,
+    ) -> list[str]:
+        """Merge the posts of several subreddits into one feed, ranked across all of them.
+
+        The listing of each subreddit is read as it arrives and every
+        post is offered to a bounded heap of the best `top` posts, so
+        only those stay in memory however many subreddits are merged.
+        When the listings are already in the order of the ranking, e.g.
+        'top' posts ranked by score, a listing stops being read once
+        its posts can no longer make it into the feed.
 
+        Args:
+            subreddits: The subreddits to merge, either as a comma
+            separated string (e.g. "news,worldnews") or a list
+            manifest: See `reddit-get batch --help`
+            post_sorting: See `reddit-get post --help`, default hot
+            time_filter: See `reddit-get post --help`, default day
+            limit: The most posts to read from each subreddit, default
+            100
+            top: How many posts the feed has, default 25
+            rank: What to rank posts by, highest first. One of 'score'
+            (the default), 'comments', 'velocity' (comments per hour
+            since the post was created) or 'new', or an expression over
+            post fields, e.g. "score + 10 * num_comments / max(age_hours, 1)".
+            Expressions may use numbers, + - * / // % **, the age_hours
+            and age_seconds of the post and the functions abs, log,
+            log10, max, min and sqrt.
+            header: Whether or not to include a header
+            custom_header: See `reddit-get post --help`. The subreddit
+            is given as a multireddit, e.g. r/news+worldnews.
+            output_format: See `reddit-get post --help`, default
+            "- r/{subreddit}: {title}"
+            concurrency: The maximum number of listings to read at the
+            same time, default 4
+
+        Returns:
+            The `top` best ranked posts of all subreddits, formatted as
+            specified
+
+        """
+        from .feed import (  # noqa: PLC0415
+            TopN,
+            compile_ranking,
+        )
+
+        names = parse_subreddits(subreddits, manifest)
+        if not names:
+            raise fire_error('You must pass at least one subreddit to feed')
+        if not 0 < limit <= MAX_LIMIT:
+            raise fire_error(f'You may only get between 1 and {MAX_LIMIT} submissions')
+        if top < 1:
+            raise fire_error('The feed must have at least one post')
+        if concurrency < 1:
+            raise fire_error('Concurrency must be at least 1')
         sorting = get_post_sorting_option(post_sorting)
+        time_filter_option = get_time_filter_option(time_filter)
+        template = compile_template(output_format)
+        ranking = compile_ranking(rank)
+        names = self._skip_unavailable(names)
+        best: TopN[SubmissionRecord] = TopN(top)
+        now = time.time()
+        skipped: set[str] = set()
+
+        def merge(index: int) -> None:
+            fields = self._post_fields(template.keys | ranking.fields)
+            posts = self._iter_cached_or_live(
+                names[index],
+                sorting,
+                time_filter_option,
+                limit,
+                fields,
+                cacheable=not template.nested,
+                skipped=skipped,
+            )
+            ordered = ranking.orders(sorting)
+            for position, post in enumerate(posts):
+                rank = ranking({field: getattr(post, field) for field in ranking.fields}, now)
+                # Equally ranked posts are in the order of the subreddits, then of the listing
+                kept = best.offer(post, rank, order=index * MAX_LIMIT + position)
+                if ordered and not kept:
+                    # The rest of the listing ranks lower still, and reading it would cost requests
+                    break
+
+        with self.timings.span('merge', subreddits=len(names)):
+            list(map_ordered(merge, range(len(names)), concurrency))
+        return self._render_listing(
+            subreddit='+'.join(name for name in names if name not in skipped),
+            sorting=sorting,
+            time_filter=time_filter,
+            posts=best.items(),
+            header=header,
+            custom_header=custom_header,
+            output_format=output_format,
+        )
+
+    def info(
+        self,
+        ids: str | list[str] | tuple[str, ...] = (),
+        id_file: str | None = None,
+        output_format: str = '- {title}',
+        concurrency: int = 4,
+        output: str = 'text',
+        fields: str | list[str] | tuple[str, ...] | None = None,
+        output_file: str | None = None,
+    ) -> list[str] | None:
+        """Get the current data of submissions by their ids, e.g. to refresh their score.
+
+        Reddit's /api/info endpoint returns up to 100 submissions per
+        request. The ids are split into batches of 100 and several
+        batches are requested at the same time over the one session.
+        Ids Reddit does not know, e.g. of removed submissions, are
+        reported on standard error.
+
+        Args:
+            ids: The submissions, as a comma separated string (e.g.
+            "1abcde,t3_2fghij") or a list. Bare ids, fullnames and links
+            to the submissions are accepted.
+            id_file: Optional path to a file with one id per line. Blank
+            lines and lines starting with '#' are ignored.
+            output_format: See `reddit-get post --help`
+            concurrency: The most batches to request at the same time,
+            default 4
+            output: See `reddit-get post --help`
+            fields: See `reddit-get post --help`
+            output_file: See `reddit-get post --help`
+
+        Returns:
+            Each submission formatted with output_format, in the order
+            of the ids, or None when writing a non-text output
+
+        """
+        fullnames = parse_submission_ids(ids, id_file)
+        if not fullnames:
+            raise fire_error('You must pass at least one submission id to info')
+        if concurrency < 1:
+            raise fire_error('Concurrency must be at least 1')
+        template = compile_template(output_format)
+        export_fields = parse_fields(fields) if fields else template.field_names
+        if output != 'text':
+            check_output_format(output)
+
+        batches = [fullnames[start:start + INFO_BATCH_SIZE] for start in range(0, len(fullnames), INFO_BATCH_SIZE)]
+        found = (post for _, posts in map_ordered(self._fetch_info, batches, concurrency) for post in posts)
+        if output != 'text':
+            records = project_posts(found, self._post_fields(export_fields))
+            export_records(self._deduplicated(records), export_fields, output, output_file)
+            return None
+        return self._render_posts(output_format, list(project_posts(found, self._post_fields(template.keys))))
+
+    def about(
+        self,
+        subreddits: str | list[str] | tuple[str, ...] = (),
+        manifest: str | None = None,
+        refresh: bool = False,
+        concurrency: int = 4,
+        output_format: str = '- r/{name}: {status}, {subscribers} subscribers',
+    ) -> list[str]:
+        """Check whether subreddits can be read, and how many subscribers they have.
+
+        What is known about each subreddit is kept in the cache
+        directory: whether it exists and can be read, its display name
+        and subscriber count. Every listing fetched updates it, and
+        listings of subreddits known to be missing, banned, private or
+        quarantined are not requested again for a day. `batch` and
+        `feed` leave those subreddits out, `post` fails right away.
+        Subreddits that are not in the cache, or whose subscriber count
+        is not known, are looked up on Reddit.
+
+        Args:
+            subreddits: The subreddits to check, either as a comma
+            separated string (e.g. "news,worldnews") or a list
+            manifest: See `reddit-get batch --help`
+            refresh: Look every subreddit up on Reddit, even if it is
+            in the cache
+            concurrency: The most subreddits to look up at the same
+            time, default 4
+            output_format: The template for each subreddit, with the
+            keywords 'name', 'status' (available, missing, banned,
+            private, quarantined or restricted) and 'subscribers'
+
+        Returns:
+            A line for each subreddit, in input order
+
+        """
+        names = parse_subreddits(subreddits, manifest)
+        if not names:
+            raise fire_error('You must pass at least one subreddit to about')
+        if concurrency < 1:
+            raise fire_error('Concurrency must be at least 1')
+        template = compile_template(output_format)
+        valid_keys = {'name', 'status', 'subscribers'}
+        if not template.keys or not template.keys <= valid_keys:
+            raise fire_error(f'The about output template can only use {", ".join(sorted(valid_keys))}')
+
+        def lookup(name: str) -> SubredditInfo:
+            known = self.subreddits.get(name) if self.subreddits is not None and not refresh else None
+            if known is not None and (not known.available or known.subscribers is not None):
+                return known
+            return self._fetch_about(name)
+
+        lines = []
+        for _, info in map_ordered(lookup, names, concurrency):
+            values = {
+                'name': info.name,
+                'status': info.status,
+                'subscribers': 'unknown' if info.subscribers is None else info.subscribers,
+            }
+            lines.append(template.render(values, dict.__getitem__))
+        return lines
+
+    def query(
+        self,
+        subreddit: str,
+        post_sorting: str = 'top',
+        time_filter: str = 'week',
+        limit: int = 10,
+        header: bool = True,
+        custom_header: str = '#### The {sorting} Posts for {time} from {subreddit}',
+        output_format: str = '- {title}',
+    ) -> list[str]:
+        """Get posts from the local archive without going to Reddit.
+
+        Only posts that were fetched with --archive are in the archive,
+        with the score they had when they were last fetched.
+
+        Args:
+            subreddit: Which subreddit to get posts from
+            post_sorting: 'top' for the highest scoring posts or 'new'
+            for the newest
+            time_filter: Only include posts created within the past
+            'hour', 'day', 'week' (the default), 'month', 'year', or
+            'all' for every archived post
+            limit: Limit of the number of posts to get, default 10
+            header: See `reddit-get post --help`
+            custom_header: See `reddit-get post --help`
+            output_format: See `reddit-get post --help`. Fields that
+            are objects in PRAW, such as the author, are archived as
+            their names.
+
+        Returns:
+            The archived posts formatted like `reddit-get post` would
+
+        """
+        if limit < 1:
+            raise fire_error('You must get at least 1 submission')
+        if not self.archive.path.exists():
+            msg = f'There is no archive at {self.archive.path}, fetch posts with --archive to create one'
+            raise fire_error(msg)
+        sorting = get_post_sorting_option(post_sorting)
+        template = compile_template(output_format)
+        posts = self.archive.query(subreddit, sorting, get_time_filter_option(time_filter), limit)
+        return self._render_listing(
+            subreddit=subreddit,
+            sorting=sorting,
+            time_filter=time_filter,
+            posts=list(project_posts(posts, self._post_fields(template.keys))),
+            header=header,
+            custom_header=custom_header,
+            output_format=output_format,
+        )
+
+    def search_local(
+        self,
+        terms: str | list[str] | tuple[str, ...],
+        subreddit: str | None = None,
+        time_filter: str = 'all',
+        limit: int = 10,
+        output_format: str = '- r/{subreddit}: {title}',
+        syntax: bool = False,
+    ) -> list[str]:
+        """Search the titles and selftext of the archived posts without going to Reddit.
+
+        Only posts that were fetched with --archive are searched. They
+        are kept in a full-text index, so a search takes milliseconds
+        however many posts were archived.
+
+        Args:
+            terms: The words every post must contain, e.g. "rust async".
+            Case, accents and word endings are ignored, and a word
+            ending in '*' matches every word starting with it.
+            subreddit: Only search the posts of this subreddit
+            time_filter: Only search posts created within the past
+            'hour', 'day', 'week', 'month', 'year', or 'all' (the
+            default)
+            limit: The most posts to get, default 10
+            output_format: See `reddit-get post --help`, default
+            "- r/{subreddit}: {title}"
+            syntax: Use terms as an SQLite FTS5 query, e.g.
+            '"exact phrase" OR rust NOT async'
+
+        Returns:
+            The posts that match best, best first, formatted as
+            specified
 
+        """
+        if limit < 1:
+            raise fire_error('You must get at least 1 submission')
+        if not self.archive.path.exists():
+            msg = f'There is no archive at {self.archive.path}, fetch posts with --archive to create one'
+            raise fire_error(msg)
+        # Fire hands over several words as a tuple, and a number as an int
+        text = ' '.join(map(str, terms)) if isinstance(terms, list | tuple) else str(terms)
+        template = compile_template(output_format)
+        with self.timings.span('search'):
+            posts = self.archive.search(text, subreddit, get_time_filter_option(time_filter), limit, syntax)
+        return self._render_posts(output_format, list(project_posts(posts, self._post_fields(template.keys))))
+
+    def serve(self, socket: str | None = None) -> None:
+        """Keep one authenticated Reddit session open and answer queries sent by `reddit-get client`.
+
+        Every `reddit-get post` run starts a new interpreter, loads the
+        config and requests a new OAuth token over a new connection.
+        The server does all of that once, so each query sent to it only
+        costs the listing requests themselves. Stop it with Ctrl-C.
+
+        Args:
+            socket: The Unix socket to listen on. Default:
+            serve.sock in the cache directory.
+
+        """
+        from .server import QueryServer  # noqa: PLC0415
+
+        server = QueryServer(self._socket_path(socket), self)
+        # Authenticate now rather than on the first query
+        _ = self.reddit
+        print(f'Listening on {server.path}', flush=True)  # noqa: T201
         try:
-            # Get subreddit and query function
-            subreddit_obj = self.reddit.subreddit(subreddit)
-            query_fn = get_reddit_query_function(subreddit_obj, time_filter, sorting)
-
-            # Execute query with retry logic for rate limits
-            posts = self._execute_with_retry(lambda: list(query_fn(limit=limit)))
-
-            return get_response(
-                self.create_header(
-                    template=custom_header,
-                    sorting=sorting,
-                    time=get_time_filter_option(time_filter),
-                    subreddit=subreddit,
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def client(
+        self,
+        subreddit: str,
+        post_sorting: str = 'top',
+        time_filter: str = 'all',
+        limit: int = 10,
+        header: bool = True,
+        custom_header: str = '#### The {sorting} Posts for {time} from {subreddit}',
+        output_format: str = '- {title}',
+        incremental: bool = False,
+        socket: str | None = None,
+    ) -> list[str]:
+        """Get posts through a running `reddit-get serve`.
+
+        This takes the same arguments as `reddit-get post`, apart from
+        --stream, and gives the same output.
+
+        Args:
+            subreddit: See `reddit-get post --help`
+            post_sorting: See `reddit-get post --help`
+            time_filter: See `reddit-get post --help`
+            limit: See `reddit-get post --help`
+            header: See `reddit-get post --help`
+            custom_header: See `reddit-get post --help`
+            output_format: See `reddit-get post --help`
+            incremental: See `reddit-get post --help`
+            socket: The Unix socket the server listens on. Default:
+            serve.sock in the cache directory.
+
+        Returns:
+            The output of `reddit-get post`
+
+        """
+        from .server import send_query  # noqa: PLC0415
+
+        kwargs = {
+            'subreddit': subreddit,
+            'post_sorting': post_sorting,
+            'time_filter': time_filter,
+            'limit': limit,
+            'header': header,
+            'custom_header': custom_header,
+            'output_format': output_format,
+            'incremental': incremental,
+        }
+        return send_query(self._socket_path(socket), 'post', kwargs)
+
+    def _socket_path(self, socket: str | None) -> Path:
+        from .server import DEFAULT_SOCKET_NAME  # noqa: PLC0415
+
+        return Path(socket).expanduser() if socket else self.cache_dir / DEFAULT_SOCKET_NAME
+
+    def _fetch_posts(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: str,
+        limit: int,
+        template: CompiledTemplate,
+        extra_fields: Collection[str] = (),
+    ) -> list[SubmissionRecord]:
+        return self._fetch_many([(subreddit, sorting, time_filter, limit)], template, extra_fields=extra_fields)[0]
+
+    def _fetch_many(
+        self,
+        queries: Sequence[ListingQuery],
+        template: CompiledTemplate,
+        concurrency: int = 1,
+        extra_fields: Collection[str] = (),
+        skipped: set[str] | None = None,
+    ) -> list[list[SubmissionRecord]]:
+        """Get listings from the cache, or from Reddit when no fresh copy is cached.
+
+        An expired copy is revalidated: Reddit is asked whether the
+        listing changed, and the copy is used again if it did not. Only
+        the fields the output template needs are kept for each post, see
+        `project_post`.
+
+        Args:
+            queries: `(subreddit, sorting, time_filter, limit)` for each
+            listing
+            template: The output template, a cached listing is only
+            used if it has all the fields the template needs
+            concurrency: The maximum number of listings to fetch from
+            Reddit at the same time
+            extra_fields: Fields to keep for each post on top of the
+            ones the template needs
+            skipped: Collects the subreddits that turn out to be
+            unavailable, whose listings are then left empty instead of
+            failing the others, see `_recording_unavailable`
+
+        Returns:
+            The posts of each listing, in the order of `queries`
+
+        """
+        # Cached posts only keep plain values, nested lookups need the PRAW objects
+        cache = None if template.nested else self.cache
+        fields = self._post_fields(template.keys | frozenset(extra_fields))
+        results: list[list[SubmissionRecord] | None] = [None] * len(queries)
+        keys: list[str] = []
+        if cache is not None:
+            for index, (subreddit, sorting, time_filter, limit) in enumerate(queries):
+                key = cache.key(subreddit, sorting, get_time_filter_option(time_filter), limit)
+                keys.append(key)
+                cached = cache.get(key, fields)
+                if cached is not None:
+                    results[index] = list(project_posts(self._archived(subreddit, cached), fields))
+
+        misses = [index for index, result in enumerate(results) if result is None]
+        stale = [cache.get_stale(keys[index], fields) if cache is not None else None for index in misses]
+        listings = self._fetch_listings(
+            [queries[index] for index in misses],
+            concurrency,
+            [entry[1] if entry else None for entry in stale],
+            skipped,
+        )
+        for index, entry, (posts, validator) in zip(misses, stale, listings, strict=True):
+            subreddit, sorting, time_filter, _ = queries[index]
+            if skipped is not None and subreddit in skipped:
+                continue
+            ttl = get_listing_ttl(sorting, get_time_filter_option(time_filter))
+            if posts is None:
+                # Only listings with a stale copy in the cache are revalidated, and Reddit says it is current
+                assert cache is not None and entry is not None  # noqa: PT018, S101
+                cache.refresh(keys[index], ttl)
+                results[index] = list(project_posts(self._archived(subreddit, entry[0]), fields))
+                continue
+            results[index] = list(project_posts(self._archived(subreddit, posts), fields))
+            if cache is not None:
+                serialized = [serialize_submission(post, fields) for post in posts]
+                cache.set(keys[index], serialized, ttl, validator)
+        return [result or [] for result in results]
+
+    def _fetch_listings(
+        self,
+        queries: Sequence[ListingQuery],
+        concurrency: int,
+        validators: Sequence[Validator | None] | None = None,
+        skipped: set[str] | None = None,
+    ) -> list[tuple[list[Submission] | None, Validator | None]]:
+        """Fetch several listings from Reddit with the selected backend.
+
+        A subreddit that turns out to be unavailable fails all of them,
+        unless `skipped` is given to collect it, see `_fetch_many`.
+
+        Returns:
+            The posts and validator of each listing, see `_fetch_listing`
+
+        """
+        if not queries:
+            return []
+        if self.backend == 'async':
+            import asyncio  # noqa: PLC0415
+
+            from . import aio  # noqa: PLC0415
+
+            for subreddit, *_ in queries:
+                self._check_available(subreddit)
+            listings = asyncio.run(
+                aio.fetch_listings(
+                    self.configs['reddit-get'],
+                    queries,
+                    self._retry_delay,
+                    concurrency,
+                    functools.partial(self._recording_unavailable, skipped=skipped),
                 ),
-                create_post_output(output_format, iter(posts)),
             )
-        except RedditAPIException as e:
-            # Handle specific Reddit API errors (e.g., subreddit not found, private subreddit)
-            if any(item.error_type in ('SUBREDDIT_NOEXIST', 'SUBREDDIT_NOTALLOWED') for item in e.items):
-                msg = f"Subreddit 'r/{subreddit}' does not exist or is private/restricted"
-                raise fire.core.FireError(msg) from e
-            # Re-raise for _execute_with_retry to handle
-            raise
+            if self.subreddits is not None:
+                for (subreddit, *_), posts in zip(queries, listings, strict=True):
+                    if posts:
+                        self.subreddits.seen(subreddit, posts[0])
+            return [(posts, None) for posts in listings]
+        validators = validators or [None] * len(queries)
+
+        def fetch(
+            query: ListingQuery, validator: Validator | None,
+        ) -> tuple[list[Submission] | None, Validator | None]:
+            subreddit, sorting, time_filter, limit = query
+            return self._fetch_listing(subreddit, sorting, time_filter, limit, validator, skipped)
+
+        if len(queries) == 1 or concurrency == 1:
+            return [fetch(query, validator) for query, validator in zip(queries, validators, strict=True)]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(queries))) as executor:
+            # Executor.map yields results in submission order, which keeps the output stable
+            return list(executor.map(fetch, queries, validators))
+
+    def _fetch_listing(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: str,
+        limit: int,
+        validator: Validator | None = None,
+        skipped: set[str] | None = None,
+    ) -> tuple[list[Submission] | None, Validator | None]:
+        """Fetch a listing from Reddit, unless it did not change since `validator` was taken.
+
+        See `_recording_unavailable` for `skipped`.
+
+        Returns:
+            The posts, None if the listing did not change, and the
+            validator to revalidate the listing with next time. Only
+            listings that fit in one page get a validator.
+
+        """
+        revalidation = (
+            self.revalidation.listing(validator, f'/r/{subreddit}/')
+            if limit <= MAX_REVALIDATED_LIMIT
+            else contextlib.nullcontext()
+        )
+        with (
+            self.timings.span('listing', subreddit=subreddit, sorting=sorting.value) as span,
+            revalidation as listing,
+        ):
+            try:
+                posts = list(self._iter_listing(subreddit, sorting, time_filter, limit, skipped))
+            except ListingUnchanged:
+                span['unchanged'] = True
+                return None, validator
+            span['posts'] = len(posts)
+        return posts, listing.validator if listing else None
+
+    def _iter_listing(
+        self, subreddit: str, sorting: SortingOption, time_filter: str, limit: int, skipped: set[str] | None = None,
+    ) -> Iterator[Submission]:
+        """Lazily get the posts of a listing from Reddit.
+
+        PRAW's listing generators fetch one page at a time as they are
+        consumed, so the first post is available as soon as the first
+        page has arrived. A page that failed because of a rate limit is
+        requested again when the generator is advanced again. See
+        `_recording_unavailable` for `skipped`.
+        """
+        self._check_available(subreddit)
+        with self._recording_unavailable(subreddit, skipped):
+            if self.backend == 'async':
+                from . import aio  # noqa: PLC0415
+
+                query = (subreddit, sorting, time_filter, limit)
+                posts = aio.iter_listing(self.configs['reddit-get'], query, self._retry_delay)
+            else:
+                posts = self._iter_praw_listing(subreddit, sorting, time_filter, limit)
+            for index, post in enumerate(posts):
+                if index == 0 and self.subreddits is not None:
+                    self.subreddits.seen(subreddit, post)
+                yield post
+
+    def _iter_praw_listing(
+        self, subreddit: str, sorting: SortingOption, time_filter: str, limit: int,
+    ) -> Iterator[Submission]:
+        # Get subreddit and query function
+        subreddit_obj = self.reddit.subreddit(subreddit)
+        query_fn = get_reddit_query_function(subreddit_obj, time_filter, sorting)
+
+        # Execute each page request with retry logic for rate limits
+        listing = self._execute_with_retry(lambda: iter(query_fn(limit=limit)))
+        while (post := self._execute_with_retry(lambda: next(listing, None))) is not None:
+            yield post
+
+    def _check_available(self, subreddit: str) -> None:
+        """Fail without asking Reddit if `subreddit` is known to be unavailable.
+
+        Raises:
+            fire.core.FireError: If the subreddit could not be read the
+            last time it was asked for, within `UNAVAILABLE_TTL`
+
+        """
+        known = self.subreddits.get(subreddit) if self.subreddits is not None else None
+        if known is not None and not known.available:
+            checked = time.strftime('%Y-%m-%d %H:%M', time.localtime(known.checked_at))
+            raise fire_error(f'{known.describe()} (as of {checked}, use --no-cache to check again)')
+
+    @contextlib.contextmanager
+    def _recording_unavailable(self, subreddit: str, skipped: set[str] | None = None) -> Iterator[None]:
+        """Remember it when `subreddit` turns out to be unavailable in the `with` block, so later runs do not ask again.
+
+        Args:
+            subreddit: The subreddit read in the `with` block
+            skipped: If given, an unavailable subreddit is added to it
+            and reported on standard error, and the `with` block is
+            left without an error, so that commands reading several
+            subreddits can go on with the others
+
+        Raises:
+            fire.core.FireError: Saying why the subreddit can not be
+            read, in place of the error Reddit's answer caused
+
+        """
+        try:
+            yield
+        except Exception as e:
+            # Errors other than rate limits reach here wrapped by _execute_with_retry
+            status = unavailable_status(e.__cause__ if is_fire_error(e) else e)
+            if status is None:
+                raise
+            info = (
+                self.subreddits.unavailable(subreddit, status)
+                if self.subreddits is not None
+                else SubredditInfo(subreddit, status, None, time.time())
+            )
+            if skipped is None:
+                raise fire_error(info.describe()) from e
+            skipped.add(subreddit)
+            self._report_skipped(info)
+
+    def _stream_listing(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: str,
+        limit: int,
+        header: bool,
+        custom_header: str,
+        output_format: str,
+        incremental: bool = False,
+        comments: CommentOptions | None = None,
+        post_filter: PostFilter | None = None,
+    ) -> None:
+        time_filter_option = get_time_filter_option(time_filter)
+        template = compile_template(output_format)
+        fields = self._post_fields(template.keys | {'id'} if comments else template.keys)
+        # Render eagerly so template errors surface before anything is fetched or printed
+        header_line = (
+            self.create_header(custom_header, sorting=sorting, time=time_filter_option, subreddit=subreddit)
+            if header
+            else ''
+        )
+        posts = self._iter_posts(
+            subreddit, sorting, time_filter_option, limit, fields, incremental, post_filter, not template.nested,
+        )
+        lines = self._iter_post_lines(output_format, self._deduplicated(posts), comments)
+        # Incremental runs only print the header once there is a new post to go with it
+        if header_line and not incremental:
+            print(header_line, flush=True)  # noqa: T201
+            header_line = ''
+        for line in lines:
+            if header_line:
+                print(header_line, flush=True)  # noqa: T201
+                header_line = ''
+            print(line, flush=True)  # noqa: T201
+
+    def _export_listing(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: str,
+        limit: int,
+        output: str,
+        fields: tuple[str, ...],
+        output_file: str | None,
+        incremental: bool = False,
+        post_filter: PostFilter | None = None,
+    ) -> None:
+        check_output_format(output)
+        posts = self._iter_posts(
+            subreddit,
+            sorting,
+            get_time_filter_option(time_filter),
+            limit,
+            self._post_fields(fields),
+            incremental,
+            post_filter,
+        )
+        export_records(self._deduplicated(posts), fields, output, output_file)
+
+    def _iter_posts(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: TimeFilterOption,
+        limit: int,
+        fields: Collection[str],
+        incremental: bool = False,
+        post_filter: PostFilter | None = None,
+        cacheable: bool = True,
+    ) -> Iterator[SubmissionRecord]:
+        """Lazily get the posts of a listing, or its unseen posts when `incremental`.
+
+        With an active `post_filter`, up to `MAX_LIMIT` posts are read
+        to find the first `limit` that match, see `PostFilter.filter`.
+        Incremental runs still read all the unseen posts, the
+        high-water mark only moves once every one of them was read.
+        """
+        if post_filter is None or not post_filter.active:
+            if incremental:
+                return project_posts(self._iter_unseen(subreddit, sorting, time_filter.value, limit), fields)
+            return self._iter_cached_or_live(subreddit, sorting, time_filter, limit, fields, cacheable)
+        fields = frozenset(fields) | post_filter.fields
+        if incremental:
+            unseen = list(project_posts(self._iter_unseen(subreddit, sorting, time_filter.value, MAX_LIMIT), fields))
+            return post_filter.filter(unseen, limit)
+        posts = self._iter_cached_or_live(subreddit, sorting, time_filter, MAX_LIMIT, fields, cacheable)
+        return post_filter.filter(posts, limit, time_ordered=sorting in TIME_ORDERED_SORTINGS)
+
+    def _iter_unseen(
+        self, subreddit: str, sorting: SortingOption, time_filter: str, limit: int,
+    ) -> Iterator[Submission]:
+        """Get the posts that were not returned by an earlier incremental run, see `iter_unseen`.
+
+        The mark is moved to the newest post, and for listings that are
+        not time ordered remembers the posts returned, once the listing
+        has been read completely.
+        """
+        mark = self.marks.get(subreddit, sorting)
+        newest = mark
+        returned = []
+        posts = self._archived(subreddit, self._iter_listing(subreddit, sorting, time_filter, limit))
+        for post in iter_unseen(posts, mark, sorting):
+            newest = newest_mark(newest, post)
+            returned.append(post.name)
+            yield post
+        if newest is not None and returned and sorting not in TIME_ORDERED_SORTINGS:
+            newest = remember_seen(newest, returned)
+        if newest is not None and newest != mark:
+            self.marks.set(subreddit, sorting, newest)
+
+    def _iter_cached_or_live(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: TimeFilterOption,
+        limit: int,
+        fields: Collection[str],
+        cacheable: bool = True,
+        skipped: set[str] | None = None,
+    ) -> Iterator[SubmissionRecord]:
+        if self.cache is not None and cacheable:
+            cached = self.cache.get(self.cache.key(subreddit, sorting, time_filter, limit), fields)
+            if cached is not None:
+                return project_posts(self._archived(subreddit, cached), fields)
+        posts = self._iter_listing(subreddit, sorting, time_filter.value, limit, skipped)
+        return project_posts(self._archived(subreddit, posts), fields)
+
+    def _archived(self, subreddit: str, posts: Iterable[T]) -> Iterable[T]:
+        """Archive `posts` as they are read, if archiving is enabled."""
+        return self.archive.archive(subreddit, posts) if self.archive_posts else posts  # type: ignore[return-value]
+
+    def _post_fields(self, fields: Collection[str]) -> frozenset[str]:
+        """Get `fields` along with the ones the dedupe stage reads, if deduplication is enabled."""
+        return frozenset(fields) | DEDUPE_FIELDS if self.dedupe is not None else frozenset(fields)
+
+    def _deduplicated(self, posts: Iterable[T]) -> Iterable[T]:
+        """Drop the posts that were already printed as they are read, if deduplication is enabled."""
+        return self.dedupe.filter(posts) if self.dedupe is not None else posts
+
+    def _render_listing(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        time_filter: str,
+        posts: list[SubmissionRecord],
+        header: bool,
+        custom_header: str,
+        output_format: str,
+        comments: CommentOptions | None = None,
+    ) -> list[str]:
+        return get_response(
+            self.create_header(
+                template=custom_header,
+                sorting=sorting,
+                time=get_time_filter_option(time_filter),
+                subreddit=subreddit,
+            )
+            if header
+            else '',
+            self._render_posts(output_format, posts, comments),
+        )
+
+    def _render_posts(
+        self, output_format: str, posts: list[SubmissionRecord], comments: CommentOptions | None = None,
+    ) -> list[str]:
+        if self.dedupe is not None:
+            with self.timings.span('dedupe', posts=len(posts)) as span:
+                posts = list(self.dedupe.filter(posts))
+                span['kept'] = len(posts)
+        if comments:
+            return list(self._iter_post_lines(output_format, posts, comments))
+        with self.timings.span('render', posts=len(posts)):
+            return create_post_output(output_format, iter(posts))
+
+    def _iter_post_lines(
+        self, output_format: str, posts: Iterable[SubmissionRecord], comments: CommentOptions | None,
+    ) -> Iterator[str]:
+        """Lazily render each post, followed by its comments if they were asked for.
+
+        The comment trees of several posts are fetched at the same time,
+        each post is rendered as soon as its own tree and the ones of
+        the posts before it have arrived.
+        """
+        if comments is None:
+            return iter_post_output(output_format, posts)
+        comment_template = compile_template(comments.output_format)
+        threads = map_ordered(lambda post: self._fetch_comments(post.id, comments), posts, comments.concurrency)
+        return (
+            line
+            for post, thread in threads
+            for line in (*iter_post_output(output_format, (post,)), *render_comments(comment_template, thread))
+        )
+
+    def _fetch_comments(self, post_id: str, comments: CommentOptions) -> list[tuple[int, Any]]:
+        """Fetch the comment tree of a post, flattened to the comments that are printed."""
+
+        def fetch() -> list[tuple[int, Any]]:
+            submission = self.reddit.submission(id=post_id)
+            # These go into the request for the comments, so they must be set before the forest is read
+            submission.comment_sort = COMMENT_SORT
+            # PRAW has no option for Reddit's depth parameter, which leaves out the replies that are not printed
+            submission._additional_fetch_params['depth'] = comments.depth  # noqa: SLF001
+            if comments.depth == 1:
+                # Reddit's limit counts replies too, so it only stops at the printed comments without them
+                submission.comment_limit = comments.limit
+            forest = submission.comments
+            forest.replace_more(limit=comments.replace_more)
+            return flatten_comments(forest, comments.limit, comments.depth)
+
+        with self.timings.span('comments', post=post_id) as span:
+            thread = self._execute_with_retry(fetch)
+            span['comments'] = len(thread)
+        return thread
+
+    def _fetch_info(self, fullnames: list[str]) -> list[Submission]:
+        """Get one batch of submissions from /api/info, in the order of `fullnames`."""
+        with self.timings.span('info', ids=len(fullnames)) as span:
+            posts = self._execute_with_retry(lambda: list(self.reddit.info(fullnames=fullnames)))
+            span['posts'] = len(posts)
+        by_name = {post.name: post for post in posts}
+        missing = [fullname for fullname in fullnames if fullname not in by_name]
+        if missing:
+            print(f'No submissions found for {", ".join(missing)}', file=sys.stderr, flush=True)  # noqa: T201
+        return [by_name[fullname] for fullname in fullnames if fullname in by_name]
+
+    def _skip_unavailable(self, names: list[str]) -> list[str]:
+        """Leave out the subreddits known to be unavailable, saying so on standard error."""
+        if self.subreddits is None:
+            return names
+        available = []
+        for name in names:
+            known = self.subreddits.get(name)
+            if known is not None and not known.available:
+                self._report_skipped(known)
+                continue
+            available.append(name)
+        return available
+
+    @staticmethod
+    def _report_skipped(info: SubredditInfo) -> None:
+        print(f'Skipping r/{info.name}: {info.describe()}', file=sys.stderr, flush=True)  # noqa: T201
+
+    def _fetch_about(self, name: str) -> SubredditInfo:
+        """Get what Reddit says about the subreddit `name`, remembering it."""
+        with self.timings.span('about', subreddit=name):
+            try:
+                about = self._execute_with_retry(lambda: self.reddit.get(f'r/{name}/about'))
+            except Exception as e:
+                status = unavailable_status(e.__cause__ if is_fire_error(e) else e)
+                if status is None:
+                    raise
+                info = SubredditInfo(name, status, None, time.time())
+            else:
+                # Attributes missing from the response would be fetched again
+                status = 'quarantined' if vars(about).get('quarantine') else AVAILABLE
+                info = SubredditInfo(str(about.display_name), status, about.subscribers, time.time())
+        if self.subreddits is not None:
+            self.subreddits.set(info)
+        return info
+
+    def _report_timings(self, summary: bool = True, trace: Path | None = None, trace_format: str = 'chrome') -> None:
+        """Print the timings summary to stderr and write the trace, if they were asked for.
+
+        This runs at exit, where an error would only add a traceback
+        after the output, so a trace that can not be written is
+        reported like the command's own errors are.
+        """
+        if summary:
+            print('\n'.join(self.timings.summary()), file=sys.stderr)  # noqa: T201
+        if trace is None:
+            return
+        try:
+            self.timings.write(trace, trace_format)
+        except Exception as e:
+            if not is_fire_error(e):
+                raise
+            print(f'ERROR: {e}', file=sys.stderr)  # noqa: T201
 
 
 def main() -> None:  # pragma: no cover
+    call = parse_fast_path(RedditCli, sys.argv[1:])
+    if call is None:
+        import fire  # noqa: PLC0415
+
+        try:
+            fire.Fire(RedditCli)
+        except fire.core.FireError:
+            sys.exit(255)
+        return
+
+    # Simple calls of the common commands skip Fire, which takes a while to import
     try:
-        fire.Fire(RedditCli)
-    except fire.core.FireError:
+        result = getattr(RedditCli(**call.init_kwargs), call.command)(**call.kwargs)
+    except Exception as e:
+        if not is_fire_error(e):
+            raise
+        print(f'ERROR: {e}', file=sys.stderr)  # noqa: T201
         sys.exit(255)
+    if isinstance(result, list):
+        print('\n'.join(result))  # noqa: T201
+    elif result is not None:
+        print(result)  # noqa: T201
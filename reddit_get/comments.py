@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    TypeVar,
+)
+
+from .errors import fire_error
+from .templates import compile_template
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterable,
+        Iterator,
+    )
+
+    from .templates import CompiledTemplate
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_COMMENT_FORMAT = '  - {author}: {body}'
+# Reddit's "best" order, which the first comments are taken in
+COMMENT_SORT = 'confidence'
+# Replies are indented this much further than the comment they reply to
+REPLY_INDENT = '  '
+DEFAULT_COMMENT_CONCURRENCY = 8
+
+
+class CommentOptions(NamedTuple):
+    """Which comments to get for each post, and how to print them."""
+
+    limit: int
+    depth: int = 1
+    replace_more: int = 0
+    output_format: str = DEFAULT_COMMENT_FORMAT
+    concurrency: int = DEFAULT_COMMENT_CONCURRENCY
+
+    def check(self) -> None:
+        """Make sure the options are valid before anything is fetched.
+
+        Raises:
+            fire.core.FireError: If they are not
+
+        """
+        if self.limit < 1:
+            raise fire_error('The number of comments must be at least 1')
+        if self.depth < 1:
+            raise fire_error('The comment depth must be at least 1')
+        if self.replace_more < 0:
+            raise fire_error('replace_more can not be negative')
+        if self.concurrency < 1:
+            raise fire_error('Comment concurrency must be at least 1')
+        if not compile_template(self.output_format).keys:
+            raise fire_error('Your comment output template did not have any items to be printed')
+
+
+def flatten_comments(forest: Iterable[Any], limit: int, depth: int) -> list[tuple[int, Any]]:
+    """Get the first `limit` top-level comments and their replies, `depth` levels deep.
+
+    "Load more comments" stubs that were not replaced are skipped.
+
+    Returns:
+        `(level, comment)` pairs in the order they are printed, level 0
+        being a top-level comment
+
+    """
+    from praw.models import MoreComments  # noqa: PLC0415
+
+    flat: list[tuple[int, Any]] = []
+
+    def walk(comments: Iterable[Any], level: int) -> None:
+        for comment in comments:
+            if isinstance(comment, MoreComments):
+                continue
+            flat.append((level, comment))
+            if level + 1 < depth:
+                walk(comment.replies, level + 1)
+
+    walk([comment for comment in forest if not isinstance(comment, MoreComments)][:limit], 0)
+    return flat
+
+
+def _comment_field(comment: object, name: str) -> Any:
+    # Only the data that came with the comment tree, any other attribute would be one request per comment
+    try:
+        return vars(comment)[name]
+    except KeyError:
+        raise AttributeError(f"Comments have no field '{name}'") from None
+
+
+def render_comments(template: CompiledTemplate, comments: Iterable[tuple[int, Any]]) -> Iterator[str]:
+    """Render each comment with `template`, replies indented under the comment they reply to."""
+    for level, comment in comments:
+        try:
+            yield REPLY_INDENT * level + template.render(comment, _comment_field)
+        except (AttributeError, LookupError, TypeError, ValueError) as e:
+            raise fire_error(e) from e
+
+
+def map_ordered(func: Callable[[T], R], items: Iterable[T], concurrency: int) -> Iterator[tuple[T, R]]:
+    """Lazily pair each item with `func(item)`, running up to `concurrency` calls at a time.
+
+    Results come out in the order of `items` as soon as they, and all
+    the ones before them, are done. Unlike `Executor.map`, items are
+    only taken from `items` as workers free up, so a streamed listing
+    is not read to the end before the first result comes out.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: deque[tuple[T, Any]] = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= concurrency:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+from array import array
+import hashlib
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    TypeVar,
+)
+from urllib.parse import (
+    parse_qsl,
+    urlencode,
+    urlsplit,
+)
+
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterable,
+        Iterator,
+    )
+    from pathlib import Path
+
+T = TypeVar('T')
+
+# The post fields the dedupe stage reads, they are part of the listing data or optional, see `OPTIONAL_FIELDS`
+DEDUPE_FIELDS = frozenset({'crosspost_parent', 'name', 'title', 'url'})
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_WINDOW_DAYS = 30
+# Titles are compared as sets of overlapping character n-grams
+SHINGLE_SIZE = 4
+# Shorter titles ("Wow", "Update") are too common to be called duplicates by title alone
+MIN_TITLE_WORDS = 3
+NUM_HASHES = 64
+# Two titles become candidates when all the rows of one band of their signatures are equal
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+# Fixed so that signatures stay comparable between runs
+_SEED = 0x5EED
+# An expired entry is only pruned once it is this much older than the window, so pruning runs about once a day
+PRUNE_SLACK = 24 * 60 * 60
+# Query parameters that only track where a link was shared
+TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'igshid', 'ref', 'ref_src', 'si', 'share_id'})
+_REDDIT_POST_PATH = re.compile(r'^(?:/r/[^/]+)?/(?:comments|gallery)/([0-9a-z]+)(?:/|$)')
+_WORD = re.compile(r'\w+')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS seen (
+    key INTEGER PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    post INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL,
+    seen_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    key INTEGER NOT NULL,
+    post INTEGER NOT NULL,
+    PRIMARY KEY (key, post)
+) WITHOUT ROWID;
+'''
+
+
+def _permutations() -> list[tuple[int, int]]:
+    rng = random.Random(_SEED)  # noqa: S311
+    return [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(NUM_HASHES)]
+
+
+_PERMUTATIONS = _permutations()
+
+
+def _hash64(value: str | bytes) -> int:
+    """Hash `value` to a signed 64 bit integer, the same in every process, as SQLite stores it."""
+    data = value.encode() if isinstance(value, str) else value
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+
+def canonical_url(url: str) -> str:
+    """Reduce `url` to what identifies the page it links to.
+
+    The scheme, "www.", trailing slashes, fragments and tracking
+    parameters are dropped and the other parameters sorted. Links to a
+    Reddit post, which is what a crosspost of a text post links to, are
+    reduced to the fullname of the post, also when they are relative to
+    Reddit as crossposts' links are.
+
+    >>> canonical_url('https://www.Example.com/story/?utm_source=x&b=2&a=1#top')
+    'example.com/story?a=1&b=2'
+    >>> canonical_url('https://old.reddit.com/r/news/comments/1abcde/a_title/')
+    't3_1abcde'
+    >>> canonical_url('/r/news/comments/1abcde/a_title/')
+    't3_1abcde'
+    """
+    split = urlsplit(url.strip())
+    host = split.netloc.lower().removeprefix('www.')
+    path = split.path.rstrip('/')
+    if not host or host == 'reddit.com' or host.endswith('.reddit.com'):
+        if match := _REDDIT_POST_PATH.match(path.lower()):
+            return f't3_{match[1]}'
+    elif host == 'redd.it' and path:
+        return f't3_{path.lstrip("/").lower()}'
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(split.query, keep_blank_values=True)
+        if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS
+    )
+    return f'{host}{path}' + (f'?{urlencode(query)}' if query else '')
+
+
+def title_signature(title: str) -> array[int] | None:
+    """Get the MinHash signature of the character n-grams of `title`.
+
+    The share of equal values in the signatures of two titles estimates
+    the Jaccard similarity of their n-grams.
+
+    Returns:
+        The signature, or None if the title has fewer than
+        `MIN_TITLE_WORDS` words
+
+    """
+    words = _WORD.findall(title.lower())
+    if len(words) < MIN_TITLE_WORDS:
+        return None
+    text = ' '.join(words)
+    shingles = {
+        _hash64(text[start:start + SHINGLE_SIZE]) & _MASK
+        for start in range(max(len(text) - SHINGLE_SIZE + 1, 1))
+    }
+    return array('I', (min(((a * shingle + b) % _PRIME) & _MASK for shingle in shingles) for a, b in _PERMUTATIONS))
+
+
+def band_keys(signature: array[int]) -> list[int]:
+    """Get the LSH bucket of each band of `signature`."""
+    return [
+        _hash64(band.to_bytes(1, 'big') + signature[band * ROWS:(band + 1) * ROWS].tobytes())
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first: array[int], second: array[int]) -> float:
+    """Estimate the Jaccard similarity of two titles from their signatures."""
+    return sum(a == b for a, b in zip(first, second, strict=True)) / NUM_HASHES
+
+
+class DedupeIndex:
+    """Every post printed so far, to drop the ones that were already printed in some form.
+
+    A post is a duplicate when its fullname or its link (see
+    `canonical_url`) was seen before, which catches crossposts and the
+    same story posted to several subreddits, or when its title is
+    nearly the same as the title of a post that was seen. Near
+    duplicate titles are found with MinHash signatures bucketed with
+    locality sensitive hashing, so checking a post takes a fixed number
+    of index lookups however many posts were seen. The index is a
+    SQLite database of 64 bit hashes that forgets posts after
+    `window_days`.
+
+    Args:
+        path: The SQLite database file
+        threshold: How similar two titles must be to be duplicates,
+        between 0 and 1
+        window_days: Posts are forgotten after this many days
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        threshold: float = DEFAULT_THRESHOLD,
+        window_days: float = DEFAULT_WINDOW_DAYS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise fire_error('The dedupe threshold must be above 0 and at most 1')
+        if window_days <= 0:
+            raise fire_error('The dedupe window must be positive')
+        self.path = path
+        self.threshold = threshold
+        self.window = window_days * 24 * 60 * 60
+        self.clock = clock
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+                connection.executescript(SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                raise fire_error(f'Could not open the dedupe index {self.path}: {e}') from e
+            self._connection = connection
+            self._prune()
+        return self._connection
+
+    def _prune(self) -> None:
+        assert self._connection is not None  # noqa: S101
+        cutoff = self.clock() - self.window
+        # Titles are numbered in the order they were seen, so the first one is the oldest
+        oldest = self._connection.execute('SELECT seen_at FROM signatures ORDER BY post LIMIT 1').fetchone()
+        if oldest is None or oldest[0] >= cutoff - PRUNE_SLACK:
+            return
+        with self._connection:
+            expired = self._connection.execute(
+                'SELECT max(post) FROM signatures WHERE seen_at < ?', (cutoff,),
+            ).fetchone()[0]
+            if expired is not None:
+                self._connection.execute('DELETE FROM bands WHERE post <= ?', (expired,))
+                self._connection.execute('DELETE FROM signatures WHERE post <= ?', (expired,))
+            self._connection.execute('DELETE FROM seen WHERE seen_at < ?', (cutoff,))
+
+    def _is_near_duplicate(self, signature: array[int], bands: list[int]) -> bool:
+        placeholders = ','.join('?' * len(bands))
+        rows = self.connection.execute(
+            f'SELECT signature FROM signatures WHERE post IN (SELECT post FROM bands WHERE key IN ({placeholders}))',  # noqa: S608
+            bands,
+        )
+        return any(similarity(signature, array('I', blob)) >= self.threshold for (blob,) in rows)
+
+    def check(self, post: Any) -> bool:
+        """Check whether `post` duplicates one seen before, and remember it if it does not.
+
+        Only the `DEDUPE_FIELDS` of the post are read.
+
+        Returns:
+            Whether the post is a duplicate
+
+        """
+        # Links to a Reddit post are reduced to its fullname, so a crosspost of a text post matches the post
+        keys = [_hash64(post.name)] if getattr(post, 'name', None) else []
+        if getattr(post, 'crosspost_parent', None):
+            keys.append(_hash64(post.crosspost_parent))
+        if getattr(post, 'url', None):
+            keys.append(_hash64(canonical_url(post.url)))
+        signature = title_signature(post.title) if getattr(post, 'title', None) else None
+        bands = band_keys(signature) if signature is not None else []
+        now = self.clock()
+        with self._lock:
+            if keys:
+                placeholders = ','.join('?' * len(keys))
+                if self.connection.execute(f'SELECT 1 FROM seen WHERE key IN ({placeholders})', keys).fetchone():  # noqa: S608
+                    return True
+            if signature is not None and self._is_near_duplicate(signature, bands):
+                return True
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO seen (key, seen_at) VALUES (?, ?)', [(key, now) for key in keys],
+                )
+                if signature is not None:
+                    post_id = self.connection.execute(
+                        'INSERT INTO signatures (signature, seen_at) VALUES (?, ?)', (signature.tobytes(), now),
+                    ).lastrowid
+                    self.connection.executemany(
+                        'INSERT OR IGNORE INTO bands (key, post) VALUES (?, ?)', [(key, post_id) for key in bands],
+                    )
+        return False
+
+    def filter(self, posts: Iterable[T]) -> Iterator[T]:
+        """Lazily drop the duplicates from `posts`, remembering each post that is kept."""
+        return (post for post in posts if not self.check(post))
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fire.core import FireError
+
+
+def fire_error(message: object) -> FireError:
+    """Create a `fire.core.FireError` to raise.
+
+    Importing Fire takes longer than everything else reddit-get needs to
+    start, so it is only imported once there is an error to report.
+    """
+    from fire.core import FireError  # noqa: PLC0415
+
+    return FireError(message)
+
+
+def is_fire_error(error: BaseException) -> bool:
+    """Check whether `error` is a `fire.core.FireError` without importing Fire for nothing."""
+    fire_core = sys.modules.get('fire.core')
+    return fire_core is not None and isinstance(error, fire_core.FireError)
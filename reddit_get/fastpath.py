@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Commands simple enough to be run without going through Fire
+FAST_PATH_COMMANDS = frozenset({'post', 'query', 'search_local', 'info', 'client', 'config_location'})
+
+
+class FastPathCall(NamedTuple):
+    """A command line parsed without Fire."""
+
+    command: str
+    init_kwargs: dict[str, Any]
+    kwargs: dict[str, Any]
+
+
+# Values standing in for a `None` default, by the annotated type, so that values are still converted
+_ANNOTATED_TYPES: dict[str, Any] = {'bool': False, 'int': 0, 'float': 0.0}
+
+
+def get_parameters(func: Any) -> dict[str, Any]:
+    """Get the keyword parameters of `func` with their defaults, `inspect.Parameter.empty` if required.
+
+    A `None` default of a parameter annotated as an optional bool, int
+    or float is replaced by a value of that type, which is what the
+    defaults are used for: telling how to convert the values given.
+
+    >>> def post(limit: int = 10, min_score: int | None = None, domain: str | None = None): ...
+    >>> get_parameters(post)
+    {'limit': 10, 'min_score': 0, 'domain': None}
+    """
+    return {
+        name: _annotated_default(param)
+        for name, param in inspect.signature(func).parameters.items()
+        if name != 'self' and param.kind in {param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY}
+    }
+
+
+def _annotated_default(param: inspect.Parameter) -> Any:
+    if param.default is not None:
+        return param.default
+    # Annotations are strings, the modules do not evaluate them
+    annotation = param.annotation if isinstance(param.annotation, str) else ''
+    types = {part.strip() for part in annotation.split('|')} - {'None'}
+    return _ANNOTATED_TYPES.get(types.pop()) if len(types) == 1 else None
+
+
+def convert_value(value: str, default: Any) -> Any:
+    """Convert a command line value to the type of the parameter's default.
+
+    Raises:
+        ValueError: If the value can not be converted
+
+    """
+    if isinstance(default, bool):
+        lowered = value.lower()
+        if lowered not in {'true', 'false'}:
+            raise ValueError(value)
+        return lowered == 'true'
+    if isinstance(default, int | float):
+        return type(default)(value)
+    return value
+
+
+def parse_fast_path(cli_class: type, args: Sequence[str]) -> FastPathCall | None:
+    """Parse a command line the way Fire would, for the simple commands only.
+
+    Fire takes longer to import than a cached `post` takes to run, so
+    common invocations are parsed here instead. Flags may be given as
+    `--name value` or `--name=value`, with hyphens or underscores,
+    boolean flags as `--name` or `--noname`, and required arguments by
+    position. Values are converted to the type of the parameter's
+    default.
+
+    >>> Cli = type('Cli', (), {'post': lambda self, subreddit, limit=10: None})
+    >>> parse_fast_path(Cli, ['post', 'aww', '--limit', '5'])
+    FastPathCall(command='post', init_kwargs={}, kwargs={'limit': 5, 'subreddit': 'aww'})
+
+    Returns:
+        The parsed call, or `None` when the command line needs Fire,
+        e.g. for `--help`, other commands or anything unrecognized
+
+    """
+    command = _resolve_command(args)
+    if command is None:
+        return None
+    method_params = get_parameters(getattr(cli_class, command))
+    init_kwargs: dict[str, Any] = {}
+    kwargs: dict[str, Any] = {}
+    # The signature of a class is the one of its __init__, without self
+    scopes = ((method_params, kwargs), (get_parameters(cli_class), init_kwargs))
+    positional = _parse_flags(args[1:], scopes)
+    if positional is None or not _assign_positional(method_params, positional, kwargs):
+        return None
+    return FastPathCall(command, init_kwargs, kwargs)
+
+
+# The parameters of a function with their defaults, and the keyword arguments parsed for them
+_Scope = tuple[dict[str, Any], dict[str, Any]]
+
+
+def _resolve_command(args: Sequence[str]) -> str | None:
+    """Get the command `args` start with, if it can take the fast path."""
+    # Fire accepts command names with hyphens too
+    command = args[0].replace('-', '_') if args else None
+    return command if command in FAST_PATH_COMMANDS else None
+
+
+def _parse_flags(args: Sequence[str], scopes: Sequence[_Scope]) -> list[str] | None:
+    """Convert the flags in `args` into the keyword arguments of the scope that has a parameter for each.
+
+    Returns:
+        The positional arguments, or `None` if a flag is unknown or its
+        value can not be converted
+
+    """
+    rest = list(args)
+    positional: list[str] = []
+    while rest:
+        arg = rest.pop(0)
+        if not arg.startswith('-'):
+            positional.append(arg)
+            continue
+        flag = _resolve_flag(arg, scopes) if arg.startswith('--') and arg != '--' else None
+        if flag is None:
+            return None
+        name, value, default, target = flag
+        if value is None:
+            value = _separate_value(default, rest)
+        if value is None:
+            return None
+        try:
+            target[name] = convert_value(value, default)
+        except ValueError:
+            return None
+    return positional
+
+
+def _resolve_flag(arg: str, scopes: Sequence[_Scope]) -> tuple[str, str | None, Any, dict[str, Any]] | None:
+    """Find the parameter a `--name` or `--name=value` flag is for, in the first scope that has it.
+
+    Returns:
+        The parameter's name, the value given with the flag or `None`,
+        the parameter's default and the keyword arguments to set it in,
+        or `None` if no scope has the parameter
+
+    """
+    name, has_value, value = arg[2:].partition('=')
+    name = name.replace('-', '_')
+    for params, target in scopes:
+        if name in params:
+            return name, value if has_value else None, params[name], target
+        if name.startswith('no') and isinstance(params.get(name[2:]), bool) and not has_value:
+            return name[2:], 'false', params[name[2:]], target
+    return None
+
+
+def _separate_value(default: Any, rest: list[str]) -> str | None:
+    """Get the value of a flag given without `=value`, taking it from the arguments after the flag unless it is boolean.
+
+    Returns:
+        The value, or `None` if there are no arguments left
+
+    """
+    if isinstance(default, bool):
+        return 'true'
+    return rest.pop(0) if rest else None
+
+
+def _assign_positional(params: dict[str, Any], positional: list[str], kwargs: dict[str, Any]) -> bool:
+    """Give the required parameters not set by a flag the positional arguments, in order.
+
+    Returns:
+        Whether every required parameter got a value and every
+        positional argument was used
+
+    """
+    missing = [name for name, default in params.items() if default is inspect.Parameter.empty and name not in kwargs]
+    if len(missing) != len(positional):
+        return False
+    kwargs.update(zip(missing, positional, strict=True))
+    return True
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import ast
+import functools
+import heapq
+import itertools
+import math
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    TypeVar,
+)
+
+from .errors import fire_error
+from .types import SortingOption
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar('T')
+
+# Named rankings, anything else is compiled as an expression
+RANKINGS = {
+    'score': 'score',
+    'comments': 'num_comments',
+    'velocity': 'num_comments / max(age_hours, 1)',
+    'new': 'created_utc',
+}
+FUNCTIONS: dict[str, Callable[..., float]] = {
+    'abs': abs,
+    'log': math.log,
+    'log10': math.log10,
+    'max': max,
+    'min': min,
+    'sqrt': math.sqrt,
+}
+# Computed from created_utc when the feed is ranked
+AGE_NAMES = frozenset({'age_hours', 'age_seconds'})
+# The ranking each sorting lists its posts by, best first
+LISTING_ORDER = {
+    SortingOption.TOP: 'score',
+    SortingOption.NEW: 'created_utc',
+}
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.USub,
+    ast.UAdd,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+)
+
+
+class Ranking:
+    """A ranking expression over the fields of a submission, compiled once.
+
+    Expressions are arithmetic over post fields such as `score` and
+    `num_comments`, `age_hours` and `age_seconds` since the post was
+    created, numbers and the functions in `FUNCTIONS`. Nothing else is
+    allowed, so an expression can not run arbitrary code.
+
+    >>> ranking = Ranking('score / max(age_hours, 1)')
+    >>> sorted(ranking.fields)
+    ['created_utc', 'score']
+    >>> ranking({'score': 100, 'created_utc': 0}, now=4 * 3600)
+    25.0
+
+    Args:
+        expression: The expression, or one of the names in `RANKINGS`
+
+    Raises:
+        fire.core.FireError: If the expression is not valid
+
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = RANKINGS.get(expression, expression)
+        try:
+            tree = ast.parse(self.expression, mode='eval')
+        except SyntaxError as e:
+            raise fire_error(f'Invalid ranking expression {expression!r}: {e.msg}') from e
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise fire_error(f'Ranking expressions can not contain {type(node).__name__} nodes: {expression!r}')
+            if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords
+            ):
+                raise fire_error(f'Ranking expressions can only call {", ".join(FUNCTIONS)}: {expression!r}')
+            if isinstance(node, ast.Constant) and type(node.value) not in {int, float}:
+                raise fire_error(f'Ranking expressions can only contain numbers: {expression!r}')
+            if isinstance(node, ast.Name) and node.id not in FUNCTIONS:
+                names.add(node.id)
+        if invalid := sorted(name for name in names if name.startswith('_')):
+            raise fire_error(f'Invalid fields in ranking expression: {", ".join(invalid)}')
+        self.uses_age = bool(names & AGE_NAMES)
+        # The post fields to keep for ranking
+        self.fields = frozenset(names - AGE_NAMES | ({'created_utc'} if self.uses_age else set()))
+        self._code = compile(tree, '<ranking>', 'eval')
+
+    def __call__(self, values: dict[str, Any], now: float) -> float:
+        """Rank a post given the values of its `fields`."""
+        if self.uses_age:
+            age = max(now - float(values['created_utc']), 0.0)
+            values = {**values, 'age_seconds': age, 'age_hours': age / 3600}
+        try:
+            return float(eval(self._code, {'__builtins__': {}, **FUNCTIONS}, values))  # noqa: S307
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise fire_error(f'Could not rank a post with {self.expression!r}: {e}') from e
+
+    def orders(self, sorting: SortingOption) -> bool:
+        """Check whether Reddit lists posts with `sorting` in the order of this ranking."""
+        return LISTING_ORDER.get(sorting) == self.expression
+
+
+@functools.lru_cache(maxsize=32)
+def compile_ranking(expression: str) -> Ranking:
+    """Get the compiled version of `expression`, compiling it only once per process."""
+    return Ranking(expression)
+
+
+class TopN(Generic[T]):
+    """The `n` highest ranked items offered so far, kept in a bounded min-heap.
+
+    Only `n` items are held no matter how many are offered. Of items
+    that rank the same, the one with the lower `order` comes first,
+    which defaults to the order they were offered in. Items may be
+    offered from several threads.
+
+    >>> top = TopN(2)
+    >>> [top.offer(item, rank) for item, rank in [('a', 1), ('b', 3), ('c', 2), ('d', 0)]]
+    [True, True, True, False]
+    >>> top.items()
+    ['b', 'c']
+
+    Args:
+        n: How many items to keep
+
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self._heap: list[tuple[float, int, T]] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def offer(self, item: T, rank: float, order: int | None = None) -> bool:
+        """Keep `item` if it is among the `n` highest ranked so far.
+
+        Args:
+            item: The item
+            rank: How high it ranks
+            order: Breaks ties in rank, lower first. Must be unique.
+
+        Returns:
+            Whether the item was kept
+
+        """
+        with self._lock:
+            if order is None:
+                order = next(self._order)
+            # The negated order makes the later of two equally ranked items the one that is dropped
+            entry = (rank, -order, item)
+            if len(self._heap) < self.n:
+                heapq.heappush(self._heap, entry)
+                return True
+            if entry[:2] <= self._heap[0][:2]:
+                return False
+            heapq.heapreplace(self._heap, entry)
+            return True
+
+    def items(self) -> list[T]:
+        """Get the kept items, highest ranked first."""
+        with self._lock:
+            return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import math
+import re
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    TypeVar,
+)
+
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterable,
+        Iterator,
+    )
+
+T = TypeVar('T')
+
+
+def _convert(value: Any, kind: Callable[[Any], T], name: str) -> T | None:
+    """Convert a condition given on the command line, which may still be a string, to `kind`.
+
+    >>> _convert('2.5', float, 'maximum age')
+    2.5
+    >>> _convert('False', bool, 'NSFW filter')
+    False
+
+    Raises:
+        fire.core.FireError: If `value` is not a `kind`
+
+    """
+    if value is None:
+        return None
+    if kind is bool:
+        lowered = str(value).lower()
+        if isinstance(value, bool | int) and value in {0, 1}:
+            return kind(value)
+        if lowered in {'true', 'false'}:
+            return kind(lowered == 'true')
+    elif not isinstance(value, bool):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            number = math.nan
+        # A fractional score or comment count is refused rather than cut down to a whole number
+        if math.isfinite(number) and (kind is float or number.is_integer()):
+            return kind(number)
+    raise fire_error(f'Invalid {name} {value!r}')
+
+
+class PostFilter:
+    """Conditions a post must meet to be printed, checked while the listing is read.
+
+    Every condition that is given must hold. Only fields that are part
+    of the listing data are read, so checking a post never makes a
+    request.
+
+    >>> post_filter = PostFilter(min_score=100, nsfw=False, clock=lambda: 0)
+    >>> sorted(post_filter.fields)
+    ['over_18', 'score']
+    >>> from types import SimpleNamespace
+    >>> post_filter.matches(SimpleNamespace(score=150, over_18=False))
+    True
+
+    Args:
+        min_score: Only posts with at least this score
+        min_comments: Only posts with at least this many comments
+        flair: Only posts with one of these flairs, ignoring case,
+        comma separated
+        domain: Only posts linking to this domain or its subdomains
+        nsfw: Only posts that are (True) or are not (False) marked NSFW
+        title_pattern: Only posts whose title matches this regular
+        expression
+        max_age: Only posts created at most this many hours ago
+        min_age: Only posts created at least this many hours ago
+        clock: Function returning the current time, in seconds
+
+    Raises:
+        fire.core.FireError: If a condition is not valid
+
+    """
+
+    def __init__(
+        self,
+        min_score: int | None = None,
+        min_comments: int | None = None,
+        flair: str | Iterable[str] | None = None,
+        domain: str | None = None,
+        nsfw: bool | None = None,
+        title_pattern: str | None = None,
+        max_age: float | None = None,
+        min_age: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        min_score = _convert(min_score, int, 'minimum score')
+        min_comments = _convert(min_comments, int, 'minimum number of comments')
+        max_age = _convert(max_age, float, 'maximum age')
+        min_age = _convert(min_age, float, 'minimum age')
+        nsfw = _convert(nsfw, bool, 'NSFW filter')
+        if max_age is not None and max_age <= 0:
+            raise fire_error('The maximum age must be positive')
+        if min_age is not None and min_age < 0:
+            raise fire_error('The minimum age can not be negative')
+        if max_age is not None and min_age is not None and min_age >= max_age:
+            raise fire_error('The minimum age must be below the maximum age')
+        try:
+            self.title_pattern = re.compile(title_pattern) if title_pattern is not None else None
+        except re.error as e:
+            raise fire_error(f'Invalid title pattern {title_pattern!r}: {e}') from e
+        # Fire hands over a comma separated argument either as a string or as a tuple
+        raw_flairs = flair.split(',') if isinstance(flair, str) else flair
+        self.flairs = (
+            frozenset(str(name).strip().lower() for name in raw_flairs if str(name).strip())
+            if raw_flairs is not None
+            else None
+        )
+        self.min_score = min_score
+        self.min_comments = min_comments
+        self.domain = domain.lower().removeprefix('www.') if domain else None
+        self.nsfw = nsfw
+        now = clock()
+        self.created_after = now - max_age * 3600 if max_age is not None else None
+        self.created_before = now - min_age * 3600 if min_age is not None else None
+        conditions = {
+            'score': min_score is not None,
+            'num_comments': min_comments is not None,
+            'link_flair_text': self.flairs is not None,
+            'domain': self.domain is not None,
+            'over_18': nsfw is not None,
+            'title': self.title_pattern is not None,
+            'created_utc': max_age is not None or min_age is not None,
+        }
+        # The post fields the conditions read
+        self.fields = frozenset(field for field, used in conditions.items() if used)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.fields)
+
+    def matches(self, post: Any) -> bool:
+        """Check whether `post` meets every condition."""
+        if self.min_score is not None and post.score < self.min_score:
+            return False
+        if self.min_comments is not None and post.num_comments < self.min_comments:
+            return False
+        if self.flairs is not None and (post.link_flair_text or '').strip().lower() not in self.flairs:
+            return False
+        if self.domain is not None:
+            domain = (post.domain or '').lower().removeprefix('www.')
+            if domain != self.domain and not domain.endswith(f'.{self.domain}'):
+                return False
+        if self.nsfw is not None and bool(post.over_18) != self.nsfw:
+            return False
+        if self.title_pattern is not None and not self.title_pattern.search(post.title or ''):
+            return False
+        if self._too_old(post):
+            return False
+        return self.created_before is None or post.created_utc <= self.created_before
+
+    def _too_old(self, post: Any) -> bool:
+        return self.created_after is not None and post.created_utc < self.created_after
+
+    def filter(self, posts: Iterable[T], limit: int, time_ordered: bool = False) -> Iterator[T]:
+        """Lazily get the first `limit` of `posts` that meet every condition.
+
+        `posts` is not advanced any further once `limit` posts matched,
+        or, when it is ordered newest first, once a post is older than
+        the maximum age, so no page past them is requested.
+
+        Args:
+            posts: The posts of a listing
+            limit: The most posts to get
+            time_ordered: Whether `posts` come newest first
+
+        """
+        if limit < 1:
+            return
+        found = 0
+        for post in posts:
+            if time_ordered and self._too_old(post):
+                return
+            if self.matches(post):
+                yield post
+                found += 1
+                if found == limit:
+                    return
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+)
+
+from .storage import (
+    file_lock,
+    load_json_object,
+    replace_json,
+)
+from .types import SortingOption
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Iterator,
+    )
+    from pathlib import Path
+
+# Listings whose posts come newest first, so paginating can stop at the mark
+TIME_ORDERED_SORTINGS = frozenset({SortingOption.NEW})
+# How many posts returned from other listings are remembered, twice what one listing can hold
+MAX_SEEN = 2000
+
+
+class Mark(NamedTuple):
+    """The newest post seen in a listing.
+
+    Listings that are not time ordered can show a post that is older
+    than the newest one seen for the first time, so the fullnames of
+    the posts returned from them are kept too, most recent first.
+    """
+
+    fullname: str
+    created_utc: float
+    seen: tuple[str, ...] = ()
+
+
+class HighWaterMarks:
+    """The newest post seen so far for each subreddit and sorting, stored on disk.
+
+    Args:
+        path: The JSON file the marks are kept in
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(subreddit: str, sorting: SortingOption) -> str:
+        return f'{subreddit.lower()}/{sorting.value}'
+
+    def get(self, subreddit: str, sorting: SortingOption) -> Mark | None:
+        mark = load_json_object(self.path).get(self.key(subreddit, sorting))
+        if not isinstance(mark, dict):
+            return None
+        seen = mark.get('seen') or ()
+        if not isinstance(seen, list | tuple):
+            return None
+        try:
+            return Mark(str(mark['fullname']), float(mark['created_utc']), tuple(str(name) for name in seen))
+        except (TypeError, KeyError, ValueError):
+            return None
+
+    def set(self, subreddit: str, sorting: SortingOption, mark: Mark) -> None:
+        # Concurrent runs update the file one at a time, so none loses the others' marks
+        with self._lock, file_lock(self.path):
+            marks = load_json_object(self.path)
+            marks[self.key(subreddit, sorting)] = mark._asdict()
+            replace_json(self.path, marks)
+
+
+def iter_unseen(posts: Iterable[Any], mark: Mark | None, sorting: SortingOption) -> Iterator[Any]:
+    """Yield the posts that were not returned before `mark` was taken.
+
+    For listings that are ordered newest first these are the posts
+    created after the mark, and the iteration stops at the first post
+    that was already seen, so no further pages are requested. Other
+    listings are filtered post by post against the fullnames the mark
+    remembers.
+    """
+    if mark is None:
+        yield from posts
+        return
+    time_ordered = sorting in TIME_ORDERED_SORTINGS
+    seen = frozenset(mark.seen)
+    for post in posts:
+        if time_ordered or not seen:
+            # Marks from before fullnames were remembered only have the newest post
+            already_seen = post.name == mark.fullname or post.created_utc <= mark.created_utc
+        else:
+            already_seen = post.name in seen
+        if already_seen:
+            if time_ordered:
+                return
+            continue
+        yield post
+
+
+def newest_mark(mark: Mark | None, post: Any) -> Mark | None:
+    """Get whichever of `mark` and `post` is newer as a mark, keeping the fullnames `mark` remembers."""
+    if mark is None or post.created_utc > mark.created_utc:
+        return Mark(post.name, float(post.created_utc), mark.seen if mark is not None else ())
+    return mark
+
+
+def remember_seen(mark: Mark, fullnames: Iterable[str]) -> Mark:
+    """Add `fullnames` to the posts `mark` remembers, forgetting the oldest beyond `MAX_SEEN`.
+
+    >>> remember_seen(Mark('t3_b', 2.0, ('t3_a',)), ['t3_b', 't3_c']).seen
+    ('t3_b', 't3_c', 't3_a')
+    """
+    added = tuple(fullnames)
+    return mark._replace(seen=(*added, *(name for name in mark.seen if name not in added))[:MAX_SEEN])
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import contextlib
+import csv
+import json
+from pathlib import Path
+import sys
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+)
+
+from .cache import JSON_SCALARS
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Iterator,
+    )
+
+    from .projection import SubmissionRecord
+
+TEXT_FORMATS = frozenset({'ndjson', 'csv'})
+COLUMNAR_FORMATS = frozenset({'parquet', 'arrow'})
+OUTPUT_FORMATS = ('text', *sorted(TEXT_FORMATS), *sorted(COLUMNAR_FORMATS))
+# Rows per Parquet row group or Arrow record batch, bounding the memory a bulk pull needs
+BATCH_SIZE = 1000
+# Column types of the submission fields Reddit always sends with the same type, other fields are written as strings
+FIELD_TYPES = {
+    **dict.fromkeys(
+        (
+            'downs', 'gilded', 'num_comments', 'num_crossposts', 'score', 'subreddit_subscribers',
+            'total_awards_received', 'ups', 'view_count',
+        ),
+        'int64',
+    ),
+    **dict.fromkeys(('created', 'created_utc', 'upvote_ratio'), 'float64'),
+    **dict.fromkeys(
+        (
+            'archived', 'is_original_content', 'is_self', 'is_video', 'locked', 'over_18', 'pinned', 'quarantine',
+            'spoiler', 'stickied',
+        ),
+        'bool',
+    ),
+}
+
+
+def parse_fields(fields: str | list[str] | tuple[str, ...]) -> tuple[str, ...]:
+    """Parse the fields to export, given as a comma separated string or a list.
+
+    >>> parse_fields('title, score,title')
+    ('title', 'score')
+    """
+    names = fields.split(',') if isinstance(fields, str) else [str(field) for field in fields]
+    parsed = tuple(dict.fromkeys(name.strip() for name in names if name.strip()))
+    if not parsed:
+        raise fire_error('You must choose at least one field to output')
+    return parsed
+
+
+def to_scalar(value: Any) -> Any:
+    """Get a value that can be written to any output format, objects such as the author becoming their name."""
+    return value if isinstance(value, JSON_SCALARS) else str(value)
+
+
+def iter_rows(records: Iterable[SubmissionRecord], fields: tuple[str, ...]) -> Iterator[dict[str, Any]]:
+    return ({field: to_scalar(getattr(record, field)) for field in fields} for record in records)
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: PLC0415
+    except ImportError as e:
+        msg = 'Parquet and Arrow output need pyarrow, install it with `pip install reddit-get[arrow]`'
+        raise fire_error(msg) from e
+    return pyarrow
+
+
+def check_output_format(output: str) -> None:
+    """Make sure `output` can be written before anything is fetched.
+
+    Raises:
+        fire.core.FireError: If the format is unknown or its dependencies are missing
+
+    """
+    if output not in OUTPUT_FORMATS:
+        raise fire_error(f'{output} is not a valid output format, choose from {", ".join(OUTPUT_FORMATS)}')
+    if output in COLUMNAR_FORMATS:
+        _import_pyarrow()
+
+
+def write_ndjson(rows: Iterable[dict[str, Any]], file: IO[str]) -> int:
+    count = 0
+    for count, row in enumerate(rows, 1):  # noqa: B007
+        file.write(json.dumps(row, ensure_ascii=False) + '\n')
+    return count
+
+
+def write_csv(rows: Iterable[dict[str, Any]], fields: tuple[str, ...], file: IO[str]) -> int:
+    writer = csv.DictWriter(file, fieldnames=fields, lineterminator='\n')
+    writer.writeheader()
+    count = 0
+    for count, row in enumerate(rows, 1):  # noqa: B007
+        writer.writerow(row)
+    return count
+
+
+def _iter_batches(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_columnar(
+    rows: Iterable[dict[str, Any]], fields: tuple[str, ...], file: IO[bytes], output: str,
+) -> int:
+    """Write rows as Parquet or as an Arrow IPC stream, one row group or record batch at a time.
+
+    Every batch has to fit the schema the file was started with, so the
+    column types are not inferred from the rows: fields in
+    `FIELD_TYPES` get their type and all others are written as strings.
+    A value that does not fit its column, which Reddit does not send for
+    these fields, is written as null.
+    """
+    pa = _import_pyarrow()
+    types = {field: FIELD_TYPES.get(field, 'string') for field in fields}
+    schema = pa.schema([(field, pa.type_for_alias(kind)) for field, kind in types.items()])
+    writer = _open_columnar_writer(pa, file, schema, output)
+    count = 0
+    try:
+        for batch in _iter_batches(rows, BATCH_SIZE):
+            columns = {field: [_conform(row[field], kind) for row in batch] for field, kind in types.items()}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def _conform(value: Any, kind: str) -> Any:
+    """Get `value` as a value of the column type `kind`, None if it does not fit.
+
+    >>> _conform(3.0, 'int64'), _conform(3, 'float64'), _conform(True, 'string'), _conform('3', 'int64')
+    (3, 3.0, 'True', None)
+    """
+    if value is None:
+        return None
+    if kind == 'string':
+        return value if isinstance(value, str) else str(value)
+    if kind == 'bool':
+        return value if isinstance(value, bool) else None
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    if kind == 'int64':
+        return int(value) if float(value).is_integer() else None
+    return float(value)
+
+
+def _open_columnar_writer(pa: Any, file: IO[bytes], schema: Any, output: str) -> Any:
+    if output == 'parquet':
+        import pyarrow.parquet  # noqa: PLC0415
+
+        return pyarrow.parquet.ParquetWriter(file, schema)
+    import pyarrow.ipc  # noqa: PLC0415
+
+    return pa.ipc.new_stream(file, schema)
+
+
+@contextlib.contextmanager
+def open_output(output_file: str | None, binary: bool) -> Iterator[IO[Any]]:
+    """Open `output_file` for writing, standard output if it is None or '-'."""
+    if output_file in {None, '-'}:
+        yield sys.stdout.buffer if binary else sys.stdout
+        return
+    path = Path(output_file).expanduser()  # type: ignore[arg-type]
+    with path.open('wb') if binary else path.open('w', newline='', encoding='utf-8') as file:
+        yield file
+
+
+def export_records(
+    records: Iterable[SubmissionRecord],
+    fields: tuple[str, ...],
+    output: str,
+    output_file: str | None = None,
+) -> int:
+    """Write the `fields` of each record in `output` format without any templating.
+
+    Rows are written as the records arrive, so memory use does not
+    depend on how many there are.
+
+    Returns:
+        The number of records written
+
+    """
+    binary = output in COLUMNAR_FORMATS
+    rows = iter_rows(records, fields)
+    with open_output(output_file, binary) as file:
+        if output == 'ndjson':
+            count = write_ndjson(rows, file)
+        elif output == 'csv':
+            count = write_csv(rows, fields, file)
+        else:
+            count = write_columnar(rows, fields, file, output)
+        file.flush()
+    return count
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import functools
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Iterator,
+    )
+
+# Submission properties that are computed from listing data rather than fetched
+COMPUTED_FIELDS = frozenset({'fullname', 'shortlink'})
+# Fields the listing data only has for some posts, e.g. crossposts, they are None for the others
+OPTIONAL_FIELDS = frozenset({'crosspost_parent'})
+
+
+class SubmissionRecord:
+    """A compact, read-only copy of the fields of a submission that are needed for output.
+
+    Use `get_record_type` to get a record class for a set of fields.
+    """
+
+    __slots__: tuple[str, ...] = ()
+
+    if TYPE_CHECKING:
+        # The fields are only known once `get_record_type` made the class
+        def __getattr__(self, name: str) -> Any: ...
+
+    def __init__(self, *values: Any) -> None:
+        for name, value in zip(self.__slots__, values, strict=True):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+
+@functools.lru_cache(maxsize=64)
+def get_record_type(fields: tuple[str, ...]) -> type[SubmissionRecord]:
+    """Get the record class that holds exactly `fields`.
+
+    >>> get_record_type(('score', 'title'))(10, 'A title')
+    SubmissionRecord(score=10, title='A title')
+    """
+    invalid = [field for field in fields if not field.isidentifier()]
+    if invalid:
+        raise fire_error(f'Invalid post field names: {", ".join(invalid)}')
+    return type('SubmissionRecord', (SubmissionRecord,), {'__slots__': fields})
+
+
+def project_post(post: object, fields: tuple[str, ...]) -> SubmissionRecord:
+    """Copy `fields` from `post` into a compact record.
+
+    Values are read straight from the data the listing response already
+    loaded into the submission. PRAW fetches a submission again, with
+    one extra request per post, whenever an attribute that was not in
+    the listing is accessed, so such fields are refused instead.
+
+    Raises:
+        fire.core.FireError: If a field is not available without a
+        request for each post
+
+    """
+    data = getattr(post, '__dict__', {})
+    values = []
+    for field in fields:
+        if field in data or field in OPTIONAL_FIELDS:
+            values.append(data.get(field))
+            continue
+        if field not in COMPUTED_FIELDS and data.get('_fetched') is False:
+            msg = (
+                f"'{field}' is not part of the listing data. Getting it would need one extra "
+                f'request for every post, remove it from the output template.'
+            )
+            raise fire_error(msg)
+        try:
+            values.append(getattr(post, field))
+        except AttributeError as e:
+            raise fire_error(e) from e
+    return get_record_type(fields)(*values)
+
+
+def project_posts(posts: Iterable[object], fields: Iterable[str]) -> Iterator[SubmissionRecord]:
+    """Lazily project each of `posts` onto `fields`."""
+    field_names = tuple(sorted(fields))
+    return (project_post(post, field_names) for post in posts)
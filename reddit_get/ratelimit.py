@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Mapping,
+    )
+
+# Reddit's rate limit window, used when the reset time is unknown
+WINDOW_SECONDS = 600
+# Requests are only paced once fewer than this many remain in the window
+DEFAULT_BURST = 10
+
+
+class RateLimitScheduler:
+    """A token bucket shared by every request a process makes to Reddit.
+
+    The bucket is filled from the `X-Ratelimit-Remaining` and
+    `X-Ratelimit-Reset` headers of each response. Requests go out
+    without delay while the budget is comfortable. Once only `burst`
+    requests remain, the rest of the budget is spread evenly over the
+    time left in the window, and with no budget left requests wait for
+    the window to reset.
+
+    The state is saved to `state_path` after every response so the next
+    invocation starts with the budget this one left behind instead of
+    finding out about it from a 429.
+
+    Args:
+        state_path: Where to persist the state between runs, if at all
+        burst: How many requests may go out back to back before pacing
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(
+        self,
+        state_path: Path | None = None,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.state_path = state_path
+        self.burst = burst
+        self.clock = clock
+        self.remaining: float | None = None
+        self.reset_at: float | None = None
+        self.last_request_at = 0.0
+        self._lock = threading.Lock()
+        self.load()
+
+    def acquire(self) -> float:
+        """Wait until a request may be sent without exceeding the rate limit.
+
+        The request's slot is reserved before waiting, and the wait
+        happens without holding the lock, so other threads can take the
+        slots after it and `update` is not held up meanwhile.
+
+        Returns:
+            The number of seconds spent waiting
+
+        """
+        with self._lock:
+            now = self.clock()
+            wait = self._wait_time(now)
+            send_at = now + wait
+            if self.reset_at is not None and send_at >= self.reset_at:
+                # The window will have reset, the next response will tell us the new budget
+                self.remaining = self.reset_at = None
+            if self.remaining is not None:
+                self.remaining -= 1
+            self.last_request_at = send_at
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _wait_time(self, now: float) -> float:
+        # Requests that reserved a later slot go first
+        pending = max(0.0, self.last_request_at - now)
+        if self.remaining is None or self.reset_at is None or now >= self.reset_at:
+            return pending
+        until_reset = self.reset_at - now
+        if self.remaining < 1:
+            return until_reset
+        if self.remaining > self.burst:
+            return 0.0
+        interval = until_reset / self.remaining
+        return max(0.0, self.last_request_at + interval - now)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Update the budget from the rate limit headers of a response."""
+        try:
+            remaining = float(headers['x-ratelimit-remaining'])
+            reset = float(headers['x-ratelimit-reset'])
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            self.remaining = remaining
+            self.reset_at = self.clock() + reset
+        self.save()
+
+    def retry_delay(self, attempt: int) -> float:
+        """Get how long to wait before retrying a rate limited request.
+
+        This is the time left until the window resets when that is
+        known, and exponential backoff (1s, 2s, 4s, ...) otherwise.
+        """
+        with self._lock:
+            if self.reset_at is not None and self.reset_at > self.clock():
+                return min(self.reset_at - self.clock(), WINDOW_SECONDS)
+        return 2**attempt
+
+    def load(self) -> None:
+        """Load the state saved by a previous run, ignoring it if its window has already reset."""
+        if self.state_path is None:
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+            remaining, reset_at = float(state['remaining']), float(state['reset_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if reset_at > self.clock():
+            self.remaining, self.reset_at = remaining, reset_at
+
+    def save(self) -> None:
+        if self.state_path is None or self.remaining is None:
+            return
+        state = {'remaining': self.remaining, 'reset_at': self.reset_at}
+        with contextlib.suppress(OSError):
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Replace the file in one step so concurrent runs never read a partial state
+            fd, tmp_name = tempfile.mkstemp(dir=self.state_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(state, tmp)
+            Path(tmp_name).replace(self.state_path)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+from urllib.parse import (
+    parse_qsl,
+    urlencode,
+    urlsplit,
+)
+
+from .errors import fire_error
+from .tokens import TOKEN_PATH
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Mapping,
+    )
+
+    from requests import Response
+
+# Access tokens are never written to a recording, replays get this one instead
+REPLAYED_TOKEN = {'access_token': 'replayed', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'}
+RECORDED_HEADERS = frozenset({'content-type', 'x-ratelimit-remaining', 'x-ratelimit-reset', 'x-ratelimit-used'})
+
+
+def request_key(method: str, url: str, params: Mapping[str, Any] | Iterable[tuple[str, Any]] | None = None) -> str:
+    """Identify a request by its method, path and sorted query parameters.
+
+    >>> request_key('get', 'https://oauth.reddit.com/r/aww/top?t=all', {'limit': 100, 'raw_json': 1})
+    'GET /r/aww/top?limit=100&raw_json=1&t=all'
+    """
+    split = urlsplit(url)
+    query = parse_qsl(split.query)
+    if params:
+        query.extend(params.items() if hasattr(params, 'items') else params)  # type: ignore[union-attr]
+    key = f'{method.upper()} {split.path}'
+    if query:
+        key += '?' + urlencode(sorted((str(name), str(value)) for name, value in query))
+    return key
+
+
+class Recorder:
+    """Write every response the requestor gets to a file, one JSON object per line.
+
+    Args:
+        path: The recording to write, replaced if it exists
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('')
+        except OSError as e:
+            raise fire_error(f'Could not create the recording {path}: {e}') from e
+
+    def record(self, key: str, response: Response, elapsed: float) -> None:
+        body = response.text
+        if key.startswith(f'POST {TOKEN_PATH}'):
+            body = json.dumps(REPLAYED_TOKEN)
+        interaction = {
+            'key': key,
+            'status': response.status_code,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() in RECORDED_HEADERS},
+            'body': body,
+            'elapsed': round(elapsed, 6),
+        }
+        with self._lock, self.path.open('a', encoding='utf-8') as file:
+            file.write(json.dumps(interaction) + '\n')
+
+
+class Replayer:
+    """Answer requests with the responses in a recording instead of going to Reddit.
+
+    Responses are matched on `request_key`. When the same request was
+    recorded several times, the responses are replayed in the order
+    they were recorded, the last one being repeated once they run out.
+
+    Args:
+        path: A recording written by `Recorder`
+        latency: Seconds to wait before each response, to simulate the
+        network. A negative value waits as long as the recorded
+        request took.
+
+    """
+
+    def __init__(self, path: Path, latency: float = 0.0) -> None:
+        self.path = path
+        self.latency = latency
+        self._interactions: dict[str, list[dict[str, Any]]] = {}
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+        try:
+            lines = path.read_text(encoding='utf-8').splitlines()
+        except OSError as e:
+            raise fire_error(f'Could not read the recording {path}: {e}') from e
+        for line in lines:
+            if line.strip():
+                interaction = json.loads(line)
+                self._interactions.setdefault(interaction['key'], []).append(interaction)
+
+    def response(self, key: str) -> Response:
+        """Get the recorded response for the request identified by `key`.
+
+        Raises:
+            fire.core.FireError: If the request was not recorded
+
+        """
+        from .requestor import build_response  # noqa: PLC0415
+
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions and key.startswith(f'POST {TOKEN_PATH}'):
+                interactions = [{'status': 200, 'headers': {}, 'body': json.dumps(REPLAYED_TOKEN), 'elapsed': 0}]
+            if not interactions:
+                raise fire_error(f'{self.path} has no recorded response for {key}')
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            interaction = interactions[min(served, len(interactions) - 1)]
+        delay = interaction['elapsed'] if self.latency < 0 else self.latency
+        if delay > 0:
+            time.sleep(delay)
+        url = key.partition(' ')[2]
+        return build_response(interaction['status'], interaction['headers'], interaction['body'], url)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from prawcore import Requestor
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from .tokens import TOKEN_PATH
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .ratelimit import RateLimitScheduler
+    from .replay import (
+        Recorder,
+        Replayer,
+    )
+    from .revalidate import Revalidation
+    from .timings import Timings
+    from .tokens import TokenCache
+
+
+def build_response(status: int, headers: Mapping[str, str], body: str, url: str = '') -> Response:
+    """Make a response that did not come from the network look like one that did."""
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body.encode()  # noqa: SLF001
+    response.encoding = 'utf-8'
+    response.url = url
+    return response
+
+
+class RedditGetRequestor(Requestor):
+    """The prawcore requestor reddit-get hands to PRAW.
+
+    Every HTTP request PRAW makes goes through `request`, which makes it
+    the one place to hook behavior into the transport. Requests to the
+    OAuth API are paced by the shared rate limit scheduler. Access
+    tokens are shared with other processes through the token cache.
+    The first page of a listing the CLI has a stale copy of is requested
+    conditionally. Responses can be recorded to a file, or answered
+    from one without going to Reddit at all.
+
+    Args:
+        scheduler: Paces API requests based on Reddit's rate limit
+        headers
+        recorder: Records every response
+        replayer: Answers requests with recorded responses
+        timings: Records a span for each request and rate limit wait
+        token_cache: Shares access tokens between processes
+        revalidation: Tells which requests are listings to revalidate
+        **kwargs: Passed on to `prawcore.Requestor`
+
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        scheduler: RateLimitScheduler | None = None,
+        recorder: Recorder | None = None,
+        replayer: Replayer | None = None,
+        timings: Timings | None = None,
+        token_cache: TokenCache | None = None,
+        revalidation: Revalidation | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+        self.recorder = recorder
+        self.replayer = replayer
+        self.timings = timings
+        self.token_cache = token_cache
+        self.revalidation = revalidation
+        self._token_key: str | None = None
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response:
+        if self.token_cache and method.lower() == 'post' and url.endswith(TOKEN_PATH):
+            return self._request_token(method, url, *args, **kwargs)
+        # Access token requests go to www.reddit.com and do not count towards the API budget
+        api_request = url.startswith(self.oauth_url)
+        scheduler = self.scheduler if api_request else None
+        listing = self.revalidation.take(url) if self.revalidation and api_request and method.lower() == 'get' else None
+        if listing and listing.previous:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **listing.previous.conditional_headers()}
+        if scheduler:
+            started_at = time.time()
+            waited = scheduler.acquire()
+            if waited and self.timings:
+                self.timings.add('rate_limit_wait', started_at, waited)
+        response = self._send(method, url, *args, **kwargs)
+        if scheduler:
+            scheduler.update(response.headers)
+        if response.status_code == 401 and self.token_cache and self._token_key:  # noqa: PLR2004
+            # The shared token was revoked, make the next process request a new one
+            self.token_cache.invalidate(self._token_key)
+        if listing:
+            listing.check(response)
+        return response
+
+    def _request_token(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response:
+        """Get an access token from the token cache, only asking Reddit when there is no usable one."""
+        assert self.token_cache is not None  # noqa: S101
+        key = self.token_cache.key(url, kwargs.get('data'), kwargs.get('auth'))
+        self._token_key = key
+        with self.token_cache.locked():
+            token = self.token_cache.get(key)
+            if token is not None:
+                return build_response(200, {'content-type': 'application/json'}, json.dumps(token), url)
+            requested_at = time.time()
+            response = self._send(method, url, *args, **kwargs)
+            if response.status_code == 200:  # noqa: PLR2004
+                with contextlib.suppress(ValueError):
+                    self.token_cache.set(key, response.json(), requested_at)
+        return response
+
+    def _send(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response:
+        if not self.timings:
+            return self._send_or_replay(method, url, *args, **kwargs)
+        with self.timings.span('http', method=method.upper(), url=url) as span:
+            response = self._send_or_replay(method, url, *args, **kwargs)
+            span.update(status=response.status_code, bytes=len(response.content))
+        return response
+
+    def _send_or_replay(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response:
+        if self.replayer or self.recorder:
+            from .replay import request_key  # noqa: PLC0415
+
+            key = request_key(method, url, kwargs.get('params'))
+        if self.replayer:
+            response = self.replayer.response(key)
+        else:
+            start = time.perf_counter()
+            response = super().request(method, url, *args, **kwargs)
+            if self.recorder:
+                self.recorder.record(key, response, time.perf_counter() - start)
+        return response
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import threading
+from typing import (
+    TYPE_CHECKING,
+    NamedTuple,
+)
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from requests import Response
+
+# Only listings that fit in one page are revalidated. An unchanged first
+# page says nothing about the pages after it.
+MAX_REVALIDATED_LIMIT = 100
+NOT_MODIFIED = 304
+
+
+class ListingUnchanged(Exception):  # noqa: N818
+    """Raised by the requestor when a listing did not change since the validator was taken.
+
+    It is raised before PRAW sees the response, so nothing is parsed.
+    """
+
+
+class Validator(NamedTuple):
+    """What is needed to ask Reddit whether a response changed, and to tell if it did."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: str
+
+    @classmethod
+    def from_response(cls, response: Response) -> Validator:
+        return cls(
+            response.headers.get('etag'),
+            response.headers.get('last-modified'),
+            hashlib.sha256(response.content).hexdigest(),
+        )
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Get the headers of a conditional request.
+
+        >>> Validator('"abc"', None, 'digest').conditional_headers()
+        {'If-None-Match': '"abc"'}
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ListingState:
+    """The revalidation of one listing fetch.
+
+    Args:
+        previous: The validator of the cached copy, if there is one
+
+    """
+
+    def __init__(self, previous: Validator | None) -> None:
+        self.previous = previous
+        self.validator: Validator | None = None
+
+    def check(self, response: Response) -> None:
+        """Take the validator of `response`.
+
+        Raises:
+            ListingUnchanged: If Reddit answered 304 Not Modified, or
+            sent the same body as before because it ignored the
+            conditional request
+
+        """
+        if response.status_code == NOT_MODIFIED and self.previous is not None:
+            self.validator = self.previous
+            raise ListingUnchanged
+        if response.ok:
+            self.validator = Validator.from_response(response)
+            if self.previous is not None and self.validator.digest == self.previous.digest:
+                raise ListingUnchanged
+
+
+class Revalidation:
+    """Conditional listing requests, shared by the CLI and the requestor.
+
+    The CLI fetches a listing inside `listing`. The requestor then
+    makes the first request the same thread sends for the listing's
+    path a conditional one, see `take`. Listings are fetched one page at
+    a time in the thread iterating them, so that request is the
+    listing's first page. Other requests sent meanwhile, such as the one
+    PRAW makes to check a username and password, are left alone.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def listing(self, previous: Validator | None, path: str) -> Iterator[ListingState]:
+        """Revalidate the listing at `path` fetched in the `with` block against `previous`.
+
+        Args:
+            previous: The validator of the cached copy, if there is one
+            path: The start of the listing's URL path, e.g. `/r/aww/`
+
+        """
+        state = ListingState(previous)
+        self._local.state = state
+        self._local.path = path.lower()
+        try:
+            yield state
+        finally:
+            self._local.state = None
+
+    def take(self, url: str) -> ListingState | None:
+        """Get the state of the listing being fetched by this thread, if `url` is its first page.
+
+        >>> revalidation = Revalidation()
+        >>> with revalidation.listing(None, '/r/aww/'):
+        ...     revalidation.take('https://oauth.reddit.com/api/v1/me') is None
+        True
+        """
+        state = getattr(self._local, 'state', None)
+        if state is None or not urlsplit(url).path.lower().startswith(self._local.path):
+            return None
+        self._local.state = None
+        return state
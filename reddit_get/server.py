@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import socket
+import socketserver
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from .errors import (
+    fire_error,
+    is_fire_error,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .cli import RedditCli
+
+# Commands the server answers, output that is written rather than returned can not be sent back
+SERVED_COMMANDS = frozenset({'post'})
+UNSERVED_OPTIONS = frozenset({'stream', 'output', 'output_file'})
+DEFAULT_SOCKET_NAME = 'serve.sock'
+CLIENT_TIMEOUT = 120.0
+
+
+def _require_unix_sockets() -> None:
+    if not hasattr(socket, 'AF_UNIX'):  # pragma: no cover
+        raise fire_error('reddit-get serve needs Unix domain sockets, which this platform does not have')
+
+
+def is_listening(path: Path) -> bool:
+    """Check whether a server is accepting connections on `path`."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Answer the queries sent over one connection, one JSON object per line."""
+
+    server: QueryServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.answer(line)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class QueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Answer `post` queries on a Unix socket with one long-lived `RedditCli`.
+
+    The CLI keeps its authenticated Reddit session, connection pool,
+    rate limit budget and compiled templates between queries, so a
+    query only costs the listing requests themselves.
+
+    Each request is a JSON object with the `command` to run and its
+    `kwargs`. The response is `{"result": ...}` or `{"error": ...}`.
+
+    Args:
+        path: The socket file to listen on
+        cli: The CLI that runs the queries
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, cli: RedditCli) -> None:
+        _require_unix_sockets()
+        if path.exists():
+            if is_listening(path):
+                raise fire_error(f'A reddit-get server is already listening on {path}')
+            # Left behind by a server that did not shut down cleanly
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.cli = cli
+        super().__init__(str(path), QueryHandler)
+
+    def answer(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+            command, kwargs = request['command'], request.get('kwargs') or {}
+        except (ValueError, TypeError, KeyError):
+            return {'error': 'Requests must be JSON objects with a command and its kwargs'}
+        if command not in SERVED_COMMANDS:
+            return {'error': f'{command} can not be run through the server'}
+        unserved = sorted(UNSERVED_OPTIONS & set(kwargs))
+        if unserved:
+            return {'error': f'{", ".join(unserved)} can not be used through the server'}
+        try:
+            result = getattr(self.cli, command)(**kwargs)
+        except TypeError as e:
+            return {'error': str(e)}
+        except Exception as e:
+            if not is_fire_error(e):
+                raise
+            return {'error': str(e)}
+        return {'result': result}
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            self.path.unlink()
+
+
+def send_query(path: Path, command: str, kwargs: dict[str, Any], timeout: float = CLIENT_TIMEOUT) -> Any:
+    """Run `command` on the server listening on `path`.
+
+    Raises:
+        fire.core.FireError: If no server is listening or the command failed
+
+    """
+    _require_unix_sockets()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(path))
+        except OSError as e:
+            msg = f'No reddit-get server is listening on {path}, start one with `reddit-get serve`'
+            raise fire_error(msg) from e
+        request = json.dumps({'command': command, 'kwargs': kwargs}).encode() + b'\n'
+        sock.sendall(request)
+        with sock.makefile('rb') as response_file:
+            line = response_file.readline()
+    if not line:
+        raise fire_error(f'The reddit-get server on {path} closed the connection without answering')
+    response = json.loads(line)
+    if 'error' in response:
+        raise fire_error(response['error'])
+    return response['result']
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+if sys.platform != 'win32':
+    import fcntl
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold `path` exclusively against other processes, with a lock file next to it.
+
+    Nothing is locked where there is no `fcntl`, or when the lock file
+    can not be created, as the files kept this way are optimizations
+    that must never fail a command.
+    """
+    if sys.platform == 'win32':  # pragma: no cover
+        yield
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = path.with_name(f'{path.name}.lock').open('a')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_json_object(path: Path) -> dict[str, Any]:
+    """Read the JSON object in `path`, or an empty one if it is missing or broken."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def replace_json(path: Path, data: Any) -> None:
+    """Write `data` to `path` as JSON in one step, so concurrent readers never see part of it.
+
+    The file is only readable by its owner, as mkstemp creates it that
+    way. Failing to write it is ignored.
+    """
+    with contextlib.suppress(OSError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as tmp:
+            json.dump(data, tmp)
+        Path(tmp_name).replace(path)
@@ -0,0 +1,275 @@
+"""A local stand-in for the Reddit API, for trying reddit-get out offline.
+
+Point reddit-get at it by adding its address to the config file:
+
+    [reddit-get]
+    client_id = "stub"
+    client_secret = "stub"
+    user_agent = "reddit-get stub"
+    oauth_url = "http://127.0.0.1:8765"
+    reddit_url = "http://127.0.0.1:8765"
+
+and start it with `python -m reddit_get.stub --port 8765`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+import json
+import re
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    cast,
+)
+from urllib.parse import (
+    parse_qs,
+    urlsplit,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Iterable,
+        Mapping,
+    )
+
+# Reddit returns at most this many posts per listing page
+PAGE_SIZE = 100
+
+# Every subreddit has this many subscribers
+SUBSCRIBERS = 1000
+# Posts take turns having these flairs
+FLAIRS = ('News', None, 'Discussion')
+# Every post has this many top-level comments, each with this many replies
+COMMENTS_PER_LEVEL = 3
+_LISTING_PATH = re.compile(r'^/r/(?P<subreddit>[^/]+)/(?P<sorting>[a-z]+)/?$')
+_COMMENTS_PATH = re.compile(r'^/comments/(?P<subreddit>[a-z_]+?)(?P<index>[0-9]+)/?$')
+_FULLNAME = re.compile(r'^t3_(?P<subreddit>[a-z_]+?)(?P<index>[0-9]+)$')
+
+
+def make_post(subreddit: str, index: int, now: float, links_to: str | None = None) -> dict[str, Any]:
+    """Make the listing data for the `index`th post of `subreddit`, newest first.
+
+    With `links_to`, the post links to the same page as the `index`th
+    post of that subreddit, like a crosspost of it does.
+    """
+    post_id = f'{subreddit.lower()}{index}'
+    return {
+        'id': post_id,
+        'name': f't3_{post_id}',
+        'title': f'Post {index} in r/{subreddit}',
+        'subreddit': subreddit,
+        'subreddit_subscribers': SUBSCRIBERS,
+        'author': f'user{index % 7}',
+        'score': 1000 - index,
+        'num_comments': index % 13,
+        'created_utc': now - index * 60,
+        'url': f'https://example.com/{(links_to or subreddit).lower()}{index}',
+        'permalink': f'/r/{subreddit}/comments/{post_id}/',
+        'domain': 'example.com',
+        'link_flair_text': FLAIRS[index % len(FLAIRS)],
+        'selftext': '',
+        'over_18': index % 10 == 9,
+        'is_self': False,
+    }
+
+
+def make_comment(post_id: str, path: tuple[int, ...], depth: int, now: float) -> dict[str, Any]:
+    """Make the `path`th comment on a post, with its replies down to `depth` levels."""
+    comment_id = f'{post_id}c' + '_'.join(map(str, path))
+    replies: dict[str, Any] | str = ''
+    if len(path) < depth:
+        children = [
+            {'kind': 't1', 'data': make_comment(post_id, (*path, index), depth, now)}
+            for index in range(COMMENTS_PER_LEVEL)
+        ]
+        replies = {'kind': 'Listing', 'data': {'after': None, 'before': None, 'children': children}}
+    return {
+        'id': comment_id,
+        'name': f't1_{comment_id}',
+        'body': f'Comment {".".join(map(str, path))} on {post_id}',
+        'author': f'commenter{sum(path) % 5}',
+        'score': 100 - sum(path),
+        'depth': len(path) - 1,
+        'created_utc': now,
+        'link_id': f't3_{post_id}',
+        'parent_id': f't1_{post_id}c' + '_'.join(map(str, path[:-1])) if len(path) > 1 else f't3_{post_id}',
+        'replies': replies,
+    }
+
+
+class StubRedditServer(ThreadingHTTPServer):
+    """An HTTP server that answers the few Reddit API calls reddit-get makes.
+
+    Every subreddit exists and has `posts_per_subreddit` posts, except
+    the ones in `missing`, which answer like a private subreddit does.
+    Listings have an ETag and honor If-None-Match. Every post has
+    `COMMENTS_PER_LEVEL` comments, each with as many replies, two levels
+    deep.
+
+    Args:
+        address: The (host, port) to listen on, port 0 picks a free one
+        posts_per_subreddit: How many posts each listing has in total
+        missing: Subreddits that do not exist
+        mirrors: Subreddits whose posts link to the same pages as the
+        posts of another subreddit, e.g. {'crossposts': 'news'}
+
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ('127.0.0.1', 0),
+        posts_per_subreddit: int = 1000,
+        missing: Iterable[str] = (),
+        mirrors: Mapping[str, str] | None = None,
+    ) -> None:
+        super().__init__(address, StubRedditHandler)
+        self.posts_per_subreddit = posts_per_subreddit
+        self.missing = {name.lower() for name in missing}
+        self.mirrors = {name.lower(): source for name, source in (mirrors or {}).items()}
+        self.started_at = time.time()
+        self.requests: list[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        # An IPv4 or IPv6 server, whose host is a str
+        host, port = cast('tuple[str, int]', self.server_address[:2])
+        return f'http://{host}:{port}'
+
+    def record(self, path: str) -> None:
+        with self._lock:
+            self.requests.append(path)
+
+    def listing(self, subreddit: str, params: dict[str, list[str]]) -> dict[str, Any]:
+        limit = min(int(params.get('limit', [str(PAGE_SIZE)])[0]), PAGE_SIZE)
+        start = 0
+        if 'after' in params:
+            # Fullnames end in the index of the post they belong to
+            after = params['after'][0].removeprefix(f't3_{subreddit.lower()}')
+            start = int(after) + 1 if after.isdigit() else self.posts_per_subreddit
+        end = min(start + limit, self.posts_per_subreddit)
+        children: list[dict[str, Any]] = [
+            {'kind': 't3', 'data': make_post(subreddit, index, self.started_at, self.mirrors.get(subreddit.lower()))}
+            for index in range(start, end)
+        ]
+        after_name = children[-1]['data']['name'] if end < self.posts_per_subreddit else None
+        return {
+            'kind': 'Listing',
+            'data': {'after': after_name, 'before': None, 'dist': len(children), 'children': children},
+        }
+
+    def info(self, fullnames: Iterable[str]) -> dict[str, Any]:
+        """Get the posts with `fullnames`, leaving out the ones that do not exist."""
+        children = []
+        for fullname in fullnames:
+            match = _FULLNAME.match(fullname)
+            if (
+                match is not None
+                and match['subreddit'] not in self.missing
+                and int(match['index']) < self.posts_per_subreddit
+            ):
+                post = make_post(match['subreddit'], int(match['index']), self.started_at)
+                children.append({'kind': 't3', 'data': post})
+        return {'kind': 'Listing', 'data': {'after': None, 'before': None, 'dist': len(children), 'children': children}}
+
+    def comments(self, subreddit: str, index: int) -> list[dict[str, Any]]:
+        post = make_post(subreddit, index, self.started_at)
+        comments = [
+            {'kind': 't1', 'data': make_comment(post['id'], (number,), 2, self.started_at)}
+            for number in range(COMMENTS_PER_LEVEL)
+        ]
+        return [
+            {'kind': 'Listing', 'data': {'after': None, 'before': None, 'children': [{'kind': 't3', 'data': post}]}},
+            {'kind': 'Listing', 'data': {'after': None, 'before': None, 'children': comments}},
+        ]
+
+
+class StubRedditHandler(BaseHTTPRequestHandler):
+    server: StubRedditServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Keep quiet, the requests are recorded on the server instead."""
+
+    def _send_json(self, body: object, status: int = 200, etag: bool = False) -> None:
+        data = json.dumps(body).encode()
+        tag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+        if etag and self.headers.get('If-None-Match') == tag:
+            status, data = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', tag)
+        # Plenty of budget, so the rate limit scheduler never paces the stub
+        self.send_header('X-Ratelimit-Remaining', '1000')
+        self.send_header('X-Ratelimit-Used', '0')
+        self.send_header('X-Ratelimit-Reset', '600')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        self.server.record(self.path)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urlsplit(self.path).path == '/api/v1/access_token':
+            self._send_json(
+                {'access_token': 'stub-token', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'},
+            )
+        else:
+            self._send_json({'message': 'Not Found', 'error': 404}, 404)
+
+    def do_GET(self) -> None:
+        self.server.record(self.path)
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') == '/api/v1/me':
+            self._send_json({'name': 'stub', 'id': 'stub'})
+            return
+        if url.path.rstrip('/') == '/api/info':
+            fullnames = parse_qs(url.query).get('id', [''])[0].split(',')
+            self._send_json(self.server.info(fullnames))
+            return
+        match = _COMMENTS_PATH.match(url.path)
+        if match is not None:
+            self._send_json(self.server.comments(match['subreddit'], int(match['index'])))
+            return
+        match = _LISTING_PATH.match(url.path)
+        if match is None:
+            self._send_json({'message': 'Not Found', 'error': 404}, 404)
+            return
+        subreddit = match['subreddit']
+        if subreddit.lower() in self.server.missing:
+            self._send_json({'reason': 'private', 'message': 'Forbidden', 'error': 403}, 403)
+            return
+        if match['sorting'] == 'about':
+            self._send_json({'kind': 't5', 'data': {'display_name': subreddit, 'subscribers': SUBSCRIBERS}})
+            return
+        self._send_json(self.server.listing(subreddit, parse_qs(url.query)), etag=True)
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description='Serve a stand-in for the Reddit API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--posts', type=int, default=1000, help='posts in every subreddit')
+    args = parser.parse_args()
+    server = StubRedditServer((args.host, args.port), posts_per_subreddit=args.posts)
+    print(f'Stub Reddit API listening on {server.url}', flush=True)  # noqa: T201
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
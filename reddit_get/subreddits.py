@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+)
+
+from .storage import (
+    file_lock,
+    load_json_object,
+    replace_json,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+AVAILABLE = 'available'
+# Why a subreddit can not be read, and how that is reported
+UNAVAILABLE = {
+    'missing': 'does not exist',
+    'banned': 'is banned',
+    'private': 'is private',
+    'quarantined': 'is quarantined',
+    # Reddit's API errors do not tell these apart
+    'restricted': 'does not exist or is private/restricted',
+}
+# How long, in seconds, what is known about a subreddit is trusted
+AVAILABLE_TTL = 7 * 24 * 60 * 60
+UNAVAILABLE_TTL = 24 * 60 * 60
+
+
+class SubredditInfo(NamedTuple):
+    """What is known about a subreddit."""
+
+    name: str
+    status: str
+    subscribers: int | None
+    checked_at: float
+
+    @property
+    def available(self) -> bool:
+        return self.status == AVAILABLE
+
+    def describe(self) -> str:
+        """Say why the subreddit can not be read.
+
+        >>> SubredditInfo('secret', 'private', None, 0).describe()
+        "Subreddit 'r/secret' is private"
+        """
+        return f"Subreddit 'r/{self.name}' {UNAVAILABLE.get(self.status, 'is available')}"
+
+
+def unavailable_status(error: BaseException | None) -> str | None:
+    """Get why a request for a subreddit failed with `error`, if it is because the subreddit can not be read.
+
+    Errors of both PRAW and Async PRAW are understood. Async PRAW does
+    not read the body of a failed response, so its errors can not tell
+    a quarantined subreddit from a private one, or a banned subreddit
+    from a missing one.
+
+    Returns:
+        One of the keys of `UNAVAILABLE`, or None if the error is not
+        about the subreddit
+
+    """
+    from praw.exceptions import RedditAPIException  # noqa: PLC0415
+    from prawcore import exceptions as prawcore_errors  # noqa: PLC0415
+
+    api_errors: tuple[type[BaseException], ...] = (RedditAPIException,)
+    modules = [prawcore_errors]
+    if type(error).__module__.startswith('asyncpraw'):
+        from asyncpraw.exceptions import RedditAPIException as AsyncRedditAPIException  # noqa: PLC0415
+        from asyncprawcore import exceptions as asyncprawcore_errors  # noqa: PLC0415
+
+        api_errors += (AsyncRedditAPIException,)
+        modules.append(asyncprawcore_errors)
+
+    def kind(name: str) -> tuple[type[BaseException], ...]:
+        return tuple(getattr(module, name) for module in modules)
+
+    if isinstance(error, api_errors):
+        items = getattr(error, 'items', ())
+        if any(item.error_type in {'SUBREDDIT_NOEXIST', 'SUBREDDIT_NOTALLOWED'} for item in items):
+            return 'restricted'
+        return None
+    if isinstance(error, kind('Redirect')):
+        # Reddit sends unknown subreddit names to its search
+        return 'missing' if str(getattr(error, 'path', '')).rstrip('/').endswith('/subreddits/search') else None
+    if isinstance(error, kind('NotFound')):
+        return 'banned' if _reason(error) == 'banned' else 'missing'
+    if isinstance(error, kind('Forbidden')):
+        return 'quarantined' if _reason(error) == 'quarantined' else 'private'
+    return None
+
+
+def _reason(error: BaseException) -> str | None:
+    """Get the reason Reddit gave in the body of the response that failed with `error`, if it was read."""
+    try:
+        body = error.response.json()  # type: ignore[attr-defined]
+    except (AttributeError, ValueError):
+        return None
+    if inspect.iscoroutine(body):
+        # An aiohttp response, whose body can only be read on the event loop it came from
+        body.close()
+        return None
+    return body.get('reason') if isinstance(body, dict) else None
+
+
+class SubredditCache:
+    """What is known about each subreddit, stored on disk so that runs can skip the ones that can not be read.
+
+    Subreddits that could be read are kept for `AVAILABLE_TTL`, their
+    display name and subscriber count being taken from the listings
+    that are fetched anyway. Subreddits that could not be read are
+    kept for `UNAVAILABLE_TTL`, after which they are tried again.
+
+    Args:
+        path: The JSON file the subreddits are kept in
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, Any]:
+        return load_json_object(self.path)
+
+    def get(self, name: str) -> SubredditInfo | None:
+        """Get what is known about the subreddit `name`, unless it is out of date."""
+        entry = self._load().get(name.lower())
+        if not isinstance(entry, dict):
+            return None
+        try:
+            info = SubredditInfo(
+                str(entry['name']),
+                str(entry['status']),
+                None if entry['subscribers'] is None else int(entry['subscribers']),
+                float(entry['checked_at']),
+            )
+        except (TypeError, KeyError, ValueError):
+            return None
+        ttl = AVAILABLE_TTL if info.available else UNAVAILABLE_TTL
+        return info if self.clock() - info.checked_at < ttl else None
+
+    def set(self, info: SubredditInfo) -> None:
+        # Concurrent runs update the file one at a time, so none loses the others' entries
+        with self._lock, file_lock(self.path):
+            entries = self._load()
+            entries[info.name.lower()] = info._asdict()
+            replace_json(self.path, entries)
+
+    def seen(self, name: str, post: object) -> None:
+        """Remember that `name` could be read, with what a post from its listing says about it.
+
+        Nothing is written while a fresh entry says the same, whatever
+        the case the subreddit was named in.
+        """
+        data = vars(post)
+        display_name = str(data.get('subreddit') or name)
+        known = self.get(name)
+        if known is not None and known.available and known.name.lower() == display_name.lower():
+            return
+        subscribers = data.get('subreddit_subscribers')
+        self.set(SubredditInfo(display_name, AVAILABLE, subscribers, self.clock()))
+
+    def unavailable(self, name: str, status: str) -> SubredditInfo:
+        """Remember that `name` could not be read because of `status`."""
+        info = SubredditInfo(name, status, None, self.clock())
+        self.set(info)
+        return info
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import functools
+import re
+from string import Formatter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+)
+
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CONVERTERS: dict[str, Callable[[Any], str]] = {'r': repr, 's': str, 'a': ascii}
+
+_FIELD_PATH = re.compile(r'\.([^.[]+)|\[([^\]]+)\]')
+
+
+class Field(NamedTuple):
+    """A replacement field with its lookups worked out ahead of time.
+
+    `path` holds the `.attribute` and `[index]` lookups that follow the
+    root name, as `(is_attribute, name)` pairs.
+    """
+
+    root: str
+    path: tuple[tuple[bool, str | int], ...]
+    conversion: str | None
+    format_spec: str
+
+
+def parse_field(field_name: str) -> tuple[str, tuple[tuple[bool, str | int], ...]]:
+    """Split a replacement field name into its root name and lookups.
+
+    >>> parse_field('author.name')
+    ('author', ((True, 'name'),))
+    >>> parse_field('preview[images][0]')
+    ('preview', ((False, 'images'), (False, 0)))
+    """
+    root, _, _ = field_name.partition('.')
+    root, _, _ = root.partition('[')
+    rest = field_name[len(root) :]
+    path: list[tuple[bool, str | int]] = []
+    position = 0
+    for match in _FIELD_PATH.finditer(rest):
+        if match.start() != position:
+            break
+        attribute, index = match.groups()
+        if attribute is not None:
+            path.append((True, attribute))
+        else:
+            path.append((False, int(index) if index.isdigit() else index))
+        position = match.end()
+    if position != len(rest):
+        raise fire_error(f'Invalid template field: {{{field_name}}}')
+    return root, tuple(path)
+
+
+class CompiledTemplate:
+    """An output template parsed once and rendered many times.
+
+    Rendering supports everything `str.format` does for named fields,
+    including nested lookups such as `{author.name}`, conversions such
+    as `{title!r}` and format specs such as `{score:>6}`. Format specs
+    may not contain replacement fields themselves.
+
+    >>> CompiledTemplate('{name!r} scored {score:>4}').render({'name': 'x', 'score': 7}, dict.__getitem__)
+    "'x' scored    7"
+
+    Args:
+        template: The template to compile
+
+    """
+
+    __slots__ = ('field_names', 'keys', 'nested', 'parts', 'template')
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        parts: list[tuple[str, Field | None]] = []
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError as e:
+            raise fire_error(f'Invalid template {template!r}: {e}') from e
+        for literal, field_name, format_spec, conversion in parsed:
+            if field_name is None:
+                parts.append((literal, None))
+                continue
+            if not field_name or field_name[0].isdigit():
+                raise fire_error(f'Template fields must be named, got {{{field_name}}}')
+            if format_spec and '{' in format_spec:
+                raise fire_error(f'Nested fields in format specs are not supported: {format_spec}')
+            if conversion is not None and conversion not in CONVERTERS:
+                raise fire_error(f'Unknown conversion !{conversion} in template field {field_name}')
+            root, path = parse_field(field_name)
+            parts.append((literal, Field(root, path, conversion, format_spec or '')))
+        self.parts = tuple(parts)
+        fields = [field for _, field in self.parts if field is not None]
+        self.keys = frozenset(field.root for field in fields)
+        # The root fields in the order they first appear in the template
+        self.field_names = tuple(dict.fromkeys(field.root for field in fields))
+        self.nested = any(field.path for field in fields)
+
+    def render(self, source: object, lookup: Callable[[Any, str], Any] = getattr) -> str:
+        """Render the template for one object.
+
+        Args:
+            source: The object the field values come from
+            lookup: How to get a root field from `source`, attribute
+            access by default. Use `dict.__getitem__` for mappings.
+
+        Raises:
+            AttributeError: If `source` has no such attribute
+            KeyError: If `source` has no such key
+
+        """
+        pieces = []
+        for literal, field in self.parts:
+            pieces.append(literal)
+            if field is None:
+                continue
+            value = lookup(source, field.root)
+            for is_attribute, name in field.path:
+                value = getattr(value, name) if is_attribute else value[name]  # type: ignore[arg-type]
+            if field.conversion:
+                value = CONVERTERS[field.conversion](value)
+            pieces.append(format(value, field.format_spec))
+        return ''.join(pieces)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template: str) -> CompiledTemplate:
+    """Get the compiled version of `template`, compiling it only once per process."""
+    return CompiledTemplate(template)
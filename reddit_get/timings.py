@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+import secrets
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+)
+
+from .errors import fire_error
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+TRACE_FORMATS = ('chrome', 'otlp')
+
+
+class Span(NamedTuple):
+    """One timed operation, times in seconds since the epoch."""
+
+    name: str
+    start: float
+    duration: float
+    thread: int
+    attributes: dict[str, Any]
+
+
+class Timings:
+    """Timing spans around the parts of a run that take time.
+
+    A disabled instance records nothing, so instrumented code can use
+    it unconditionally at next to no cost.
+
+    Args:
+        enabled: Whether to record spans
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(self, enabled: bool = True, clock: Any = time.time) -> None:
+        self.enabled = enabled
+        self.clock = clock
+        self.started_at = clock()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """Time the body of the `with` block.
+
+        Yields:
+            The span's attributes, which the block may add to
+
+        """
+        if not self.enabled:
+            yield attributes
+            return
+        start = self.clock()
+        try:
+            yield attributes
+        finally:
+            self.add(name, start, self.clock() - start, **attributes)
+
+    def add(self, name: str, start: float, duration: float, **attributes: Any) -> None:
+        if not self.enabled:
+            return
+        span = Span(name, start, duration, threading.get_ident(), attributes)
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> list[str]:
+        """Summarize the time spent in each kind of span, in the order they first happened."""
+        totals: dict[str, list[float]] = {}
+        sizes: dict[str, int] = {}
+        for span in self.spans:
+            totals.setdefault(span.name, []).append(span.duration)
+            if 'bytes' in span.attributes:
+                sizes[span.name] = sizes.get(span.name, 0) + span.attributes['bytes']
+        lines = [f'Timings (total {(self.clock() - self.started_at) * 1000:.1f} ms)']
+        width = max((len(name) for name in totals), default=0)
+        for name, durations in totals.items():
+            line = (
+                f'  {name:<{width}}  {len(durations):>4} x {sum(durations) * 1000:>9.1f} ms'
+                f'  (max {max(durations) * 1000:.1f} ms)'
+            )
+            if name in sizes:
+                line += f', {sizes[name] / 1024:.1f} KiB'
+            lines.append(line)
+        return lines
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Get the spans in the Trace Event Format read by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': span.name,
+                    'ph': 'X',
+                    'ts': span.start * 1_000_000,
+                    'dur': span.duration * 1_000_000,
+                    'pid': pid,
+                    'tid': span.thread,
+                    'args': span.attributes,
+                }
+                for span in self.spans
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Get the spans as an OpenTelemetry (OTLP/JSON) trace export request."""
+        trace_id = secrets.token_hex(16)
+        return {
+            'resourceSpans': [
+                {
+                    'resource': {'attributes': [_otlp_attribute('service.name', 'reddit-get')]},
+                    'scopeSpans': [
+                        {
+                            'scope': {'name': 'reddit_get'},
+                            'spans': [
+                                {
+                                    'traceId': trace_id,
+                                    'spanId': secrets.token_hex(8),
+                                    'name': span.name,
+                                    'kind': 1,
+                                    'startTimeUnixNano': str(int(span.start * 1e9)),
+                                    'endTimeUnixNano': str(int((span.start + span.duration) * 1e9)),
+                                    'attributes': [
+                                        _otlp_attribute(key, value) for key, value in span.attributes.items()
+                                    ],
+                                }
+                                for span in self.spans
+                            ],
+                        },
+                    ],
+                },
+            ],
+        }
+
+    def write(self, path: Path, trace_format: str = 'chrome') -> None:
+        """Write the spans to `path` as a `chrome` or `otlp` JSON trace."""
+        trace = self.to_otlp() if trace_format == 'otlp' else self.to_chrome_trace()
+        try:
+            path.write_text(json.dumps(trace))
+        except OSError as e:
+            raise fire_error(f'Could not write the trace to {path}: {e}') from e
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
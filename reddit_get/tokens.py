@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+from .storage import (
+    file_lock,
+    load_json_object,
+    replace_json,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterator,
+    )
+    from pathlib import Path
+
+TOKEN_PATH = '/api/v1/access_token'
+# Tokens are refreshed once they have less than this many seconds left
+REFRESH_MARGIN = 300
+
+
+def get_token_cache_path(config_path: Path) -> Path:
+    """Get the token cache that belongs to a config file, e.g. ~/.redditgetrc.tokens.json."""
+    return config_path.with_name(f'{config_path.name}.tokens.json')
+
+
+class TokenCache:
+    """Access tokens shared by every reddit-get process, stored next to the config file.
+
+    Reddit's access tokens are valid for an hour, and application-only
+    ones are not tied to anything but the client credentials. Storing
+    them saves each process the token request, which counts towards the
+    same rate limit as everything else.
+
+    Tokens are stored under a hash of the request that got them, so
+    different credentials never share a token and no credential is
+    written to disk. The file is only readable by its owner.
+
+    Args:
+        path: The JSON file the tokens are kept in
+        clock: Function returning the current time, in seconds
+
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, data: Any, auth: Any) -> str:
+        raw = json.dumps([url, data, auth], default=str, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cache exclusively, so concurrent processes request one token between them."""
+        with self._lock, file_lock(self.path):
+            yield
+
+    def _load(self) -> dict[str, Any]:
+        return load_json_object(self.path)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get the token response for `key`, with `expires_in` counting down, if it is not about to expire."""
+        entry = self._load().get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get('token'), dict):
+            return None
+        try:
+            expires_in = int(float(entry['expires_at']) - self.clock())
+        except (TypeError, KeyError, ValueError):
+            return None
+        token = dict(entry['token'])
+        if expires_in <= REFRESH_MARGIN:
+            return None
+        token['expires_in'] = expires_in
+        return token
+
+    def set(self, key: str, token: dict[str, Any], requested_at: float) -> None:
+        """Store a token response that was requested at `requested_at`."""
+        try:
+            expires_at = requested_at + float(token['expires_in'])
+        except (KeyError, TypeError, ValueError):
+            return
+        now = self.clock()
+        tokens = {
+            other: entry
+            for other, entry in self._load().items()
+            if isinstance(entry, dict) and float(entry.get('expires_at', 0)) > now
+        }
+        tokens[key] = {'token': token, 'expires_at': expires_at}
+        self._save(tokens)
+
+    def invalidate(self, key: str) -> None:
+        tokens = self._load()
+        if tokens.pop(key, None) is not None:
+            self._save(tokens)
+
+    def _save(self, tokens: dict[str, Any]) -> None:
+        replace_json(self.path, tokens)
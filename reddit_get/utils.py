@@ -3,12 +3,14 @@ from __future__ import annotations
 import functools
 import os
 from pathlib import Path
-from string import Formatter
+import re
 from typing import TYPE_CHECKING
 
-import fire
-import toml
-
+from .errors import fire_error
+from .templates import (
+    CompiledTemplate,
+    compile_template,
+)
 from .types import (
     CallMap,
     PrawQuery,
@@ -17,7 +19,10 @@ from .types import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import (
+        Iterable,
+        Iterator,
+    )
 
     from praw.models import (
         Submission,
@@ -58,17 +63,19 @@ def load_configs(config: str) -> tuple[Path, dict[str, dict[str, str]]]:
         return config_path, {'reddit-get': env_credentials}
 
     # Fall back to config file
+    import toml  # noqa: PLC0415
+
     try:
         configs = toml.load(config_path)
         # Ensure required keys are present
         required_keys = {'client_id', 'client_secret', 'user_agent'}
         if 'reddit-get' not in configs:
             msg = f'Config file {config_path} missing [reddit-get] section'
-            raise fire.core.FireError(msg)
+            raise fire_error(msg)
         if not required_keys.issubset(configs['reddit-get'].keys()):
             missing = required_keys - set(configs['reddit-get'].keys())
             msg = f'Config file {config_path} missing required keys: {", ".join(missing)}'
-            raise fire.core.FireError(msg)
+            raise fire_error(msg)
         return config_path, configs
     except FileNotFoundError as e:
         msg = (
@@ -76,10 +83,10 @@ def load_configs(config: str) -> tuple[Path, dict[str, dict[str, str]]]:
             f'Either create a config file or set REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, and '
             f'REDDIT_USER_AGENT environment variables.'
         )
-        raise fire.core.FireError(msg) from e
+        raise fire_error(msg) from e
     except toml.TomlDecodeError as e:
         msg = f'Invalid TOML syntax in config file {config_path}'
-        raise fire.core.FireError(msg) from e
+        raise fire_error(msg) from e
 
 
 def get_reddit_query_function(
@@ -97,7 +104,7 @@ def get_reddit_query_function(
     try:
         return call_map[post_sorting]
     except KeyError:
-        raise fire.core.FireError(f'Invalid sorting option: {post_sorting}')
+        raise fire_error(f'Invalid sorting option: {post_sorting}')
 
 
 def get_response(header: str, posts: list[str]) -> list[str]:
@@ -105,11 +112,79 @@ def get_response(header: str, posts: list[str]) -> list[str]:
     return response_header + posts
 
 
+def parse_subreddits(subreddits: str | Iterable[str], manifest: str | None = None) -> list[str]:
+    """Normalize the subreddits given on the command line and in a manifest file.
+
+    Fire hands a comma separated argument over either as a string or as
+    a tuple depending on how it was quoted, so both are accepted. Any
+    leading 'r/' is stripped and duplicates are dropped, keeping the
+    first occurrence so the output order matches the input order.
+
+    >>> parse_subreddits('r/news, worldnews,news')
+    ['news', 'worldnews']
+    """
+    raw = subreddits.split(',') if isinstance(subreddits, str) else [str(name) for name in subreddits]
+    if manifest:
+        manifest_path = Path(manifest).expanduser()
+        try:
+            lines = manifest_path.read_text().splitlines()
+        except OSError as e:
+            raise fire_error(f'Unable to read subreddit manifest {manifest_path}') from e
+        raw.extend(line for line in lines if not line.lstrip().startswith('#'))
+
+    names: dict[str, None] = {}
+    for name in raw:
+        name = name.strip().removeprefix('/').removeprefix('r/')
+        if name:
+            names.setdefault(name, None)
+    return list(names)
+
+
+_SUBMISSION_ID = re.compile(r'^(?:t3_)?([0-9a-z]+)$')
+_PERMALINK = re.compile(r'/comments/([0-9a-z]+)(?:/|$)')
+
+
+def parse_submission_ids(ids: str | Iterable[str], id_file: str | None = None) -> list[str]:
+    """Normalize submission ids given on the command line and in a file to fullnames.
+
+    Ids may be given bare, as fullnames or as links to the submission.
+    The file has one id per line, blank lines and lines starting with
+    '#' are ignored. Duplicates are dropped, keeping the first one.
+
+    >>> parse_submission_ids('1abcde, t3_1abcde,https://www.reddit.com/r/news/comments/2fghij/a_title/')
+    ['t3_1abcde', 't3_2fghij']
+
+    Raises:
+        fire.core.FireError: If an id is not valid or the file can not be read
+
+    """
+    # Fire turns an id made of digits only into a number
+    raw = [str(submission_id) for submission_id in ids] if isinstance(ids, list | tuple) else str(ids).split(',')
+    if id_file:
+        id_path = Path(id_file).expanduser()
+        try:
+            lines = id_path.read_text().splitlines()
+        except OSError as e:
+            raise fire_error(f'Unable to read submission ids from {id_path}') from e
+        raw.extend(line for line in lines if not line.lstrip().startswith('#'))
+
+    fullnames: dict[str, None] = {}
+    for submission_id in raw:
+        submission_id = submission_id.strip()
+        if not submission_id:
+            continue
+        match = _PERMALINK.search(submission_id) or _SUBMISSION_ID.match(submission_id.lower())
+        if match is None:
+            raise fire_error(f'{submission_id} is not a valid submission id')
+        fullnames.setdefault(f't3_{match[1]}', None)
+    return list(fullnames)
+
+
 def get_time_filter_option(time_filter):
     try:
         time_filter = TimeFilterOption(time_filter)
     except ValueError:
-        raise fire.core.FireError(f'{time_filter} is not a valid time filter option')
+        raise fire_error(f'{time_filter} is not a valid time filter option')
     return time_filter
 
 
@@ -117,23 +192,39 @@ def get_post_sorting_option(post_sorting: str) -> SortingOption:
     try:
         return SortingOption(post_sorting)
     except ValueError:
-        raise fire.core.FireError(f'{post_sorting} is not a valid sorting option.')
+        raise fire_error(f'{post_sorting} is not a valid sorting option.')
 
 
 def get_template_keys(template: str) -> set[str] | None:
-    template_vars = {tup[1] for tup in Formatter().parse(template) if tup[1] and isinstance(tup[1], str)}
-    return template_vars or None
+    """Get the names of the fields used in `template`.
 
+    Only the root name of nested fields is returned.
 
-def create_post_output(template: str, posts: Iterator[Submission]) -> list[str]:
-    template_vars = get_template_keys(template)
-    if not template_vars:
-        raise fire.core.FireError('Your post output template did not have any items to be printed')
-    results = []
+    >>> sorted(get_template_keys('{title} by {author.name}'))
+    ['author', 'title']
+    """
+    return set(compile_template(template).keys) or None
+
+
+def iter_post_output(template: str, posts: Iterable[Submission]) -> Iterator[str]:
+    """Lazily format each post with `template`.
+
+    The template is checked right away while the posts are only
+    consumed, one at a time, as the returned iterator is advanced.
+    """
+    renderer = compile_template(template)
+    if not renderer.keys:
+        raise fire_error('Your post output template did not have any items to be printed')
+    return _format_posts(renderer, posts)
+
+
+def _format_posts(renderer: CompiledTemplate, posts: Iterable[Submission]) -> Iterator[str]:
     for post in posts:
         try:
-            format_params = {key: getattr(post, key) for key in template_vars}
-            results.append(template.format(**format_params))
-        except AttributeError as e:
-            raise fire.core.FireError(e)
-    return results
+            yield renderer.render(post)
+        except (AttributeError, LookupError, TypeError, ValueError) as e:
+            raise fire_error(e)
+
+
+def create_post_output(template: str, posts: Iterator[Submission]) -> list[str]:
+    return list(iter_post_output(template, posts))
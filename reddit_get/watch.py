@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        Callable,
+        Iterable,
+    )
+
+    from .types import SortingOption
+
+DEFAULT_MIN_INTERVAL = 30.0
+DEFAULT_MAX_INTERVAL = 15 * 60.0
+# Polls per minute across every watched listing, well below Reddit's 100 requests per minute
+DEFAULT_BUDGET = 60.0
+# Weight of the latest poll in the estimated rate of new posts
+SMOOTHING = 0.3
+# Quiet listings are polled this much less often after each poll without new posts
+BACKOFF = 2.0
+
+
+class WatchedListing:
+    """A listing polled by `reddit-get watch`, and how often it gets new posts.
+
+    The rate of new posts is an exponential moving average over the
+    polls. The listing is polled often enough to expect `target` new
+    posts per poll, but never more often than `min_interval` or less
+    often than `max_interval` seconds. A poll that finds nothing new
+    stretches the interval by `BACKOFF`, one that fills the whole
+    listing may have missed posts and brings the next poll forward.
+
+    Args:
+        subreddit: The subreddit
+        sorting: How its posts are sorted
+        limit: The most posts one poll gets
+        min_interval: The shortest time between two polls, in seconds
+        max_interval: The longest time between two polls, in seconds
+
+    """
+
+    def __init__(
+        self,
+        subreddit: str,
+        sorting: SortingOption,
+        limit: int,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+    ) -> None:
+        self.subreddit = subreddit
+        self.sorting = sorting
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.rate: float | None = None
+        self.polled_at: float | None = None
+        self.next_poll_at = 0.0
+
+    @property
+    def target(self) -> float:
+        """The number of new posts a poll should find, half the listing leaves room for bursts."""
+        return max(self.limit / 2, 1)
+
+    def polled(self, new_posts: int, now: float) -> None:
+        """Adapt the interval to a poll at `now` that found `new_posts` posts."""
+        if self.polled_at is not None and now > self.polled_at:
+            rate = new_posts / (now - self.polled_at)
+            self.rate = rate if self.rate is None else SMOOTHING * rate + (1 - SMOOTHING) * self.rate
+        self.polled_at = now
+        if new_posts >= self.limit:
+            interval = self.min_interval
+        elif new_posts == 0:
+            interval = self.interval * BACKOFF
+        elif self.rate:
+            interval = self.target / self.rate
+        else:
+            interval = self.interval
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+        self.next_poll_at = now + self.interval
+
+
+class Watcher:
+    """Poll listings when they are due, within a budget of polls per minute.
+
+    Polls are spread out at least `60 / budget` seconds apart. When
+    more listings are due than the budget allows, the ones that have
+    been due the longest go first and the rest wait their turn.
+
+    Args:
+        listings: The listings to watch
+        budget: The most polls per minute
+        clock: Function returning the current time, in seconds
+        sleep: Function waiting for a number of seconds
+
+    """
+
+    def __init__(
+        self,
+        listings: Iterable[WatchedListing],
+        budget: float = DEFAULT_BUDGET,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.listings = list(listings)
+        self.spacing = 60 / budget
+        self.clock = clock
+        self.sleep = sleep
+        self._next_slot = 0.0
+
+    def run(self, poll: Callable[[WatchedListing], int], max_polls: int | None = None) -> int:
+        """Call `poll` for each listing that is due, until `max_polls` polls were made or forever.
+
+        Args:
+            poll: Polls a listing and returns how many new posts it found
+            max_polls: Stop after this many polls
+
+        Returns:
+            The number of polls made
+
+        """
+        # The index breaks ties, listings are never compared with each other
+        queue = [(listing.next_poll_at, index) for index, listing in enumerate(self.listings)]
+        heapq.heapify(queue)
+        polls = 0
+        while queue and (max_polls is None or polls < max_polls):
+            due_at, index = heapq.heappop(queue)
+            wait = max(due_at, self._next_slot) - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+            listing = self.listings[index]
+            started_at = self.clock()
+            self._next_slot = started_at + self.spacing
+            new_posts = poll(listing)
+            listing.polled(new_posts, started_at)
+            polls += 1
+            heapq.heappush(queue, (listing.next_poll_at, index))
+        return polls
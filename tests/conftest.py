@@ -66,3 +66,99 @@ class MockReddit:
 @pytest.fixture(scope='session', autouse=True)
 def mock_reddit(monkeysession):
     monkeysession.setattr(praw, 'Reddit', MockReddit)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    cache_home = tmp_path / 'cache'
+    monkeypatch.setenv('XDG_CACHE_HOME', str(cache_home))
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path / 'data'))
+    return cache_home / 'reddit-get'
+
+
+class MockAsyncListing:
+    def __init__(self, posts):
+        self.posts = iter(posts)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.posts)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class MockAsyncSubreddit:
+    def __init__(self, display_name: str):
+        self.subreddit = MockSubreddit(display_name)
+
+    def __getattr__(self, name):
+        query = getattr(self.subreddit, name)
+        return lambda *args, **kwargs: MockAsyncListing(query(*args, **kwargs))
+
+
+# noinspection PyMethodMayBeStatic
+class MockAsyncSubredditHelper:
+    async def __call__(self, display_name: str, *args, **kwargs):
+        return MockAsyncSubreddit(display_name)
+
+
+# noinspection PyUnusedLocal
+class MockAsyncReddit:
+    def __init__(self, *args, **kwargs):
+        self.subreddit = MockAsyncSubredditHelper()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(scope='session', autouse=True)
+def mock_async_reddit(monkeysession):
+    try:
+        import asyncpraw
+    except ImportError:  # pragma: no cover
+        return
+    monkeysession.setattr(asyncpraw, 'Reddit', MockAsyncReddit)
+
+
+@pytest.fixture(params=['sync', 'async'])
+def backend(request):
+    if request.param == 'async':
+        pytest.importorskip('asyncpraw')
+    return request.param
+
+
+@pytest.fixture
+def stub_reddit(tmp_path, monkeypatch):
+    """A stub Reddit API server and a config file that points real PRAW at it."""
+    import threading
+
+    import praw.reddit
+
+    from reddit_get.stub import StubRedditServer
+
+    monkeypatch.setattr(praw, 'Reddit', praw.reddit.Reddit)
+    server = StubRedditServer(posts_per_subreddit=250, missing=['private'], mirrors={'awwmirror': 'aww'})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    config = tmp_path / 'stubconfig'
+    config.write_text(
+        '[reddit-get]\n'
+        'client_id = "stubid"\n'
+        'client_secret = "stubsecret"\n'
+        'user_agent = "reddit-get tests"\n'
+        f'oauth_url = "{server.url}"\n'
+        f'reddit_url = "{server.url}"\n',
+    )
+    server.config_path = str(config)
+    yield server
+    server.shutdown()
+    server.server_close()
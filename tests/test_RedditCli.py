@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from pathlib import Path
+import time
 from unittest.mock import Mock, patch
 
 import fire
+import praw
 from praw.exceptions import RedditAPIException, RedditErrorItem
 import pytest
 
@@ -54,73 +58,73 @@ class TestRedditCli:
 
     class TestPost:
         class TestBasicPostOutput:
-            def it_gets_three_controversial_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_three_controversial_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='controversial', limit=3)
                 expected = ['#### The Most Controversial Posts for All Time from r/testsubreddit'] + [
                     '- controversial',
                 ] * 3
                 assert result == expected
 
-            def it_gets_three_gilded_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_three_gilded_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='gilded', limit=3)
                 expected = ['#### The Most Awarded Posts for All Time from r/testsubreddit'] + [
                     '- gilded',
                 ] * 3
                 assert result == expected
 
-            def it_gets_hot_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_hot_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='hot', limit=3)
                 expected = ['#### The Hottest Posts for All Time from r/testsubreddit'] + ['- hot'] * 3
                 assert result == expected
 
-            def it_gets_new_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_new_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='new', limit=3)
                 expected = ['#### The Newest Posts for All Time from r/testsubreddit'] + ['- new'] * 3
                 assert result == expected
 
-            def it_gets_random_rising_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_random_rising_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='random_rising', limit=3)
                 expected = ['#### The Randomly Selected Rising Posts for All Time from r/testsubreddit'] + [
                     '- random_rising',
                 ] * 3
                 assert result == expected
 
-            def it_gets_rising_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_rising_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='rising', limit=3)
                 expected = ['#### The Rising Posts for All Time from r/testsubreddit'] + ['- rising'] * 3
                 assert result == expected
 
-            def it_gets_top_posts(self, mock_reddit):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_gets_top_posts(self, mock_reddit, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(subreddit='testsubreddit', post_sorting='top', limit=3)
                 expected = ['#### The Top Posts for All Time from r/testsubreddit'] + ['- top'] * 3
                 assert result == expected
 
         class TestCustomHeaderOutput:
-            def it_returns_custom_header_with_no_options(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_custom_header_with_no_options(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit', post_sorting='top', limit=3, custom_header='Test Header',
                 )
                 expected = ['Test Header'] + ['- top'] * 3
                 assert result == expected
 
-            def it_returns_custom_header_with_one_options(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_custom_header_with_one_options(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit', post_sorting='top', limit=3, custom_header='Test {sorting}',
                 )
                 expected = ['Test Top'] + ['- top'] * 3
                 assert result == expected
 
-            def it_returns_custom_header_with_two_options(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_custom_header_with_two_options(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit',
                     post_sorting='top',
@@ -130,8 +134,8 @@ class TestRedditCli:
                 expected = ['Test Top and All Time'] + ['- top'] * 3
                 assert result == expected
 
-            def it_returns_custom_header_with_all_options(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_custom_header_with_all_options(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit',
                     post_sorting='top',
@@ -142,24 +146,24 @@ class TestRedditCli:
                 assert result == expected
 
             class TestHeaderError:
-                def it_returns_an_error_for_invalid_header_keywords(self):
+                def it_returns_an_error_for_invalid_header_keywords(self, backend):
                     with pytest.raises(fire.core.FireError):
-                        cli = RedditCli('tests/.exampleconfig')
+                        cli = RedditCli('tests/.exampleconfig', backend=backend)
                         result = cli.post(
                             subreddit='testsubreddit', post_sorting='top', limit=3, custom_header='{invalid}',
                         )
 
         class TestCustomPostOutput:
-            def it_returns_post_output_with_a_single_keyword(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_post_output_with_a_single_keyword(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit', post_sorting='top', limit=3, output_format='test {title}',
                 )
                 expected = ['#### The Top Posts for All Time from r/testsubreddit'] + ['test top'] * 3
                 assert result == expected
 
-            def it_returns_post_output_with_multiple_keywords(self):
-                cli = RedditCli('tests/.exampleconfig')
+            def it_returns_post_output_with_multiple_keywords(self, backend):
+                cli = RedditCli('tests/.exampleconfig', backend=backend)
                 result = cli.post(
                     subreddit='testsubreddit',
                     post_sorting='top',
@@ -172,9 +176,9 @@ class TestRedditCli:
                 assert result == expected
 
             class TestCustomPostOutputErrors:
-                def it_raises_fire_error_for_invalid_template_key(self):
+                def it_raises_fire_error_for_invalid_template_key(self, backend):
                     with pytest.raises(fire.core.FireError):
-                        cli = RedditCli('tests/.exampleconfig')
+                        cli = RedditCli('tests/.exampleconfig', backend=backend)
                         result = cli.post(
                             subreddit='testsubreddit',
                             post_sorting='top',
@@ -182,9 +186,9 @@ class TestRedditCli:
                             output_format='{invalid}',
                         )
 
-                def it_raises_fire_error_for_template_with_no_keys(self):
+                def it_raises_fire_error_for_template_with_no_keys(self, backend):
                     with pytest.raises(fire.core.FireError):
-                        cli = RedditCli('tests/.exampleconfig')
+                        cli = RedditCli('tests/.exampleconfig', backend=backend)
                         result = cli.post(
                             subreddit='testsubreddit',
                             post_sorting='top',
@@ -346,3 +350,240 @@ class TestRedditAPIErrorHandling:
             # Should be caught and re-raised by post, then handled by _execute_with_retry
             with pytest.raises(fire.core.FireError, match='Reddit API error: INVALID_OPTION'):
                 cli.post(subreddit='testsubreddit', limit=3)
+
+
+class TestBatch:
+    """Tests for fetching several subreddits in one run."""
+
+    def it_returns_each_subreddit_in_input_order(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+
+        def make_subreddit(name):
+            def top(*args, **kwargs):
+                # Finish the first subreddits last to prove output order is input order
+                time.sleep(0.01 * (3 - int(name[-1])))
+                return [Mock(title=f'{name} post')] * kwargs['limit']
+
+            return Mock(top=top)
+
+        with patch.object(cli.reddit, 'subreddit', side_effect=make_subreddit):
+            result = cli.batch(subreddits='sub1,sub2,sub3', limit=2, custom_header='{subreddit}')
+
+        assert result == [
+            'r/sub1', '- sub1 post', '- sub1 post',
+            'r/sub2', '- sub2 post', '- sub2 post',
+            'r/sub3', '- sub3 post', '- sub3 post',
+        ]
+
+    def it_accepts_a_tuple_of_subreddits(self, mock_reddit, backend):
+        cli = RedditCli('tests/.exampleconfig', backend=backend)
+        result = cli.batch(subreddits=('one', 'two'), limit=1, header=False)
+        assert result == ['- top', '- top']
+
+    def it_reads_subreddits_from_a_manifest(self, mock_reddit, tmp_path, backend):
+        manifest = tmp_path / 'subreddits.txt'
+        manifest.write_text('# comment\none\n\nr/two\n')
+        cli = RedditCli('tests/.exampleconfig', backend=backend)
+        result = cli.batch(manifest=str(manifest), limit=1, custom_header='{subreddit}')
+        assert result == ['r/one', '- top', 'r/two', '- top']
+
+    def it_uses_a_single_reddit_session(self, mock_reddit):
+        with patch('praw.Reddit', wraps=praw.Reddit) as reddit_class:
+            cli = RedditCli('tests/.exampleconfig')
+            cli.batch(subreddits='one,two,three', limit=1)
+        reddit_class.assert_called_once()
+
+    def it_rejects_an_empty_batch(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError, match='at least one subreddit'):
+            cli.batch(subreddits='')
+
+    def it_rejects_invalid_concurrency(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError, match='Concurrency'):
+            cli.batch(subreddits='one', concurrency=0)
+
+
+class TestInfo:
+    """Tests for refreshing submissions by id."""
+
+    def it_renders_submissions_in_the_order_of_the_ids(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        assert cli.info('news7,t3_aww3,aww999', output_format='{title}: {score}') == [
+            'Post 7 in r/news: 993',
+            'Post 3 in r/aww: 997',
+        ]
+        assert 'No submissions found for t3_aww999' in capsys.readouterr().err
+
+    def it_requests_100_ids_at_a_time(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        result = cli.info([f'aww{index}' for index in range(250)], concurrency=3)
+        assert result == [f'- Post {index} in r/aww' for index in range(250)]
+        batches = [path for path in stub_reddit.requests if path.startswith('/api/info')]
+        assert sorted(path.count('t3_') for path in batches) == [50, 100, 100]
+
+    def it_exports_the_chosen_fields(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        assert cli.info('aww1', output='ndjson', fields='id,score,num_comments') is None
+        assert json.loads(capsys.readouterr().out) == {'id': 'aww1', 'score': 999, 'num_comments': 1}
+
+    def it_needs_an_id(self):
+        with pytest.raises(fire.core.FireError, match='at least one submission id'):
+            RedditCli('tests/.exampleconfig').info('')
+
+
+class TestLargeLimits:
+    """Tests for limits above a single page and streamed output."""
+
+    def it_allows_limits_above_25(self, mock_reddit, backend):
+        cli = RedditCli('tests/.exampleconfig', backend=backend)
+        result = cli.post(subreddit='testsubreddit', limit=250, header=False)
+        assert len(result) == 250
+
+    def it_rejects_limits_above_1000(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError, match='between 1 and 1000'):
+            cli.post(subreddit='testsubreddit', limit=1001)
+
+    def it_prints_each_post_as_it_is_fetched(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig', no_cache=True)
+        printed_before_next_post = []
+
+        def listing(*args, **kwargs):
+            for number in range(kwargs['limit']):
+                printed_before_next_post.append(capsys.readouterr().out)
+                yield Mock(title=f'post {number}')
+
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            subreddit.return_value.top = listing
+            result = cli.post(subreddit='testsubreddit', limit=3, stream=True, custom_header='{subreddit}')
+
+        assert result is None
+        assert printed_before_next_post == ['r/testsubreddit\n', '- post 0\n', '- post 1\n']
+        assert capsys.readouterr().out == '- post 2\n'
+
+    def it_streams_posts_with_either_backend(self, mock_reddit, backend, capsys):
+        cli = RedditCli('tests/.exampleconfig', backend=backend, no_cache=True)
+        cli.post(subreddit='testsubreddit', post_sorting='new', limit=2, stream=True, header=False)
+        assert capsys.readouterr().out == '- new\n- new\n'
+
+    def it_streams_from_the_cache(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post(subreddit='testsubreddit', limit=2)
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            cli.post(subreddit='testsubreddit', limit=2, stream=True, header=False)
+        subreddit.assert_not_called()
+        assert capsys.readouterr().out == '- top\n- top\n'
+
+    def it_retries_a_rate_limited_page_while_streaming(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig', no_cache=True)
+        rate_limit_item = RedditErrorItem(error_type='RATELIMIT', message='Slow down', field='')
+        pages = iter([[Mock(title='first')], RedditAPIException([rate_limit_item]), [Mock(title='second')]])
+
+        class Listing:
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                if not getattr(self, 'page', None):
+                    page = next(pages)
+                    if isinstance(page, Exception):
+                        raise page
+                    self.page = page
+                return self.page.pop(0)
+
+        with patch.object(cli.reddit, 'subreddit') as subreddit, patch('time.sleep'):
+            subreddit.return_value.top.return_value = Listing()
+            cli.post(subreddit='testsubreddit', limit=2, stream=True, header=False)
+
+        assert capsys.readouterr().out == '- first\n- second\n'
+
+    def it_reports_template_errors_before_printing(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError):
+            cli.post(subreddit='testsubreddit', stream=True, output_format='no fields')
+        assert capsys.readouterr().out == ''
+
+
+class TestAsyncBackend:
+    """Tests specific to the asyncpraw backend."""
+
+    @pytest.fixture(autouse=True)
+    def asyncpraw(self):
+        return pytest.importorskip('asyncpraw')
+
+    def it_rejects_unknown_backends(self, mock_reddit):
+        with pytest.raises(fire.core.FireError, match='not a valid backend'):
+            RedditCli('tests/.exampleconfig', backend='threads')
+
+    def it_explains_how_to_install_asyncpraw(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig', backend='async')
+        with patch.dict('sys.modules', {'asyncpraw': None}):
+            with pytest.raises(fire.core.FireError, match=r'reddit-get\[async\]'):
+                cli.post(subreddit='testsubreddit', limit=1)
+
+    def it_keeps_listings_in_flight_together(self, mock_reddit, asyncpraw):
+        in_flight = []
+        most_in_flight = []
+
+        class Listing:
+            def __init__(self, name):
+                self.name = name
+                self.done = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                if self.done:
+                    in_flight.remove(self.name)
+                    raise StopAsyncIteration
+                in_flight.append(self.name)
+                most_in_flight.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                self.done = True
+                return Mock(title=self.name)
+
+        class Subreddits:
+            async def __call__(self, name):
+                return Mock(top=lambda **kwargs: Listing(name))
+
+        reddit = asyncpraw.Reddit()
+        reddit.subreddit = Subreddits()
+        cli = RedditCli('tests/.exampleconfig', backend='async')
+        with patch.object(asyncpraw, 'Reddit', return_value=reddit):
+            result = cli.batch(subreddits='a,b,c,d,e', limit=1, header=False, concurrency=3)
+
+        assert result == ['- a', '- b', '- c', '- d', '- e']
+        assert max(most_in_flight) == 3
+
+    def it_retries_rate_limited_requests(self, mock_reddit, asyncpraw):
+        from asyncpraw.exceptions import RedditAPIException as AsyncRedditAPIException
+        from asyncpraw.exceptions import RedditErrorItem as AsyncRedditErrorItem
+
+        attempts = []
+
+        class Listing:
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise AsyncRedditAPIException([AsyncRedditErrorItem('RATELIMIT', message='Slow down')])
+                if len(attempts) == 2:
+                    return Mock(title='after retry')
+                raise StopAsyncIteration
+
+        class Subreddits:
+            async def __call__(self, name):
+                return Mock(top=lambda **kwargs: Listing())
+
+        reddit = asyncpraw.Reddit()
+        reddit.subreddit = Subreddits()
+        cli = RedditCli('tests/.exampleconfig', backend='async', no_cache=True)
+        with patch.object(asyncpraw, 'Reddit', return_value=reddit), patch('asyncio.sleep') as sleep:
+            result = cli.post(subreddit='testsubreddit', limit=1, header=False)
+
+        assert result == ['- after retry']
+        sleep.assert_called_once_with(1)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from types import SimpleNamespace
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.archive import (
+    SCHEMA,
+    UPSERT,
+    Archive,
+    archive_row,
+    get_archive_path,
+)
+from reddit_get.types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+NOW = 1_700_000_000.0
+DAY = 24 * 60 * 60
+
+
+def make_post(post_id, score, age, **fields):
+    fields = {'title': f'Post {post_id}', **fields}
+    return SimpleNamespace(id=post_id, score=score, created_utc=NOW - age, **fields)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = Archive(tmp_path / 'archive.sqlite3', clock=lambda: NOW)
+    yield archive
+    archive.close()
+
+
+class TestArchiveRow:
+    def it_keeps_scalars_and_the_names_of_objects(self):
+        class Redditor:
+            def __str__(self):
+                return 'someone'
+
+        post = make_post('a', 5, 0, _reddit=object(), author=Redditor(), subreddit='Python', preview={})
+        row = archive_row(post, 'python', NOW)
+        assert row['subreddit'] == 'python'
+        assert json.loads(row['data']) == {
+            'id': 'a', 'score': 5, 'created_utc': NOW, 'title': 'Post a', 'author': 'someone', 'subreddit': 'Python',
+        }
+
+    def it_falls_back_to_the_queried_subreddit(self):
+        assert archive_row(make_post('a', 5, 0), 'Python', NOW)['subreddit'] == 'python'
+
+    def it_skips_posts_without_an_id(self):
+        assert archive_row(SimpleNamespace(title='x'), 'python', NOW) is None
+
+
+class TestArchive:
+    def it_uses_wal_mode(self, archive):
+        assert archive.connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+
+    def it_upserts_by_id(self, archive):
+        list(archive.archive('python', [make_post('a', 1, 0), make_post('b', 2, 0)]))
+        list(archive.archive('python', [make_post('a', 10, 0)]))
+        posts = archive.query('python', SortingOption.TOP, TimeFilterOption.ALL, 10)
+        assert [(post.id, post.score) for post in posts] == [('a', 10), ('b', 2)]
+
+    def it_answers_top_and_new_within_the_time_filter(self, archive):
+        posts = [make_post('old', 100, 30 * DAY), make_post('low', 1, 0), make_post('high', 50, 2 * DAY)]
+        list(archive.archive('python', posts))
+        top_week = archive.query('Python', SortingOption.TOP, TimeFilterOption.WEEK, 10)
+        assert [post.id for post in top_week] == ['high', 'low']
+        new_all = archive.query('python', SortingOption.NEW, TimeFilterOption.ALL, 2)
+        assert [post.id for post in new_all] == ['low', 'high']
+
+    def it_writes_in_batches(self, archive, monkeypatch):
+        from reddit_get import archive as archive_module
+
+        monkeypatch.setattr(archive_module, 'BATCH_SIZE', 2)
+        posts = archive.archive('python', (make_post(str(index), index, 0) for index in range(3)))
+        next(posts)
+        assert archive.connection.execute('SELECT count(*) FROM submissions').fetchone() == (0,)
+        next(posts)
+        assert archive.connection.execute('SELECT count(*) FROM submissions').fetchone() == (2,)
+        next(posts)
+        # The rest is written when iterating stops
+        posts.close()
+        assert archive.connection.execute('SELECT count(*) FROM submissions').fetchone() == (3,)
+
+    def it_upserts_rows_in_bulk(self, archive):
+        rows = [archive_row(make_post(str(index), index, 0), 'python', NOW) for index in range(1200)]
+        assert archive.upsert(rows) == 1200
+
+    def it_indexes_subreddit_time_and_score(self, archive):
+        indexes = {row[1] for row in archive.connection.execute("PRAGMA index_list('submissions')")}
+        assert {'submissions_subreddit_created', 'submissions_subreddit_score'} <= indexes
+
+    def it_only_sorts_by_top_and_new(self, archive):
+        with pytest.raises(fire.core.FireError, match='top or new'):
+            archive.query('python', SortingOption.HOT, TimeFilterOption.ALL, 10)
+
+
+class TestSearch:
+    def it_ranks_title_matches_above_selftext_matches(self, archive):
+        posts = [
+            make_post('body', 1, 0, title='Weekly thread', selftext='Anyone tried async Rust yet?'),
+            make_post('title', 1, 0, title='Async Rust is finally stable', selftext=''),
+            make_post('other', 1, 0, title='Python 3.14 released', selftext='No rust here, just async'),
+        ]
+        list(archive.archive('programming', posts))
+        results = archive.search('rust async', None, TimeFilterOption.ALL, 10)
+        assert [post.id for post in results] == ['title', 'body', 'other']
+
+    def it_matches_word_endings_and_prefixes(self, archive):
+        list(archive.archive('aww', [make_post('a', 1, 0, title='Cats sleeping in boxes')]))
+        assert [post.id for post in archive.search('cat box', None, TimeFilterOption.ALL, 10)] == ['a']
+        assert [post.id for post in archive.search('sle*', None, TimeFilterOption.ALL, 10)] == ['a']
+
+    def it_filters_by_subreddit_and_time(self, archive):
+        posts = [make_post('new', 1, 0, title='Rust news'), make_post('old', 1, 60 * DAY, title='Rust news')]
+        list(archive.archive('rust', posts))
+        list(archive.archive('news', [make_post('elsewhere', 1, 0, title='Rust news')]))
+        results = archive.search('rust', 'Rust', TimeFilterOption.MONTH, 10)
+        assert [post.id for post in results] == ['new']
+
+    def it_reindexes_posts_whose_text_changed(self, archive):
+        list(archive.archive('python', [make_post('a', 1, 0, title='Old title')]))
+        list(archive.archive('python', [make_post('a', 5, 0, title='Edited title')]))
+        assert archive.search('old', None, TimeFilterOption.ALL, 10) == []
+        assert [post.score for post in archive.search('edited', None, TimeFilterOption.ALL, 10)] == [5]
+
+    def it_indexes_posts_archived_before_the_index_existed(self, tmp_path):
+        path = tmp_path / 'archive.sqlite3'
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.execute(UPSERT, archive_row(make_post('a', 1, 0, title='Archived long ago'), 'python', NOW))
+        connection.close()
+        archive = Archive(path, clock=lambda: NOW)
+        assert [post.id for post in archive.search('archived', None, TimeFilterOption.ALL, 10)] == ['a']
+        archive.close()
+
+    def it_finds_the_right_posts_after_a_vacuum(self, archive):
+        posts = [make_post(post_id, 1, 0, title=f'Post about {post_id}') for post_id in ('cats', 'dogs', 'birds')]
+        list(archive.archive('aww', posts))
+        with archive.connection:
+            archive.connection.execute("DELETE FROM submissions WHERE id = 'cats'")
+        archive.connection.execute('VACUUM')
+        assert [post.id for post in archive.search('birds', None, TimeFilterOption.ALL, 10)] == ['birds']
+
+    def it_upgrades_archives_keyed_by_id_only(self, tmp_path):
+        path = tmp_path / 'archive.sqlite3'
+        connection = sqlite3.connect(path)
+        old_schema = SCHEMA.replace('pk INTEGER PRIMARY KEY,', '').replace('NOT NULL UNIQUE', 'PRIMARY KEY')
+        connection.executescript(old_schema)
+        with connection:
+            for post_id in ('a', 'b'):
+                connection.execute(UPSERT, archive_row(make_post(post_id, 1, 0, title=f'Old {post_id}'), 'python', NOW))
+        connection.close()
+        archive = Archive(path, clock=lambda: NOW)
+        assert [post.id for post in archive.search('old b', None, TimeFilterOption.ALL, 10)] == ['b']
+        rows = archive.connection.execute('SELECT pk, id FROM submissions ORDER BY pk').fetchall()
+        assert rows == [(1, 'a'), (2, 'b')]
+        archive.close()
+
+    def it_accepts_fts5_syntax(self, archive):
+        posts = [make_post('a', 1, 0, title='Rust 2024 edition'), make_post('b', 1, 0, title='Go generics')]
+        list(archive.archive('programming', posts))
+        results = archive.search('rust OR generics', None, TimeFilterOption.ALL, 10, syntax=True)
+        assert {post.id for post in results} == {'a', 'b'}
+        assert archive.search('c++ OR', None, TimeFilterOption.ALL, 10) == []
+        with pytest.raises(fire.core.FireError, match='Invalid search query'):
+            archive.search('rust OR', None, TimeFilterOption.ALL, 10, syntax=True)
+
+
+class TestGetArchivePath:
+    def it_defaults_to_the_data_directory(self, tmp_path):
+        assert get_archive_path() == tmp_path / 'data' / 'reddit-get' / 'archive.sqlite3'
+
+
+class TestQueryCommand:
+    def it_answers_from_posts_archived_by_post(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, archive=True)
+        fetched = cli.post('aww', post_sorting='new', limit=150, header=False)
+        requests = len(stub_reddit.requests)
+
+        result = RedditCli(stub_reddit.config_path).query(
+            'aww', time_filter='day', limit=3, output_format='{title} ({score}) by {author}',
+        )
+        assert result == [
+            '#### The Top Posts for the Last Day from r/aww',
+            'Post 0 in r/aww (1000) by user0',
+            'Post 1 in r/aww (999) by user1',
+            'Post 2 in r/aww (998) by user2',
+        ]
+        assert len(stub_reddit.requests) == requests
+        count = sqlite3.connect(get_archive_path()).execute('SELECT count(*) FROM submissions').fetchone()
+        assert count == (len(fetched),)
+
+    def it_archives_streamed_and_cached_listings(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path)
+        cli.post('aww', limit=5)
+        archiving = RedditCli(stub_reddit.config_path, archive=True)
+        archiving.post('aww', limit=5, stream=True)
+        capsys.readouterr()
+        assert len(archiving.query('aww', time_filter='all', header=False)) == 5
+
+    def it_explains_when_there_is_no_archive(self, mock_reddit):
+        with pytest.raises(fire.core.FireError, match='There is no archive'):
+            RedditCli('tests/.exampleconfig').query('aww')
+
+
+class TestSearchLocalCommand:
+    def it_searches_posts_archived_by_post(self, stub_reddit):
+        RedditCli(stub_reddit.config_path, archive=True).batch('aww,news', limit=20)
+        requests = len(stub_reddit.requests)
+
+        cli = RedditCli(stub_reddit.config_path)
+        assert cli.search_local('post 12', limit=5) == ['- r/aww: Post 12 in r/aww', '- r/news: Post 12 in r/news']
+        assert cli.search_local(('post', 12), subreddit='news', output_format='{title}') == ['Post 12 in r/news']
+        assert len(stub_reddit.requests) == requests
+
+    def it_explains_when_there_is_no_archive(self, mock_reddit):
+        with pytest.raises(fire.core.FireError, match='There is no archive'):
+            RedditCli('tests/.exampleconfig').search_local('rust')
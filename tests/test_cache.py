@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.cache import (
+    ListingCache,
+    get_cache_dir,
+    serialize_submission,
+)
+from reddit_get.revalidate import Validator
+from reddit_get.types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+from .conftest import MockSubmission
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestGetCacheDir:
+    def it_uses_the_given_directory(self, tmp_path):
+        assert get_cache_dir(str(tmp_path)) == tmp_path
+
+    def it_defaults_to_the_xdg_cache_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+        assert get_cache_dir() == tmp_path / 'reddit-get'
+
+
+class TestSerializeSubmission:
+    def it_keeps_scalar_fields_and_stringifies_requested_objects(self):
+        post = MockSubmission('a title')
+        post.score = 10
+        post.subreddit = Mock(__str__=lambda self: 'news')
+        post._reddit = object()
+        assert serialize_submission(post, {'subreddit'}) == {
+            'title': 'a title',
+            'author': 'testauthor',
+            'score': 10,
+            'subreddit': 'news',
+        }
+
+
+class TestListingCache:
+    def make_cache(self, tmp_path, clock=None, **kwargs):
+        return ListingCache(tmp_path, clock=clock or Clock(), **kwargs)
+
+    def it_returns_stored_posts_until_they_expire(self, tmp_path):
+        clock = Clock()
+        cache = self.make_cache(tmp_path, clock)
+        key = cache.key('news', SortingOption.TOP, TimeFilterOption.WEEK, 3)
+        cache.set(key, [{'title': 'one'}], ttl=60)
+
+        assert [post.title for post in cache.get(key, {'title'})] == ['one']
+        clock.now += 60
+        assert cache.get(key, {'title'}) is None
+
+    def it_misses_when_a_field_was_not_stored(self, tmp_path):
+        cache = self.make_cache(tmp_path)
+        cache.set('key', [{'title': 'one'}], ttl=60)
+        assert cache.get('key', {'title', 'score'}) is None
+
+    def it_does_not_store_listings_without_a_ttl(self, tmp_path):
+        cache = self.make_cache(tmp_path)
+        cache.set('key', [{'title': 'one'}], ttl=0)
+        assert cache.get('key', {'title'}) is None
+
+    def it_ignores_corrupt_entries(self, tmp_path):
+        cache = self.make_cache(tmp_path)
+        cache.directory.mkdir(parents=True)
+        (cache.directory / 'key.json').write_text('{not json')
+        assert cache.get('key', {'title'}) is None
+
+    @pytest.mark.parametrize(
+        'entry',
+        [
+            [],
+            {'expires_at': 0},
+            {'posts': None},
+            {'posts': 'title'},
+            {'posts': [['title']]},
+            {'posts': [{'title': 'x'}], 'expires_at': 'later'},
+            {'posts': [{'title': 'x'}], 'expires_at': 0, 'validator': ['etag']},
+        ],
+    )
+    def it_ignores_entries_of_the_wrong_shape(self, tmp_path, entry):
+        cache = self.make_cache(tmp_path)
+        cache.directory.mkdir(parents=True)
+        (cache.directory / 'key.json').write_text(json.dumps(entry))
+        assert cache.get('key', ()) is None
+        assert cache.get_stale('key', ()) is None
+        cache.refresh('key', 60)
+
+    def it_keeps_expired_entries_with_a_validator_for_revalidation(self, tmp_path):
+        clock = Clock()
+        cache = self.make_cache(tmp_path, clock)
+        cache.set('key', [{'title': 'one'}], ttl=60, validator=Validator('"tag"', None, 'digest'))
+        cache.set('plain', [{'title': 'two'}], ttl=60)
+        assert cache.get_stale('key', {'title'}) is None
+        clock.now += 60
+        posts, validator = cache.get_stale('key', {'title'})
+        assert [post.title for post in posts] == ['one']
+        assert validator == Validator('"tag"', None, 'digest')
+        assert cache.get_stale('key', {'score'}) is None
+        assert cache.get_stale('plain', {'title'}) is None
+
+    def it_refreshes_revalidated_entries(self, tmp_path):
+        clock = Clock()
+        cache = self.make_cache(tmp_path, clock)
+        cache.set('key', [{'title': 'one'}], ttl=60, validator=Validator(None, None, 'digest'))
+        clock.now += 60
+        cache.refresh('key', ttl=60)
+        assert [post.title for post in cache.get('key', {'title'})] == ['one']
+        assert cache.get_stale('key', {'title'}) is None
+
+    def it_uses_case_insensitive_subreddit_keys(self):
+        assert ListingCache.key('News', SortingOption.HOT, TimeFilterOption.ALL, 1) == ListingCache.key(
+            'news', SortingOption.HOT, TimeFilterOption.ALL, 1,
+        )
+
+    def it_evicts_the_least_recently_used_entries(self, tmp_path):
+        cache = self.make_cache(tmp_path)
+        cache.set('old', [{'title': 'x' * 100}], ttl=60)
+        cache.set('new', [{'title': 'y' * 100}], ttl=60)
+        os.utime(cache.directory / 'old.json', (1, 1))
+        os.utime(cache.directory / 'new.json', (2, 2))
+        # Reading an entry makes it the most recently used one
+        assert cache.get('old', {'title'}) is not None
+
+        cache.max_bytes = 2 * (cache.directory / 'old.json').stat().st_size
+        cache.set('newest', [{'title': 'z' * 100}], ttl=60)
+
+        assert sorted(path.stem for path in cache.directory.glob('*.json')) == ['newest', 'old']
+
+
+class TestPostCaching:
+    def it_serves_repeated_queries_from_the_cache(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        first = cli.post(subreddit='testsubreddit', limit=3)
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            second = cli.post(subreddit='testsubreddit', limit=3)
+        subreddit.assert_not_called()
+        assert second == first
+
+    def it_serves_other_templates_from_the_stored_fields(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post(subreddit='testsubreddit', limit=3, output_format='{title}')
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            result = cli.post(subreddit='testsubreddit', limit=3, output_format='{title} {author}')
+        subreddit.assert_not_called()
+        assert result[1:] == ['top testauthor'] * 3
+
+    def it_fetches_again_when_the_template_needs_new_fields(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post(subreddit='testsubreddit', limit=1, output_format='{title}')
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            subreddit.return_value.top.return_value = [Mock(title='top', score=5)]
+            result = cli.post(subreddit='testsubreddit', limit=1, output_format='{title} {score}')
+        assert result[1:] == ['top 5']
+
+    def it_always_fetches_with_no_cache(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig', no_cache=True)
+        assert cli.cache is None
+        cli.post(subreddit='testsubreddit', limit=3)
+        with patch.object(cli.reddit, 'subreddit', wraps=cli.reddit.subreddit) as subreddit:
+            cli.post(subreddit='testsubreddit', limit=3)
+        subreddit.assert_called_once_with('testsubreddit')
+
+    def it_uses_the_given_cache_dir(self, mock_reddit, tmp_path):
+        cli = RedditCli('tests/.exampleconfig', cache_dir=str(tmp_path))
+        cli.post(subreddit='testsubreddit', limit=3)
+        assert list((tmp_path / 'listings').glob('*.json'))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from fire.core import FireError
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.comments import (
+    CommentOptions,
+    flatten_comments,
+    map_ordered,
+    render_comments,
+)
+from reddit_get.templates import compile_template
+
+
+def make_comment(body, replies=()):
+    return SimpleNamespace(body=body, author='someone', replies=list(replies))
+
+
+FOREST = [
+    make_comment('a', [make_comment('a.a', [make_comment('a.a.a')]), make_comment('a.b')]),
+    make_comment('b'),
+    make_comment('c'),
+]
+
+
+class TestCommentOptions:
+    @pytest.mark.parametrize(
+        'options',
+        [
+            CommentOptions(0),
+            CommentOptions(1, depth=0),
+            CommentOptions(1, replace_more=-1),
+            CommentOptions(1, concurrency=0),
+            CommentOptions(1, output_format='no fields'),
+        ],
+    )
+    def it_rejects_invalid_options(self, options):
+        with pytest.raises(FireError):
+            options.check()
+
+
+class TestFlattenComments:
+    def it_keeps_the_first_top_level_comments(self):
+        assert [(level, comment.body) for level, comment in flatten_comments(FOREST, 2, 1)] == [(0, 'a'), (0, 'b')]
+
+    def it_descends_into_replies_up_to_the_depth(self):
+        assert [(level, comment.body) for level, comment in flatten_comments(FOREST, 1, 2)] == [
+            (0, 'a'),
+            (1, 'a.a'),
+            (1, 'a.b'),
+        ]
+
+
+class TestRenderComments:
+    def it_indents_replies(self):
+        lines = render_comments(compile_template('- {body}'), flatten_comments(FOREST, 1, 3))
+        assert list(lines) == ['- a', '  - a.a', '    - a.a.a', '  - a.b']
+
+    def it_only_renders_data_that_came_with_the_comment(self):
+        with pytest.raises(FireError, match="Comments have no field 'permalink'"):
+            list(render_comments(compile_template('{permalink}'), [(0, make_comment('a'))]))
+
+
+class TestMapOrdered:
+    def it_keeps_the_order_of_the_items(self):
+        def slow_for_small(number):
+            time.sleep(0.01 * (5 - number))
+            return number * 2
+
+        assert list(map_ordered(slow_for_small, range(5), 5)) == [(number, number * 2) for number in range(5)]
+
+    def it_runs_a_bounded_number_of_calls_at_once(self):
+        running = 0
+        most = 0
+        lock = threading.Lock()
+
+        def call(number):
+            nonlocal running, most
+            with lock:
+                running += 1
+                most = max(most, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return number
+
+        assert len(list(map_ordered(call, range(20), 4))) == 20
+        assert 1 < most <= 4
+
+    def it_only_takes_items_as_results_are_needed(self):
+        items = itertools.count()
+        assert list(itertools.islice(map_ordered(str, items, 3), 2)) == [(0, '0'), (1, '1')]
+        assert next(items) <= 5
+
+
+class TestPostComments:
+    def it_prints_comments_under_each_post(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        assert cli.post('aww', limit=2, header=False, comments=2, comment_format='  * {body}') == [
+            '- Post 0 in r/aww',
+            '  * Comment 0 on aww0',
+            '  * Comment 1 on aww0',
+            '- Post 1 in r/aww',
+            '  * Comment 0 on aww1',
+            '  * Comment 1 on aww1',
+        ]
+        assert sorted(path.partition('?')[0] for path in stub_reddit.requests if '/comments/' in path) == [
+            '/comments/aww0/',
+            '/comments/aww1/',
+        ]
+
+    def it_only_asks_for_the_comments_it_prints(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        cli.post('aww', limit=1, comments=2)
+        cli.post('news', limit=1, comments=2, comment_depth=2)
+        shallow, deep = (parse_qs(path.partition('?')[2]) for path in stub_reddit.requests if '/comments/' in path)
+        assert (shallow['sort'], shallow['depth'], shallow['limit']) == (['confidence'], ['1'], ['2'])
+        assert deep['depth'] == ['2']
+        assert deep.get('limit') != ['2']
+
+    def it_streams_posts_with_their_replies(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        cli.post('aww', limit=1, header=False, stream=True, comments=1, comment_depth=2)
+        assert capsys.readouterr().out.splitlines() == [
+            '- Post 0 in r/aww',
+            '  - commenter0: Comment 0 on aww0',
+            '    - commenter0: Comment 0.0 on aww0',
+            '    - commenter1: Comment 0.1 on aww0',
+            '    - commenter2: Comment 0.2 on aww0',
+        ]
+
+    def it_serves_the_posts_from_the_cache(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        first = cli.post('aww', limit=1, comments=1)
+        assert RedditCli(stub_reddit.config_path, no_token_cache=True).post('aww', limit=1, comments=1) == first
+        assert len([path for path in stub_reddit.requests if path.startswith('/r/aww/')]) == 1
+
+    def it_only_adds_comments_to_text_output(self):
+        with pytest.raises(FireError, match='text output'):
+            RedditCli('tests/.exampleconfig').post('aww', comments=3, output='ndjson')
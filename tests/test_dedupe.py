@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.dedupe import (
+    DedupeIndex,
+    canonical_url,
+    similarity,
+    title_signature,
+)
+
+NOW = 1_700_000_000.0
+DAY = 24 * 60 * 60
+
+
+def make_post(post_id, title, url=None):
+    return SimpleNamespace(name=f't3_{post_id}', title=title, url=url or f'https://example.com/{post_id}')
+
+
+@pytest.fixture
+def clock():
+    return SimpleNamespace(now=NOW)
+
+
+@pytest.fixture
+def index(tmp_path, clock):
+    index = DedupeIndex(tmp_path / 'dedupe.sqlite3', clock=lambda: clock.now)
+    yield index
+    index.close()
+
+
+class TestCanonicalUrl:
+    @pytest.mark.parametrize(
+        ('url', 'expected'),
+        [
+            ('http://example.com/a/', 'example.com/a'),
+            ('https://www.example.com/a?utm_campaign=x&fbclid=y#comments', 'example.com/a'),
+            ('https://example.com/a?id=2&page=1', 'example.com/a?id=2&page=1'),
+            ('https://example.com/a?page=1&id=2', 'example.com/a?id=2&page=1'),
+            ('https://www.reddit.com/r/news/comments/1ABCDE/some_title/', 't3_1abcde'),
+            ('https://reddit.com/comments/1abcde', 't3_1abcde'),
+            ('https://www.reddit.com/gallery/1abcde', 't3_1abcde'),
+            ('https://redd.it/1abcde', 't3_1abcde'),
+            ('/r/news/comments/1abcde/some_title/', 't3_1abcde'),
+            ('https://i.redd.it/1abcde.jpg', 'i.redd.it/1abcde.jpg'),
+        ],
+    )
+    def it_reduces_links_to_the_page_they_link_to(self, url, expected):
+        assert canonical_url(url) == expected
+
+
+class TestTitleSignature:
+    def it_ignores_case_and_punctuation(self):
+        first = title_signature('Massive earthquake hits Tokyo, thousands evacuated')
+        second = title_signature('MASSIVE earthquake hits Tokyo; thousands evacuated!')
+        assert similarity(first, second) == 1
+
+    def it_estimates_how_similar_titles_are(self):
+        title = title_signature('Massive earthquake hits Tokyo, thousands evacuated')
+        assert similarity(title, title_signature('BREAKING: Massive earthquake hits Tokyo, thousands evacuated')) > 0.8
+        assert similarity(title, title_signature('Scientists find water on a distant exoplanet')) < 0.2
+
+    def it_skips_short_titles(self):
+        assert title_signature('Wow, look') is None
+
+
+class TestDedupeIndex:
+    def it_drops_the_same_post_and_posts_linking_to_the_same_page(self, index):
+        posts = [
+            make_post('a', 'Council approves the new city budget', 'https://example.com/story'),
+            make_post('a', 'Council approves the new city budget', 'https://example.com/story'),
+            make_post('b', 'City budget passes after a long debate', 'https://www.example.com/story/?utm_source=rss'),
+            make_post('c', 'Crosspost', 'https://www.reddit.com/r/news/comments/a/council_approves/'),
+            make_post('d', 'Local team wins the championship game'),
+        ]
+        assert [post.name for post in index.filter(posts)] == ['t3_a', 't3_d']
+
+    def it_drops_crossposts_of_the_post(self, index):
+        crosspost = make_post('b', 'Look at this', '/r/news/comments/a/a_title/')
+        other = make_post('c', 'Look at that', 'https://example.com/c')
+        other.crosspost_parent = 't3_a'
+        posts = [make_post('a', 'Council approves the new city budget'), crosspost, other]
+        assert [post.name for post in index.filter(posts)] == ['t3_a']
+
+    def it_drops_posts_with_nearly_the_same_title(self, index):
+        posts = [
+            make_post('a', 'Massive earthquake hits Tokyo, thousands evacuated'),
+            make_post('b', 'BREAKING: Massive earthquake hits Tokyo, thousands evacuated'),
+            make_post('c', 'Massive earthquake hits Osaka, thousands evacuated'),
+            make_post('d', 'Thousands evacuated'),
+        ]
+        assert [post.name for post in index.filter(posts)] == ['t3_a', 't3_c', 't3_d']
+
+    def it_honors_the_threshold(self, tmp_path):
+        index = DedupeIndex(tmp_path / 'dedupe.sqlite3', threshold=0.5)
+        posts = [
+            make_post('a', 'Massive earthquake hits Tokyo, thousands evacuated'),
+            make_post('b', 'Massive earthquake hits Osaka, thousands evacuated'),
+        ]
+        assert [post.name for post in index.filter(posts)] == ['t3_a']
+        index.close()
+
+    def it_remembers_posts_between_runs(self, tmp_path, index, clock):
+        list(index.filter([make_post('a', 'Council approves the new city budget')]))
+        index.close()
+        later = DedupeIndex(tmp_path / 'dedupe.sqlite3', clock=lambda: clock.now)
+        assert list(later.filter([make_post('b', 'Council approves the new city budget!')])) == []
+        later.close()
+
+    def it_forgets_posts_after_the_window(self, tmp_path, index, clock):
+        list(index.filter([make_post('a', 'Council approves the new city budget')]))
+        index.close()
+        clock.now += 32 * DAY
+        later = DedupeIndex(tmp_path / 'dedupe.sqlite3', clock=lambda: clock.now)
+        posts = [make_post('a', 'Council approves the new city budget')]
+        assert list(later.filter(posts)) == posts
+        assert later.connection.execute('SELECT count(*) FROM signatures').fetchone() == (1,)
+        assert later.connection.execute('SELECT count(*) FROM bands').fetchone() == (16,)
+        later.close()
+
+    @pytest.mark.parametrize('kwargs', [{'threshold': 0}, {'threshold': 1.5}, {'window_days': 0}])
+    def it_rejects_invalid_settings(self, tmp_path, kwargs):
+        with pytest.raises(fire.core.FireError):
+            DedupeIndex(tmp_path / 'dedupe.sqlite3', **kwargs)
+
+
+class TestDedupeOption:
+    def it_drops_crossposts_from_a_batch(self, stub_reddit, tmp_path):
+        cli = RedditCli(stub_reddit.config_path, cache_dir=str(tmp_path), dedupe=True)
+        result = cli.batch('aww,awwmirror', limit=2, header=False)
+        assert result == ['- Post 0 in r/aww', '- Post 1 in r/aww']
+
+    def it_drops_posts_printed_by_an_earlier_run(self, stub_reddit, tmp_path):
+        RedditCli(stub_reddit.config_path, cache_dir=str(tmp_path), dedupe=True).post('aww', limit=2)
+        cli = RedditCli(stub_reddit.config_path, cache_dir=str(tmp_path), dedupe=True)
+        assert cli.post('aww', limit=3, header=False) == ['- Post 2 in r/aww']
+
+    def it_drops_duplicates_while_streaming(self, stub_reddit, tmp_path, capsys):
+        cli = RedditCli(stub_reddit.config_path, cache_dir=str(tmp_path), dedupe=True)
+        cli.post('aww', limit=1)
+        capsys.readouterr()
+        cli.post('awwmirror', limit=2, stream=True, header=False)
+        assert capsys.readouterr().out == '- Post 1 in r/awwmirror\n'
+
+    def it_keeps_everything_without_the_option(self, stub_reddit, tmp_path):
+        cli = RedditCli(stub_reddit.config_path, cache_dir=str(tmp_path))
+        assert len(cli.batch('aww,awwmirror', limit=2, header=False)) == 4
+        assert not (tmp_path / 'dedupe.sqlite3').exists()
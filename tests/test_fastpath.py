@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+from reddit_get import RedditCli
+from reddit_get.cache import (
+    ListingCache,
+    get_cache_dir,
+)
+from reddit_get.fastpath import (
+    FastPathCall,
+    parse_fast_path,
+)
+from reddit_get.types import (
+    SortingOption,
+    TimeFilterOption,
+)
+
+# Modules that are slow to import and must not be needed to answer from the cache
+HEAVY_MODULES = ('praw', 'prawcore', 'requests', 'fire', 'asyncio', 'asyncpraw')
+
+
+def run_python(code: str, cache_home: Path) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, 'XDG_CACHE_HOME': str(cache_home)}
+    return subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, env=env, check=False,
+    )
+
+
+class TestParseFastPath:
+    def it_parses_a_post_command(self):
+        call = parse_fast_path(
+            RedditCli,
+            ['post', 'aww', '--limit', '5', '--post-sorting=new', '--noheader', '--no-cache'],
+        )
+        assert call == FastPathCall(
+            'post',
+            {'no_cache': True},
+            {'subreddit': 'aww', 'limit': 5, 'post_sorting': 'new', 'header': False},
+        )
+
+    def it_accepts_the_required_argument_as_a_flag(self):
+        call = parse_fast_path(RedditCli, ['post', '--subreddit', 'aww', '--header=False'])
+        assert call == FastPathCall('post', {}, {'subreddit': 'aww', 'header': False})
+
+    def it_keeps_values_of_string_parameters_as_they_are(self):
+        call = parse_fast_path(RedditCli, ['post', '123', '--output_format', '{title}'])
+        assert call is not None
+        assert call.kwargs == {'subreddit': '123', 'output_format': '{title}'}
+
+    def it_parses_config_location(self):
+        call = parse_fast_path(RedditCli, ['config_location', '--config', 'x'])
+        assert call == FastPathCall('config_location', {'config': 'x'}, {})
+
+    def it_accepts_command_names_with_hyphens(self):
+        call = parse_fast_path(RedditCli, ['search-local', 'rust async', '--time-filter', 'month'])
+        assert call == FastPathCall('search_local', {}, {'terms': 'rust async', 'time_filter': 'month'})
+
+    def it_converts_values_of_optional_parameters_to_their_annotated_type(self):
+        filters = ['--max_age', '2', '--min-score=100', '--min_comments', '3', '--nsfw=False', '--domain', '1']
+        call = parse_fast_path(RedditCli, ['post', 'aww', *filters])
+        assert call is not None
+        assert call.kwargs == {
+            'subreddit': 'aww', 'max_age': 2.0, 'min_score': 100, 'min_comments': 3, 'nsfw': False, 'domain': '1',
+        }
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--nsfw']).kwargs['nsfw'] is True
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--nonsfw']).kwargs['nsfw'] is False
+
+    def it_leaves_everything_else_to_fire(self):
+        assert parse_fast_path(RedditCli, []) is None
+        assert parse_fast_path(RedditCli, ['batch', 'aww']) is None
+        assert parse_fast_path(RedditCli, ['post', '--help']) is None
+        assert parse_fast_path(RedditCli, ['post', '-h']) is None
+        assert parse_fast_path(RedditCli, ['post']) is None
+        assert parse_fast_path(RedditCli, ['post', 'aww', 'extra']) is None
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--unknown', '1']) is None
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--limit', 'ten']) is None
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--limit']) is None
+        assert parse_fast_path(RedditCli, ['post', 'aww', '--min_score', 'many']) is None
+
+
+class TestStartup:
+    def it_imports_the_cli_without_heavy_dependencies(self, tmp_path):
+        result = run_python(
+            'import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import reddit_get.cli\n'
+            'print(time.perf_counter() - start)\n'
+            f'print(",".join(m for m in {(*HEAVY_MODULES, "toml")!r} if m in sys.modules))\n',
+            tmp_path,
+        )
+        elapsed, loaded = result.stdout.splitlines()
+        assert loaded == ''
+        # Generous, importing PRAW and Fire alone takes longer than this on a warm cache
+        assert float(elapsed) < 0.5
+
+    def it_answers_a_cached_post_without_heavy_dependencies(self, tmp_path):
+        key = ListingCache.key('aww', SortingOption.TOP, TimeFilterOption.ALL, 2)
+        posts = [{'title': 'First'}, {'title': 'Second'}]
+        ListingCache(get_cache_dir(str(tmp_path / 'reddit-get'))).set(key, posts, ttl=600)
+        config = Path('tests/.exampleconfig').resolve()
+        result = run_python(
+            'import sys\n'
+            'from reddit_get.cli import main\n'
+            f'sys.argv = ["reddit-get", "post", "aww", "--limit", "2", "--config", {str(config)!r}]\n'
+            'main()\n'
+            f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n',
+            tmp_path,
+        )
+        assert result.stdout.splitlines() == [
+            '#### The Top Posts for All Time from r/aww', '- First', '- Second', '',
+        ]
+
+    def it_prints_the_config_location_without_fire(self, tmp_path):
+        config = Path('tests/.exampleconfig').resolve()
+        result = run_python(
+            'import sys\n'
+            'from reddit_get.cli import main\n'
+            f'sys.argv = ["reddit-get", "config_location", "--config", {str(config)!r}]\n'
+            'main()\n'
+            'print("fire" in sys.modules)\n',
+            tmp_path,
+        )
+        assert result.stdout.splitlines() == [str(config), 'False']
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+
+from fire.core import FireError
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.feed import (
+    Ranking,
+    TopN,
+)
+from reddit_get.types import SortingOption
+
+
+class TestRanking:
+    def it_has_named_rankings(self):
+        assert Ranking('comments')({'num_comments': 7}, now=0) == 7
+        assert Ranking('velocity')({'num_comments': 12, 'created_utc': 0}, now=6 * 3600) == 2
+
+    def it_compiles_expressions_over_post_fields(self):
+        ranking = Ranking('score + 10 * num_comments ** 2 - abs(-1)')
+        assert ranking.fields == {'score', 'num_comments'}
+        assert ranking({'score': 5, 'num_comments': 3}, now=0) == 94
+
+    @pytest.mark.parametrize(
+        'expression',
+        [
+            'score.__class__',
+            '__import__("os")',
+            'open("file")',
+            'max(score, key=1)',
+            '"score"',
+            'score if score else 1',
+            'lambda: 1',
+            '[score]',
+            'score +',
+            '_fetched',
+        ],
+    )
+    def it_only_allows_arithmetic(self, expression):
+        with pytest.raises(FireError):
+            Ranking(expression)
+
+    def it_reports_posts_it_can_not_rank(self):
+        with pytest.raises(FireError, match='Could not rank a post'):
+            Ranking('score / num_comments')({'score': 1, 'num_comments': 0}, now=0)
+
+    def it_knows_which_listings_are_in_its_order(self):
+        assert Ranking('score').orders(SortingOption.TOP)
+        assert Ranking('new').orders(SortingOption.NEW)
+        assert not Ranking('score').orders(SortingOption.HOT)
+        assert not Ranking('comments').orders(SortingOption.TOP)
+
+
+class TestTopN:
+    def it_keeps_only_the_highest_ranked_items(self):
+        top = TopN(3)
+        for number in [5, 1, 9, 3, 7, 2, 8]:
+            top.offer(number, number)
+        assert top.items() == [9, 8, 7]
+
+    def it_breaks_ties_by_order(self):
+        top = TopN(2)
+        top.offer('late', 1, order=5)
+        top.offer('early', 1, order=1)
+        assert not top.offer('later', 1, order=9)
+        assert top.offer('first', 1, order=0)
+        assert top.items() == ['first', 'early']
+
+    def it_can_be_offered_items_from_several_threads(self):
+        top = TopN(10)
+
+        def offer(start):
+            for number in range(start, 1000, 4):
+                top.offer(number, number)
+
+        threads = [threading.Thread(target=offer, args=(start,)) for start in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert top.items() == list(range(999, 989, -1))
+
+
+class TestFeedCommand:
+    def it_merges_subreddits_into_one_ranked_feed(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_cache=True)
+        result = cli.feed('aww,news,pics', post_sorting='top', time_filter='all', limit=300, top=4)
+        assert result == [
+            '#### The Top Posts for All Time from r/aww+news+pics',
+            '- r/aww: Post 0 in r/aww',
+            '- r/news: Post 0 in r/news',
+            '- r/pics: Post 0 in r/pics',
+            '- r/aww: Post 1 in r/aww',
+        ]
+        # Top listings are in score order, so no listing was read past its first page
+        assert len([path for path in stub_reddit.requests if '/top' in path]) == 3
+
+    def it_ranks_by_an_expression(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_cache=True)
+        result = cli.feed(
+            ['aww', 'news'], limit=20, top=2, rank='num_comments * 1000 - score', header=False, output_format='{title}',
+        )
+        assert result == ['Post 12 in r/aww', 'Post 12 in r/news']
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [{'subreddits': ''}, {'limit': 0}, {'top': 0}, {'concurrency': 0}, {'rank': 'score.real'}],
+    )
+    def it_rejects_invalid_arguments(self, kwargs):
+        with pytest.raises(FireError):
+            RedditCli('tests/.exampleconfig').feed(**{'subreddits': 'aww', **kwargs})
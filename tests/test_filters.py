@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from fire.core import FireError
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.fastpath import parse_fast_path
+from reddit_get.filters import PostFilter
+
+NOW = 1_700_000_000.0
+HOUR = 60 * 60
+
+
+def make_post(**fields):
+    defaults = {
+        'score': 10,
+        'num_comments': 2,
+        'link_flair_text': None,
+        'domain': 'example.com',
+        'over_18': False,
+        'title': 'A post',
+        'created_utc': NOW,
+    }
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+def make_filter(**conditions):
+    return PostFilter(**conditions, clock=lambda: NOW)
+
+
+class TestPostFilter:
+    def it_is_inactive_without_conditions(self):
+        post_filter = make_filter()
+        assert not post_filter.active
+        assert post_filter.matches(make_post())
+
+    @pytest.mark.parametrize(
+        ('conditions', 'matching', 'other'),
+        [
+            ({'min_score': 100}, {'score': 100}, {'score': 99}),
+            ({'min_comments': 5}, {'num_comments': 7}, {'num_comments': 4}),
+            ({'flair': 'news,Discussion'}, {'link_flair_text': 'News '}, {'link_flair_text': None}),
+            ({'flair': ('meme',)}, {'link_flair_text': 'MEME'}, {'link_flair_text': 'News'}),
+            ({'domain': 'github.com'}, {'domain': 'gist.github.com'}, {'domain': 'notgithub.com'}),
+            ({'domain': 'www.github.com'}, {'domain': 'github.com'}, {'domain': 'gitlab.com'}),
+            ({'nsfw': False}, {'over_18': False}, {'over_18': True}),
+            ({'nsfw': True}, {'over_18': True}, {'over_18': False}),
+            ({'title_pattern': '(?i)^rust'}, {'title': 'Rust 2024'}, {'title': 'Trust me'}),
+            ({'max_age': 2}, {'created_utc': NOW - HOUR}, {'created_utc': NOW - 3 * HOUR}),
+            ({'min_age': 2}, {'created_utc': NOW - 3 * HOUR}, {'created_utc': NOW - HOUR}),
+        ],
+    )
+    def it_checks_each_condition(self, conditions, matching, other):
+        post_filter = make_filter(**conditions)
+        assert post_filter.matches(make_post(**matching))
+        assert not post_filter.matches(make_post(**other))
+
+    def it_needs_every_condition_to_hold(self):
+        post_filter = make_filter(min_score=100, nsfw=False)
+        assert post_filter.fields == {'score', 'over_18'}
+        assert not post_filter.matches(make_post(score=150, over_18=True))
+
+    def it_stops_reading_once_enough_posts_matched(self):
+        read = []
+
+        def posts():
+            for score in range(100):
+                read.append(score)
+                yield make_post(score=score)
+
+        assert [post.score for post in make_filter(min_score=10).filter(posts(), 3)] == [10, 11, 12]
+        assert read == list(range(13))
+
+    def it_stops_reading_time_ordered_posts_past_the_maximum_age(self):
+        posts = iter([make_post(created_utc=NOW - hours * HOUR, score=hours) for hours in range(10)])
+        matching = make_filter(max_age=3.5, min_score=1).filter(posts, 10, time_ordered=True)
+        assert [post.score for post in matching] == [1, 2, 3]
+        # The post past the cutoff was read, nothing after it
+        assert next(posts).score == 5
+
+    def it_reads_other_listings_to_the_end(self):
+        ages = [5, 1, 6, 2]
+        posts = [make_post(created_utc=NOW - hours * HOUR, score=hours) for hours in ages]
+        assert [post.score for post in make_filter(max_age=3).filter(posts, 10)] == [1, 2]
+
+    def it_converts_conditions_given_as_strings(self):
+        post_filter = make_filter(min_score='100', min_comments='2', max_age='2.5', nsfw='False')
+        assert post_filter.matches(make_post(score=100, created_utc=NOW - 2 * HOUR))
+        assert not post_filter.matches(make_post(score=100, over_18=True))
+        assert not post_filter.matches(make_post(score=99))
+
+    @pytest.mark.parametrize(
+        'conditions',
+        [
+            {'title_pattern': '('},
+            {'max_age': 0},
+            {'min_age': -1},
+            {'min_age': 3, 'max_age': 2},
+            {'min_score': 'many'},
+            {'min_comments': 1.5},
+            {'max_age': 'nan'},
+            {'nsfw': 'maybe'},
+        ],
+    )
+    def it_rejects_invalid_conditions(self, conditions):
+        with pytest.raises(FireError):
+            make_filter(**conditions)
+
+
+class TestFilteredPost:
+    def listing_requests(self, stub_reddit):
+        return [path for path in stub_reddit.requests if path.startswith('/r/aww/new')]
+
+    def it_gets_the_first_matching_posts(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        result = cli.post('aww', post_sorting='new', limit=4, flair='discussion', nsfw=False, header=False)
+        # Every third post has the Discussion flair and every tenth is NSFW
+        assert result == ['- Post 2 in r/aww', '- Post 5 in r/aww', '- Post 8 in r/aww', '- Post 11 in r/aww']
+        assert len(self.listing_requests(stub_reddit)) == 1
+
+    def it_pages_until_enough_posts_matched(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        result = cli.post('aww', post_sorting='new', limit=2, title_pattern=r'Post 1\d\d in', header=False)
+        assert result == ['- Post 100 in r/aww', '- Post 101 in r/aww']
+        assert len(self.listing_requests(stub_reddit)) == 2
+
+    def it_stops_paging_new_posts_past_the_maximum_age(self, stub_reddit):
+        # Stub posts are a minute apart, so posts 0 to 119 are at most two hours old
+        cli = RedditCli(stub_reddit.config_path)
+        result = cli.post('aww', post_sorting='new', limit=1000, max_age=2, output_format='{id}', header=False)
+        assert len(result) == 120
+        assert len(self.listing_requests(stub_reddit)) == 2
+
+    def it_filters_streamed_and_exported_posts(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path)
+        cli.post('aww', limit=2, min_score=999, stream=True, header=False)
+        assert capsys.readouterr().out == '- Post 0 in r/aww\n- Post 1 in r/aww\n'
+        cli.post('aww', limit=5, min_comments=12, output='ndjson', fields='id,num_comments')
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows == [{'id': f'aww{index}', 'num_comments': 12} for index in (12, 25, 38, 51, 64)]
+
+    def it_filters_the_unseen_posts_of_incremental_runs(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        first = cli.post('aww', post_sorting='new', limit=2, incremental=True, min_score=998, header=False)
+        assert first == ['- Post 0 in r/aww', '- Post 1 in r/aww']
+        assert cli.post('aww', post_sorting='new', limit=2, incremental=True, min_score=998) == []
+
+    def it_filters_posts_of_fast_path_calls(self, stub_reddit):
+        args = ['post', 'aww', '--post-sorting', 'new', '--limit', '4', '--flair', 'discussion', '--nsfw=False']
+        call = parse_fast_path(RedditCli, [*args, '--max_age', '2', '--noheader', '--config', stub_reddit.config_path])
+        assert call is not None
+        result = getattr(RedditCli(**call.init_kwargs), call.command)(**call.kwargs)
+        assert result == ['- Post 2 in r/aww', '- Post 5 in r/aww', '- Post 8 in r/aww', '- Post 11 in r/aww']
+        call = parse_fast_path(RedditCli, ['post', 'aww', '--min_score', '999', '--config', stub_reddit.config_path])
+        result = getattr(RedditCli(**call.init_kwargs), call.command)(**call.kwargs)
+        assert result[1:] == ['- Post 0 in r/aww', '- Post 1 in r/aww']
+
+    def it_rejects_invalid_filters(self):
+        with pytest.raises(FireError, match='Invalid title pattern'):
+            RedditCli('tests/.exampleconfig').post('aww', title_pattern='[')
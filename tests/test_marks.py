@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from reddit_get import RedditCli
+from reddit_get.marks import (
+    HighWaterMarks,
+    Mark,
+    iter_unseen,
+    newest_mark,
+)
+from reddit_get.types import SortingOption
+
+
+def make_post(number):
+    return SimpleNamespace(name=f't3_{number}', created_utc=float(number), title=f'post {number}')
+
+
+class TestHighWaterMarks:
+    def it_stores_marks_per_subreddit_and_sorting(self, tmp_path):
+        marks = HighWaterMarks(tmp_path / 'marks.json')
+        marks.set('News', SortingOption.NEW, Mark('t3_1', 1.0))
+        assert marks.get('news', SortingOption.NEW) == Mark('t3_1', 1.0)
+        assert marks.get('news', SortingOption.RISING) is None
+
+    def it_stores_the_posts_returned(self, tmp_path):
+        marks = HighWaterMarks(tmp_path / 'marks.json')
+        marks.set('news', SortingOption.HOT, Mark('t3_2', 2.0, ('t3_1', 't3_2')))
+        assert marks.get('news', SortingOption.HOT) == Mark('t3_2', 2.0, ('t3_1', 't3_2'))
+
+    def it_ignores_unreadable_marks(self, tmp_path):
+        (tmp_path / 'marks.json').write_text('[]')
+        assert HighWaterMarks(tmp_path / 'marks.json').get('news', SortingOption.NEW) is None
+
+
+class TestIterUnseen:
+    def it_yields_everything_without_a_mark(self):
+        posts = [make_post(3), make_post(2)]
+        assert list(iter_unseen(posts, None, SortingOption.NEW)) == posts
+
+    def it_stops_at_the_mark_for_time_ordered_listings(self):
+        consumed = []
+
+        def listing():
+            for number in (5, 4, 3, 2, 1):
+                consumed.append(number)
+                yield make_post(number)
+
+        unseen = list(iter_unseen(listing(), Mark('t3_3', 3.0), SortingOption.NEW))
+        assert [post.title for post in unseen] == ['post 5', 'post 4']
+        assert consumed == [5, 4, 3]
+
+    def it_filters_listings_that_are_not_time_ordered_by_the_posts_returned_before(self):
+        posts = [make_post(2), make_post(5), make_post(1), make_post(4)]
+        unseen = list(iter_unseen(posts, Mark('t3_5', 5.0, ('t3_5', 't3_1')), SortingOption.HOT))
+        assert [post.title for post in unseen] == ['post 2', 'post 4']
+
+    def it_falls_back_to_the_newest_post_for_marks_without_fullnames(self):
+        posts = [make_post(2), make_post(5), make_post(1), make_post(4)]
+        unseen = list(iter_unseen(posts, Mark('t3_3', 3.0), SortingOption.RISING))
+        assert [post.title for post in unseen] == ['post 5', 'post 4']
+
+
+class TestNewestMark:
+    def it_keeps_the_newer_post(self):
+        assert newest_mark(None, make_post(1)) == Mark('t3_1', 1.0)
+        assert newest_mark(Mark('t3_2', 2.0), make_post(1)) == Mark('t3_2', 2.0)
+        assert newest_mark(Mark('t3_2', 2.0), make_post(3)) == Mark('t3_3', 3.0)
+
+
+class TestIncrementalPost:
+    def post(self, cli, numbers, post_sorting='new', **kwargs):
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            getattr(subreddit.return_value, post_sorting).return_value = [make_post(number) for number in numbers]
+            return cli.post(
+                subreddit='testsubreddit', post_sorting=post_sorting, incremental=True, custom_header='{subreddit}',
+                **kwargs,
+            )
+
+    def it_only_returns_posts_newer_than_the_last_run(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        assert self.post(cli, [2, 1]) == ['r/testsubreddit', '- post 2', '- post 1']
+        assert self.post(cli, [4, 3, 2, 1]) == ['r/testsubreddit', '- post 4', '- post 3']
+
+    def it_returns_older_posts_that_newly_appear_in_other_listings(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        assert self.post(cli, [5, 3], post_sorting='hot', header=False) == ['- post 5', '- post 3']
+        assert self.post(cli, [5, 4, 3, 1], post_sorting='hot', header=False) == ['- post 4', '- post 1']
+        assert self.post(cli, [4, 3, 5], post_sorting='hot') == []
+
+    def it_returns_nothing_when_there_are_no_new_posts(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        self.post(cli, [2, 1])
+        assert self.post(cli, [2, 1]) == []
+
+    def it_keeps_the_mark_across_runs(self, mock_reddit):
+        self.post(RedditCli('tests/.exampleconfig'), [2, 1])
+        assert self.post(RedditCli('tests/.exampleconfig'), [3, 2, 1]) == ['r/testsubreddit', '- post 3']
+
+    def it_streams_only_new_posts(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        self.post(cli, [2, 1], stream=True)
+        capsys.readouterr()
+
+        self.post(cli, [2, 1], stream=True)
+        assert capsys.readouterr().out == ''
+        self.post(cli, [3, 2], stream=True)
+        assert capsys.readouterr().out == 'r/testsubreddit\n- post 3\n'
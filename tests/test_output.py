@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+from unittest.mock import patch
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get import output as output_module
+from reddit_get.output import (
+    export_records,
+    parse_fields,
+)
+from reddit_get.projection import get_record_type
+
+
+class Author:
+    def __str__(self):
+        return 'someone'
+
+
+def make_records(count):
+    record_type = get_record_type(('author', 'score', 'title'))
+    return [record_type(Author(), index, f'Post, "{index}"') for index in range(count)]
+
+
+class TestParseFields:
+    def it_accepts_lists(self):
+        assert parse_fields(('title', 'score')) == ('title', 'score')
+
+    def it_rejects_empty_selections(self):
+        with pytest.raises(fire.core.FireError):
+            parse_fields(' , ')
+
+
+class TestExportRecords:
+    def it_writes_ndjson(self, tmp_path):
+        path = tmp_path / 'posts.ndjson'
+        count = export_records(make_records(2), ('title', 'author', 'score'), 'ndjson', str(path))
+        assert count == 2
+        assert [json.loads(line) for line in path.read_text().splitlines()] == [
+            {'title': 'Post, "0"', 'author': 'someone', 'score': 0},
+            {'title': 'Post, "1"', 'author': 'someone', 'score': 1},
+        ]
+
+    def it_writes_csv(self, tmp_path):
+        path = tmp_path / 'posts.csv'
+        export_records(make_records(2), ('score', 'title'), 'csv', str(path))
+        assert path.read_text() == 'score,title\n0,"Post, ""0"""\n1,"Post, ""1"""\n'
+
+    def it_writes_to_standard_output(self, capsys):
+        export_records(make_records(1), ('score',), 'ndjson')
+        assert capsys.readouterr().out == '{"score": 0}\n'
+
+    def it_writes_rows_as_records_arrive(self, monkeypatch):
+        file = io.StringIO()
+
+        def records():
+            for record in make_records(3):
+                yield record
+                # The record has been written before the next one is requested
+                assert file.getvalue().count('\n') == record.score + 1
+
+        monkeypatch.setattr(output_module, 'open_output', lambda *_: contextlib.nullcontext(file))
+        assert export_records(records(), ('score',), 'ndjson') == 3
+
+    @pytest.mark.parametrize('output', ['parquet', 'arrow'])
+    def it_writes_columnar_formats(self, tmp_path, output, monkeypatch):
+        pa = pytest.importorskip('pyarrow')
+        monkeypatch.setattr(output_module, 'BATCH_SIZE', 2)
+        path = tmp_path / f'posts.{output}'
+        assert export_records(make_records(5), ('title', 'score'), output, str(path)) == 5
+        if output == 'parquet':
+            import pyarrow.parquet
+
+            table = pyarrow.parquet.read_table(path)
+        else:
+            table = pa.ipc.open_stream(path.read_bytes()).read_all()
+        assert table.column_names == ['title', 'score']
+        assert table.column('score').to_pylist() == [0, 1, 2, 3, 4]
+        assert pa.types.is_integer(table.schema.field('score').type)
+
+    def it_keeps_the_schema_when_values_change_type_between_batches(self, tmp_path, monkeypatch):
+        pa = pytest.importorskip('pyarrow')
+        monkeypatch.setattr(output_module, 'BATCH_SIZE', 2)
+        record_type = get_record_type(('upvote_ratio', 'edited', 'link_flair_text', 'over_18'))
+        records = [
+            record_type(1, False, None, False),
+            record_type(1, False, None, False),
+            record_type(0.5, 1700000000.5, 'News', True),
+        ]
+        path = tmp_path / 'posts.arrow'
+        assert export_records(records, record_type.__slots__, 'arrow', str(path)) == 3
+        table = pa.ipc.open_stream(path.read_bytes()).read_all()
+        assert table.schema.field('upvote_ratio').type == pa.float64()
+        assert table.to_pylist()[2] == {
+            'upvote_ratio': 0.5, 'edited': '1700000000.5', 'link_flair_text': 'News', 'over_18': True,
+        }
+
+    def it_writes_empty_columnar_files(self, tmp_path):
+        pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+
+        path = tmp_path / 'empty.parquet'
+        assert export_records([], ('title',), 'parquet', str(path)) == 0
+        assert pyarrow.parquet.read_table(path).num_rows == 0
+
+
+class TestPostOutput:
+    def it_defaults_to_the_fields_of_the_output_format(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        assert cli.post('aww', limit=2, output='ndjson', output_format='{title} by {author}') is None
+        assert capsys.readouterr().out == (
+            '{"title": "top", "author": "testauthor"}\n{"title": "top", "author": "testauthor"}\n'
+        )
+
+    def it_writes_the_chosen_fields(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post('aww', limit=1, output='csv', fields=('author', 'title'))
+        assert capsys.readouterr().out == 'author,title\ntestauthor,top\n'
+
+    def it_reuses_the_cache(self, mock_reddit, capsys):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post('aww', limit=1, output_format='{title} {author}')
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            cli.post('aww', limit=1, output='csv', fields='title')
+        subreddit.assert_not_called()
+        assert capsys.readouterr().out == 'title\ntop\n'
+
+    def it_rejects_unknown_formats_before_fetching(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError, match='not a valid output format'):
+            cli.post('aww', output='xml')
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import fire
+from praw.models import Submission
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.projection import (
+    get_record_type,
+    project_post,
+    project_posts,
+)
+
+
+def make_submission(**data):
+    reddit = Mock()
+    reddit.config.kinds = {'submission': 't3'}
+    return Submission(reddit, _data={'id': 'abc123', **data})
+
+
+class TestGetRecordType:
+    def it_reuses_record_types(self):
+        assert get_record_type(('title',)) is get_record_type(('title',))
+
+    def it_has_no_instance_dict(self):
+        record = get_record_type(('title',))('A title')
+        assert not hasattr(record, '__dict__')
+
+    def it_is_read_only(self):
+        record = get_record_type(('title',))('A title')
+        with pytest.raises(AttributeError):
+            record.title = 'Another title'
+
+    def it_compares_by_value(self):
+        record_type = get_record_type(('score', 'title'))
+        assert record_type(1, 'a') == record_type(1, 'a')
+        assert record_type(1, 'a') != record_type(2, 'a')
+        assert len({record_type(1, 'a'), record_type(1, 'a')}) == 1
+
+    def it_rejects_field_names_that_are_not_identifiers(self):
+        with pytest.raises(fire.core.FireError, match='Invalid post field names'):
+            get_record_type(('not-a-name',))
+
+
+class TestProjectPost:
+    def it_copies_fields_from_listing_data(self):
+        post = make_submission(title='A title', score=10, selftext='Long text')
+        record = project_post(post, ('score', 'title'))
+        assert (record.score, record.title) == (10, 'A title')
+        assert not hasattr(record, 'selftext')
+
+    def it_allows_computed_fields(self):
+        post = make_submission(title='A title')
+        assert project_post(post, ('fullname',)).fullname == 't3_abc123'
+
+    def it_refuses_fields_that_would_refetch_the_post(self):
+        post = make_submission(title='A title')
+        with pytest.raises(fire.core.FireError, match='extra request for every post'):
+            project_post(post, ('upvote_ratio',))
+        post._reddit.request.assert_not_called()
+
+    def it_leaves_optional_fields_empty(self):
+        post = make_submission(title='A title')
+        assert project_post(post, ('crosspost_parent',)).crosspost_parent is None
+        post._reddit.request.assert_not_called()
+
+    def it_reads_attributes_of_other_objects(self):
+        assert project_post(SimpleNamespace(title='x'), ('title',)).title == 'x'
+
+    def it_raises_fire_errors_for_missing_attributes(self):
+        with pytest.raises(fire.core.FireError):
+            project_post(SimpleNamespace(title='x'), ('score',))
+
+    def it_projects_lazily(self):
+        posts = project_posts(iter([SimpleNamespace(title='x'), object()]), {'title'})
+        assert next(posts).title == 'x'
+
+
+class TestPostProjection:
+    def it_renders_from_listing_data_only(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        posts = [make_submission(title='first', score=1), make_submission(title='second', score=2)]
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            subreddit.return_value.top.return_value = posts
+            result = cli.post(subreddit='testsubreddit', limit=2, output_format='{score} {title}')
+        assert result[1:] == ['1 first', '2 second']
+
+    def it_fails_fast_for_fields_missing_from_the_listing(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        post = make_submission(title='first')
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            subreddit.return_value.top.return_value = [post]
+            with pytest.raises(fire.core.FireError, match='view_count'):
+                cli.post(subreddit='testsubreddit', limit=1, output_format='{view_count}')
+        post._reddit.request.assert_not_called()
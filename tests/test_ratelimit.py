@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import fire
+from prawcore.exceptions import TooManyRequests
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.ratelimit import RateLimitScheduler
+from reddit_get.requestor import RedditGetRequestor
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch('time.sleep', side_effect=clock.sleep):
+        yield clock
+
+
+def headers(remaining, reset):
+    return {'x-ratelimit-remaining': str(remaining), 'x-ratelimit-reset': str(reset), 'x-ratelimit-used': '1'}
+
+
+class TestRateLimitScheduler:
+    def it_does_not_wait_without_rate_limit_information(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        assert [scheduler.acquire() for _ in range(3)] == [0, 0, 0]
+
+    def it_lets_requests_burst_while_the_budget_is_comfortable(self, clock):
+        scheduler = RateLimitScheduler(clock=clock, burst=10)
+        scheduler.update(headers(remaining=100, reset=300))
+        assert [scheduler.acquire() for _ in range(50)] == [0] * 50
+
+    def it_spreads_the_last_requests_over_the_rest_of_the_window(self, clock):
+        scheduler = RateLimitScheduler(clock=clock, burst=10)
+        scheduler.update(headers(remaining=4, reset=100))
+        waits = [scheduler.acquire() for _ in range(4)]
+        assert waits[0] == 0
+        assert waits[1:] == pytest.approx([100 / 3] * 3)
+
+    def it_waits_for_the_window_to_reset_when_no_budget_is_left(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        scheduler.update(headers(remaining=0, reset=42))
+        assert scheduler.acquire() == 42
+        # The new window's budget is unknown until the next response arrives
+        assert scheduler.acquire() == 0
+
+    def it_keeps_other_threads_waiting_for_the_window_to_reset(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        scheduler.update(headers(remaining=0, reset=42))
+        with patch('time.sleep'):
+            # Both reserve their slot before either has slept
+            assert [scheduler.acquire(), scheduler.acquire()] == [42, 42]
+
+    def it_does_not_hold_up_other_threads_while_waiting(self):
+        sleeping = threading.Event()
+        woken = threading.Event()
+
+        def sleep(seconds):
+            sleeping.set()
+            woken.wait(5)
+
+        scheduler = RateLimitScheduler(clock=lambda: 1000.0)
+        scheduler.update(headers(remaining=0, reset=30))
+        with patch('time.sleep', side_effect=sleep):
+            waiter = threading.Thread(target=scheduler.acquire)
+            waiter.start()
+            try:
+                assert sleeping.wait(5)
+                updater = threading.Thread(target=scheduler.update, args=(headers(remaining=50, reset=20),))
+                updater.start()
+                updater.join(1)
+                assert not updater.is_alive()
+                assert scheduler.remaining == 50
+            finally:
+                woken.set()
+                waiter.join()
+
+    def it_ignores_responses_without_rate_limit_headers(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        scheduler.update({'content-type': 'application/json'})
+        assert scheduler.remaining is None
+
+    def it_retries_when_the_window_resets(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        scheduler.update(headers(remaining=0, reset=30))
+        assert scheduler.retry_delay(attempt=0) == 30
+
+    def it_falls_back_to_exponential_backoff(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        assert [scheduler.retry_delay(attempt) for attempt in range(3)] == [1, 2, 4]
+
+    class TestPersistence:
+        def it_shares_the_budget_with_the_next_run(self, clock, tmp_path):
+            state_path = tmp_path / 'ratelimit.json'
+            RateLimitScheduler(state_path, clock=clock).update(headers(remaining=0, reset=60))
+
+            clock.now += 15
+            assert RateLimitScheduler(state_path, clock=clock).acquire() == 45
+
+        def it_ignores_state_from_a_window_that_has_reset(self, clock, tmp_path):
+            state_path = tmp_path / 'ratelimit.json'
+            RateLimitScheduler(state_path, clock=clock).update(headers(remaining=0, reset=60))
+
+            clock.now += 61
+            scheduler = RateLimitScheduler(state_path, clock=clock)
+            assert scheduler.remaining is None
+            assert scheduler.acquire() == 0
+
+        def it_ignores_corrupt_state(self, clock, tmp_path):
+            state_path = tmp_path / 'ratelimit.json'
+            state_path.write_text(json.dumps({'remaining': 'many'}))
+            assert RateLimitScheduler(state_path, clock=clock).remaining is None
+
+
+class TestRedditGetRequestor:
+    def make_requestor(self, scheduler, response_headers):
+        session = Mock()
+        session.headers = {}
+        session.request.return_value = Mock(headers=response_headers)
+        return RedditGetRequestor(user_agent='reddit-get tests', session=session, scheduler=scheduler)
+
+    def it_schedules_api_requests(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        requestor = self.make_requestor(scheduler, headers(remaining=5, reset=60))
+        requestor.request('GET', 'https://oauth.reddit.com/r/test/top')
+        assert scheduler.remaining == 5
+
+    def it_does_not_schedule_access_token_requests(self, clock):
+        scheduler = RateLimitScheduler(clock=clock)
+        scheduler.update(headers(remaining=0, reset=60))
+        requestor = self.make_requestor(scheduler, {})
+        requestor.request('POST', 'https://www.reddit.com/api/v1/access_token')
+        assert clock.now == 1000.0
+
+
+class TestTooManyRequests:
+    def too_many_requests(self, retry_after=None):
+        response = Mock(status_code=429, headers={'retry-after': retry_after} if retry_after else {})
+        return TooManyRequests(response)
+
+    def it_retries_after_the_requested_delay(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        results = iter([self.too_many_requests(retry_after='7'), 'success'])
+
+        def flaky_function():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch('time.sleep') as sleep:
+            assert cli._execute_with_retry(flaky_function) == 'success'
+        sleep.assert_called_once_with(7.0)
+
+    def it_gives_up_after_max_retries(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+
+        def always_fails():
+            raise self.too_many_requests()
+
+        with patch('time.sleep'), pytest.raises(fire.core.FireError, match='rate limit exceeded'):
+            cli._execute_with_retry(always_fails)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import time
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.archive import get_archive_path
+from reddit_get.cache import get_cache_dir
+from reddit_get.replay import (
+    Replayer,
+    request_key,
+)
+
+
+def write_recording(path, *interactions):
+    path.write_text(''.join(json.dumps(interaction) + '\n' for interaction in interactions))
+
+
+def interaction(key, body, elapsed=0.0):
+    return {
+        'key': key,
+        'status': 200,
+        'headers': {'content-type': 'application/json'},
+        'body': body,
+        'elapsed': elapsed,
+    }
+
+
+class TestRequestKey:
+    def it_ignores_the_host_and_parameter_order(self):
+        assert request_key('GET', 'https://oauth.reddit.com/r/aww/new?b=2', [('a', 1)]) == request_key(
+            'get', 'http://127.0.0.1:1234/r/aww/new', {'b': '2', 'a': '1'},
+        )
+
+
+class TestReplayer:
+    def it_replays_repeated_requests_in_order(self, tmp_path):
+        path = tmp_path / 'recording.jsonl'
+        write_recording(path, interaction('GET /a', '1'), interaction('GET /a', '2'))
+        replayer = Replayer(path)
+        assert [replayer.response('GET /a').text for _ in range(3)] == ['1', '2', '2']
+
+    def it_waits_the_configured_latency(self, tmp_path, monkeypatch):
+        path = tmp_path / 'recording.jsonl'
+        write_recording(path, interaction('GET /a', '1', elapsed=0.25))
+        sleeps = []
+        monkeypatch.setattr(time, 'sleep', sleeps.append)
+        Replayer(path, latency=0.1).response('GET /a')
+        Replayer(path, latency=-1).response('GET /a')
+        Replayer(path).response('GET /a')
+        assert sleeps == [0.1, 0.25]
+
+    def it_fails_on_requests_that_were_not_recorded(self, tmp_path):
+        path = tmp_path / 'recording.jsonl'
+        write_recording(path)
+        with pytest.raises(fire.core.FireError, match='no recorded response for GET /b'):
+            Replayer(path).response('GET /b')
+
+
+class TestRecordAndReplay:
+    def it_replays_a_recorded_run_without_reddit(self, stub_reddit, tmp_path):
+        recording = tmp_path / 'recording.jsonl'
+        recorded = RedditCli(stub_reddit.config_path, no_cache=True, record=str(recording)).post(
+            'aww', post_sorting='new', limit=150,
+        )
+        assert 'stub-token' not in recording.read_text()
+        requests = len(stub_reddit.requests)
+
+        replayed = RedditCli(stub_reddit.config_path, no_cache=True, replay=str(recording)).post(
+            'aww', post_sorting='new', limit=150,
+        )
+        assert replayed == recorded
+        assert len(stub_reddit.requests) == requests
+
+    def it_keeps_the_real_stores_out_of_replays(self, stub_reddit, tmp_path):
+        recording = tmp_path / 'recording.jsonl'
+        RedditCli(stub_reddit.config_path, record=str(recording)).post('aww', limit=2)
+        cli = RedditCli(stub_reddit.config_path, archive=True, replay=str(recording))
+        cache_dir = cli.cache_dir
+        assert cache_dir != get_cache_dir()
+        assert cli.archive.path.parent == cache_dir
+        # Nothing of the recording's run is served from the cache, so the replay answers the request
+        assert cli.post('aww', limit=2, incremental=True)[1:] == ['- Post 0 in r/aww', '- Post 1 in r/aww']
+        assert not (get_cache_dir() / 'marks.json').exists()
+        assert not get_archive_path().exists()
+        del cli
+        assert not cache_dir.exists()
+
+    def it_reports_requests_missing_from_the_recording(self, stub_reddit, tmp_path):
+        recording = tmp_path / 'recording.jsonl'
+        RedditCli(stub_reddit.config_path, no_cache=True, record=str(recording)).post('aww', limit=1)
+        cli = RedditCli(stub_reddit.config_path, no_cache=True, replay=str(recording))
+        with pytest.raises(fire.core.FireError, match='no recorded response for GET /r/python/top'):
+            cli.post('python', limit=1)
+
+    def it_only_records_with_the_sync_backend(self, mock_reddit, tmp_path):
+        with pytest.raises(fire.core.FireError, match='Only the sync backend'):
+            RedditCli('tests/.exampleconfig', backend='async', replay=str(tmp_path / 'x'))
+        with pytest.raises(fire.core.FireError, match='not both'):
+            RedditCli('tests/.exampleconfig', record='a', replay='b')
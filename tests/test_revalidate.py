@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import threading
+
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.requestor import build_response
+from reddit_get.revalidate import (
+    ListingState,
+    ListingUnchanged,
+    Revalidation,
+    Validator,
+)
+from reddit_get.timings import Timings
+
+LISTING_URL = 'https://oauth.reddit.com/r/aww/top'
+
+
+class TestValidator:
+    def it_is_taken_from_a_response(self):
+        response = build_response(200, {'ETag': '"abc"', 'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'}, '{}')
+        validator = Validator.from_response(response)
+        assert validator.etag == '"abc"'
+        assert validator.conditional_headers() == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Sat, 17 Oct 2026 10:00:00 GMT',
+        }
+
+
+class TestListingState:
+    def it_takes_the_validator_of_a_new_listing(self):
+        state = ListingState(None)
+        state.check(build_response(200, {'ETag': '"abc"'}, '{}'))
+        assert state.validator.etag == '"abc"'
+
+    def it_detects_a_not_modified_listing(self):
+        previous = Validator('"abc"', None, 'digest')
+        state = ListingState(previous)
+        with pytest.raises(ListingUnchanged):
+            state.check(build_response(304, {}, ''))
+        assert state.validator == previous
+
+    def it_compares_the_body_when_reddit_ignores_the_conditional_request(self):
+        previous = Validator.from_response(build_response(200, {}, '{"data": 1}'))
+        with pytest.raises(ListingUnchanged):
+            ListingState(previous).check(build_response(200, {}, '{"data": 1}'))
+        state = ListingState(previous)
+        state.check(build_response(200, {}, '{"data": 2}'))
+        assert state.validator != previous
+
+
+class TestRevalidation:
+    def it_hands_out_the_state_for_the_first_request_only(self):
+        revalidation = Revalidation()
+        assert revalidation.take(LISTING_URL) is None
+        with revalidation.listing(None, '/r/aww/') as state:
+            assert revalidation.take(LISTING_URL) is state
+            assert revalidation.take(LISTING_URL) is None
+
+    def it_hands_out_the_state_for_the_listing_only(self):
+        revalidation = Revalidation()
+        with revalidation.listing(None, '/r/aww/') as state:
+            assert revalidation.take('https://oauth.reddit.com/api/v1/me') is None
+            assert revalidation.take('https://oauth.reddit.com/r/news/hot') is None
+            assert revalidation.take('https://oauth.reddit.com/r/AWW/top') is state
+
+    def it_keeps_listings_of_other_threads_apart(self):
+        revalidation = Revalidation()
+        taken = []
+        with revalidation.listing(None, '/r/aww/'):
+            thread = threading.Thread(target=lambda: taken.append(revalidation.take(LISTING_URL)))
+            thread.start()
+            thread.join()
+        assert taken == [None]
+
+
+class TestPostRevalidation:
+    def expire_cache(self, cli):
+        for path in cli.cache.directory.glob('*.json'):
+            entry = json.loads(path.read_text())
+            entry['expires_at'] = 0
+            path.write_text(json.dumps(entry))
+
+    def run(self, stub_reddit, limit=5, config_path=None):
+        cli = RedditCli(config_path or stub_reddit.config_path, no_token_cache=True)
+        cli.timings = Timings()
+        return cli, cli.post('aww', limit=limit)
+
+    def spans(self, cli, name):
+        return [span.attributes for span in cli.timings.spans if span.name == name]
+
+    def it_reuses_an_expired_listing_reddit_says_did_not_change(self, stub_reddit):
+        cli, first = self.run(stub_reddit)
+        self.expire_cache(cli)
+        cli, second = self.run(stub_reddit)
+        assert second == first
+        assert [span['status'] for span in self.spans(cli, 'http') if '/r/aww/' in span['url']] == [304]
+        assert self.spans(cli, 'listing')[0]['unchanged'] is True
+        # The copy is fresh again
+        cli, _ = self.run(stub_reddit)
+        assert not self.spans(cli, 'http')
+
+    def it_replaces_an_expired_listing_that_changed(self, stub_reddit):
+        cli, first = self.run(stub_reddit)
+        self.expire_cache(cli)
+        stub_reddit.started_at += 60
+        cli, second = self.run(stub_reddit)
+        assert second == first
+        assert [span['status'] for span in self.spans(cli, 'http') if '/r/aww/' in span['url']] == [200]
+        assert 'unchanged' not in self.spans(cli, 'listing')[0]
+
+    def it_does_not_revalidate_listings_of_several_pages(self, stub_reddit):
+        cli, _ = self.run(stub_reddit, limit=150)
+        self.expire_cache(cli)
+        cli, _ = self.run(stub_reddit, limit=150)
+        assert [span['status'] for span in self.spans(cli, 'http') if '/r/aww/' in span['url']] == [200, 200]
+
+    def it_revalidates_the_listing_when_logging_in_as_a_user(self, stub_reddit, tmp_path):
+        # Logging in with a password makes PRAW check it with /api/v1/me before the listing is requested
+        config = tmp_path / 'userconfig'
+        config.write_text(
+            Path(stub_reddit.config_path).read_text() + 'username = "stubuser"\npassword = "stubpassword"\n',
+        )
+        cli, _ = self.run(stub_reddit, config_path=str(config))
+        self.expire_cache(cli)
+        stub_reddit.started_at += 60
+        cli, second = self.run(stub_reddit, config_path=str(config))
+        assert second[1] == '- Post 0 in r/aww'
+        assert [span['status'] for span in self.spans(cli, 'http') if '/r/aww/' in span['url']] == [200]
+        assert 'unchanged' not in self.spans(cli, 'listing')[0]
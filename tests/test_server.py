@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.server import (
+    QueryServer,
+    send_query,
+)
+
+
+@pytest.fixture
+def query_server(tmp_path, stub_reddit):
+    cli = RedditCli(stub_reddit.config_path, no_cache=True)
+    server = QueryServer(tmp_path / 's.sock', cli)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestQueryServer:
+    def it_answers_post_queries_like_post(self, query_server, stub_reddit):
+        client = RedditCli(stub_reddit.config_path)
+        result = client.client('aww', limit=2, header=False, socket=str(query_server.path))
+        assert result == ['- Post 0 in r/aww', '- Post 1 in r/aww']
+        assert result == query_server.cli.post('aww', limit=2, header=False)
+
+    def it_authenticates_only_once(self, query_server, stub_reddit):
+        for _ in range(3):
+            send_query(query_server.path, 'post', {'subreddit': 'aww', 'limit': 1})
+        assert stub_reddit.requests.count('/api/v1/access_token') == 1
+
+    def it_reports_errors_to_the_client(self, query_server):
+        with pytest.raises(fire.core.FireError, match='You may only get between'):
+            send_query(query_server.path, 'post', {'subreddit': 'aww', 'limit': 0})
+        with pytest.raises(fire.core.FireError, match='unexpected keyword'):
+            send_query(query_server.path, 'post', {'subreddit': 'aww', 'bogus': 1})
+        with pytest.raises(fire.core.FireError, match='stream can not be used'):
+            send_query(query_server.path, 'post', {'subreddit': 'aww', 'stream': True})
+        with pytest.raises(fire.core.FireError, match='batch can not be run'):
+            send_query(query_server.path, 'batch', {})
+
+    def it_rejects_malformed_requests(self, query_server):
+        assert query_server.answer(b'not json') == {
+            'error': 'Requests must be JSON objects with a command and its kwargs',
+        }
+        assert json.dumps(query_server.answer(b'{"kwargs": {}}')).startswith('{"error"')
+
+    def it_refuses_to_start_twice_on_one_socket(self, query_server):
+        with pytest.raises(fire.core.FireError, match='already listening'):
+            QueryServer(query_server.path, query_server.cli)
+
+    def it_replaces_a_stale_socket_file(self, tmp_path, mock_reddit):
+        path = tmp_path / 'stale.sock'
+        path.touch()
+        server = QueryServer(path, RedditCli('tests/.exampleconfig'))
+        server.server_close()
+        assert not path.exists()
+
+
+class TestClient:
+    def it_explains_when_no_server_is_running(self, tmp_path, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError, match='start one with `reddit-get serve`'):
+            cli.client('aww', socket=str(tmp_path / 'missing.sock'))
+
+
+class TestStubReddit:
+    def it_paginates_listings(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_cache=True)
+        result = cli.post('aww', post_sorting='new', limit=250, header=False)
+        assert len(result) == 250
+        assert result[-1] == '- Post 249 in r/aww'
+        assert sum(path.startswith('/r/aww/new') for path in stub_reddit.requests) == 3
+
+    def it_refuses_missing_subreddits(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path, no_cache=True)
+        with pytest.raises(fire.core.FireError):
+            cli.post('private')
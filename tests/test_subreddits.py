@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+from fire.core import FireError
+from praw.exceptions import (
+    RedditAPIException,
+    RedditErrorItem,
+)
+from prawcore.exceptions import (
+    Forbidden,
+    NotFound,
+    Redirect,
+    ServerError,
+)
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.requestor import build_response
+from reddit_get.subreddits import (
+    AVAILABLE_TTL,
+    UNAVAILABLE_TTL,
+    SubredditCache,
+    SubredditInfo,
+    unavailable_status,
+)
+
+NOW = 1_700_000_000.0
+
+
+def response(status, body=None, headers=None):
+    return build_response(status, headers or {}, json.dumps(body or {}))
+
+
+@pytest.fixture
+def clock():
+    return SimpleNamespace(now=NOW)
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return SubredditCache(tmp_path / 'subreddits.json', clock=lambda: clock.now)
+
+
+class TestUnavailableStatus:
+    @pytest.mark.parametrize(
+        ('error', 'status'),
+        [
+            (Forbidden(response(403, {'reason': 'private'})), 'private'),
+            (Forbidden(response(403, {'reason': 'quarantined'})), 'quarantined'),
+            (NotFound(response(404, {'reason': 'banned'})), 'banned'),
+            (NotFound(response(404)), 'missing'),
+            (Redirect(response(302, headers={'location': 'https://reddit.com/subreddits/search.json?q=x'})), 'missing'),
+            (RedditAPIException([RedditErrorItem('SUBREDDIT_NOEXIST', 'Not found')]), 'restricted'),
+            (RedditAPIException([RedditErrorItem('RATELIMIT', 'Slow down')]), None),
+            (Redirect(response(302, headers={'location': 'https://reddit.com/login/'})), None),
+            (ServerError(response(500)), None),
+            (None, None),
+        ],
+    )
+    def it_tells_why_a_subreddit_can_not_be_read(self, error, status):
+        assert unavailable_status(error) == status
+
+
+class TestSubredditCache:
+    def it_remembers_subreddits_from_their_listings(self, cache):
+        cache.seen('AWW', SimpleNamespace(subreddit='aww', subreddit_subscribers=1000))
+        assert cache.get('Aww') == SubredditInfo('aww', 'available', 1000, NOW)
+
+    def it_remembers_unavailable_subreddits_for_a_shorter_time(self, cache, clock):
+        cache.unavailable('secret', 'private')
+        cache.seen('aww', SimpleNamespace(subreddit='aww'))
+        clock.now += UNAVAILABLE_TTL
+        assert cache.get('secret') is None
+        assert cache.get('aww') is not None
+        clock.now = NOW + AVAILABLE_TTL
+        assert cache.get('aww') is None
+
+    def it_only_writes_when_something_changed(self, cache, clock):
+        cache.seen('aww', SimpleNamespace(subreddit='aww'))
+        clock.now += 60
+        cache.seen('aww', SimpleNamespace(subreddit='aww'))
+        cache.seen('AWW', SimpleNamespace(subreddit='Aww'))
+        assert cache.get('aww').checked_at == NOW
+        cache.unavailable('aww', 'banned')
+        cache.seen('aww', SimpleNamespace(subreddit='aww'))
+        assert cache.get('aww').available
+
+    def it_ignores_broken_files(self, cache):
+        cache.path.write_text('{"aww": {"name": "aww"}, "broken": [1]')
+        assert cache.get('aww') is None
+
+
+class TestUnavailableSubreddits:
+    def it_only_asks_reddit_once(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        with pytest.raises(FireError, match="'r/private' is private$"):
+            cli.post('private')
+        requests = len(stub_reddit.requests)
+        with pytest.raises(FireError, match="'r/private' is private .as of"):
+            RedditCli(stub_reddit.config_path).post('private', post_sorting='new')
+        assert len(stub_reddit.requests) == requests
+
+    def it_leaves_them_out_of_batches(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path)
+        with pytest.raises(FireError):
+            cli.post('private')
+        assert cli.batch('private,aww', limit=1, header=False) == ['- Post 0 in r/aww']
+        assert "Skipping r/private: Subreddit 'r/private' is private" in capsys.readouterr().err
+        assert not any(path.startswith('/r/private/top?t=all&limit=1&') for path in stub_reddit.requests)
+
+    @pytest.mark.parametrize('concurrency', [1, 4])
+    def it_skips_them_when_they_fail_in_a_batch(self, stub_reddit, capsys, concurrency):
+        cli = RedditCli(stub_reddit.config_path)
+        lines = cli.batch('aww,private,news', limit=1, header=False, concurrency=concurrency)
+        assert lines == ['- Post 0 in r/aww', '- Post 0 in r/news']
+        assert "Skipping r/private: Subreddit 'r/private' is private" in capsys.readouterr().err
+        assert not cli.subreddits.get('private').available
+
+    def it_skips_them_when_they_fail_in_a_feed(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path)
+        lines = cli.feed('private,aww', limit=1, custom_header='{subreddit}')
+        assert lines == ['r/aww', '- r/aww: Post 0 in r/aww']
+        assert 'Skipping r/private' in capsys.readouterr().err
+
+    def it_checks_again_without_the_cache(self, stub_reddit):
+        with pytest.raises(FireError):
+            RedditCli(stub_reddit.config_path).post('private')
+        requests = len(stub_reddit.requests)
+        with pytest.raises(FireError, match='is private$'):
+            RedditCli(stub_reddit.config_path, no_cache=True).post('private')
+        assert len(stub_reddit.requests) > requests
+
+
+class TestAsyncBackend:
+    @pytest.fixture
+    def asyncpraw(self):
+        return pytest.importorskip('asyncpraw')
+
+    def it_only_asks_reddit_once(self, asyncpraw):
+        from asyncprawcore.exceptions import Forbidden as AsyncForbidden
+
+        requested = []
+
+        class Listing:
+            def __init__(self, name):
+                self.name = name
+                self.done = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                requested.append(self.name)
+                if self.name == 'private':
+                    raise AsyncForbidden(SimpleNamespace(status=403))
+                if self.done:
+                    raise StopAsyncIteration
+                self.done = True
+                return Mock(title=self.name)
+
+        class Subreddits:
+            async def __call__(self, name):
+                return Mock(top=lambda **kwargs: Listing(name))
+
+        reddit = asyncpraw.Reddit()
+        reddit.subreddit = Subreddits()
+        cli = RedditCli('tests/.exampleconfig', backend='async')
+        with patch.object(asyncpraw, 'Reddit', return_value=reddit):
+            with pytest.raises(FireError, match="'r/private' is private$"):
+                cli.post('private', limit=1)
+            with pytest.raises(FireError, match="'r/private' is private .as of"):
+                cli.post('private', limit=1, stream=True)
+            assert cli.batch('private,aww', limit=1, header=False) == ['- aww']
+        assert requested == ['private', 'aww', 'aww']
+
+    def it_skips_them_when_they_fail_in_a_batch(self, asyncpraw, capsys):
+        from asyncprawcore.exceptions import NotFound as AsyncNotFound
+
+        class Listing:
+            def __init__(self, name):
+                self.posts = [] if name == 'gone' else [Mock(title=name)]
+                self.name = name
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                if self.name == 'gone':
+                    raise AsyncNotFound(SimpleNamespace(status=404))
+                if not self.posts:
+                    raise StopAsyncIteration
+                return self.posts.pop()
+
+        class Subreddits:
+            async def __call__(self, name):
+                return Mock(top=lambda **kwargs: Listing(name))
+
+        reddit = asyncpraw.Reddit()
+        reddit.subreddit = Subreddits()
+        cli = RedditCli('tests/.exampleconfig', backend='async', no_cache=True)
+        with patch.object(asyncpraw, 'Reddit', return_value=reddit):
+            assert cli.batch('aww,gone,news', limit=1, header=False) == ['- aww', '- news']
+        assert "Skipping r/gone: Subreddit 'r/gone' does not exist" in capsys.readouterr().err
+
+
+class TestAboutCommand:
+    def it_reports_each_subreddit(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        assert cli.about('aww,private') == [
+            '- r/aww: available, 1000 subscribers',
+            '- r/private: private, unknown subscribers',
+        ]
+
+    def it_uses_what_listings_taught_it(self, stub_reddit):
+        cli = RedditCli(stub_reddit.config_path)
+        cli.post('aww', limit=1)
+        requests = len(stub_reddit.requests)
+        assert cli.about('aww', output_format='{name} {subscribers}') == ['aww 1000']
+        assert len(stub_reddit.requests) == requests
+        cli.about('aww', refresh=True)
+        assert stub_reddit.requests[-1].startswith('/r/aww/about')
+
+    @pytest.mark.parametrize('kwargs', [{'subreddits': ''}, {'concurrency': 0}, {'output_format': '{title}'}])
+    def it_rejects_invalid_arguments(self, kwargs):
+        with pytest.raises(FireError):
+            RedditCli('tests/.exampleconfig').about(**{'subreddits': 'aww', **kwargs})
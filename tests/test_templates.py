@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import fire
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.templates import (
+    CompiledTemplate,
+    compile_template,
+    parse_field,
+)
+
+
+class TestParseField:
+    def it_returns_plain_names_without_a_path(self):
+        assert parse_field('title') == ('title', ())
+
+    def it_splits_attribute_and_index_lookups(self):
+        assert parse_field('media.oembed[title]') == ('media', ((True, 'oembed'), (False, 'title')))
+
+    def it_rejects_malformed_lookups(self):
+        with pytest.raises(fire.core.FireError, match='Invalid template field'):
+            parse_field('title[0')
+
+
+class TestCompiledTemplate:
+    def it_renders_attributes(self):
+        post = SimpleNamespace(title='hello', score=3)
+        assert CompiledTemplate('- {title} ({score})').render(post) == '- hello (3)'
+
+    def it_renders_nested_attributes(self):
+        post = SimpleNamespace(author=SimpleNamespace(name='someone'), preview={'images': ['a.png']})
+        template = CompiledTemplate('{author.name}: {preview[images][0]}')
+        assert template.render(post) == 'someone: a.png'
+        assert template.keys == {'author', 'preview'}
+        assert template.nested
+
+    def it_applies_conversions_and_format_specs(self):
+        post = SimpleNamespace(title='hi', score=42, ratio=0.9)
+        assert CompiledTemplate('{title!r:>6}|{score:05d}|{ratio:.0%}').render(post) == "  'hi'|00042|90%"
+
+    def it_renders_repeated_fields_and_literals(self):
+        post = SimpleNamespace(title='x')
+        assert CompiledTemplate('{{{title}}} {title}\n').render(post) == '{x} x\n'
+
+    def it_matches_str_format(self):
+        post = SimpleNamespace(title='A title', score=1234, author='me')
+        template = 'Title - {title} 🤪\n\t{score:,} by {author!s:<5}|'
+        assert CompiledTemplate(template).render(post) == template.format(**vars(post))
+
+    def it_renders_mappings_with_a_custom_lookup(self):
+        assert CompiledTemplate('{a}-{b}').render({'a': 1, 'b': 2}, dict.__getitem__) == '1-2'
+
+    def it_is_not_nested_for_plain_fields(self):
+        assert not CompiledTemplate('{title}').nested
+
+    @pytest.mark.parametrize(
+        'template',
+        ['{}', '{0}', '{title:{width}}', '{title!x}', '{title', 'title}'],
+    )
+    def it_rejects_unsupported_templates(self, template):
+        with pytest.raises(fire.core.FireError):
+            CompiledTemplate(template)
+
+
+class TestCompileTemplate:
+    def it_compiles_each_template_once(self):
+        assert compile_template('{title} once') is compile_template('{title} once')
+
+
+class TestNestedPostOutput:
+    def it_renders_nested_fields_of_posts(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        posts = [Mock(title='first', author=Mock(name='unused')) for _ in range(2)]
+        for post in posts:
+            post.author.name = 'someone'
+        with patch.object(cli.reddit, 'subreddit') as subreddit:
+            subreddit.return_value.top.return_value = posts
+            result = cli.post(subreddit='testsubreddit', limit=2, output_format='{title} by {author.name}')
+        assert result[1:] == ['first by someone'] * 2
+
+    def it_reports_bad_format_specs_as_fire_errors(self, mock_reddit):
+        cli = RedditCli('tests/.exampleconfig')
+        with pytest.raises(fire.core.FireError):
+            cli.post(subreddit='testsubreddit', limit=1, output_format='{title:d}')
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import atexit
+import json
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import fire
+from praw.exceptions import (
+    RedditAPIException,
+    RedditErrorItem,
+)
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.timings import Timings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """The exit handlers registered by the test, instead of running them at exit."""
+    handlers = []
+    monkeypatch.setattr(atexit, 'register', lambda func, *args: handlers.append((func, args)))
+    return handlers
+
+
+class TestTimings:
+    def it_records_spans_with_attributes(self):
+        clock = FakeClock()
+        timings = Timings(clock=clock)
+        with timings.span('http', method='GET') as span:
+            clock.now += 0.25
+            span['bytes'] = 2048
+        assert timings.spans[0].name == 'http'
+        assert timings.spans[0].duration == 0.25
+        assert timings.spans[0].attributes == {'method': 'GET', 'bytes': 2048}
+
+    def it_records_nothing_when_disabled(self):
+        timings = Timings(enabled=False)
+        with timings.span('http'):
+            pass
+        timings.add('http', 0, 1)
+        assert timings.spans == []
+
+    def it_summarizes_spans_by_name(self):
+        clock = FakeClock()
+        timings = Timings(clock=clock)
+        timings.add('http', 1000, 0.1, bytes=1024)
+        timings.add('http', 1000, 0.3, bytes=1024)
+        timings.add('render', 1000, 0.002)
+        clock.now += 0.5
+        assert timings.summary() == [
+            'Timings (total 500.0 ms)',
+            '  http       2 x     400.0 ms  (max 300.0 ms), 2.0 KiB',
+            '  render     1 x       2.0 ms  (max 2.0 ms)',
+        ]
+
+    def it_exports_chrome_traces(self, tmp_path):
+        timings = Timings()
+        timings.add('http', 1.5, 0.25, status=200)
+        timings.write(tmp_path / 'trace.json')
+        (event,) = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+        assert (event['name'], event['ph'], event['ts'], event['dur']) == ('http', 'X', 1_500_000, 250_000)
+        assert event['args'] == {'status': 200}
+
+    def it_exports_otlp_traces(self, tmp_path):
+        timings = Timings()
+        timings.add('http', 1.5, 0.25, status=200, url='/r/aww/top')
+        timings.write(tmp_path / 'trace.json', 'otlp')
+        trace = json.loads((tmp_path / 'trace.json').read_text())
+        (span,) = trace['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert span['name'] == 'http'
+        assert (span['startTimeUnixNano'], span['endTimeUnixNano']) == ('1500000000', '1750000000')
+        assert span['attributes'] == [
+            {'key': 'status', 'value': {'intValue': '200'}},
+            {'key': 'url', 'value': {'stringValue': '/r/aww/top'}},
+        ]
+        assert len(span['traceId']) == 32
+
+
+class TestCliTimings:
+    def it_times_each_stage_of_a_post(self, stub_reddit, registered):
+        cli = RedditCli(stub_reddit.config_path, no_cache=True, timings=True)
+        cli.post('aww', limit=150)
+        names = {span.name for span in cli.timings.spans}
+        assert {'load_configs', 'authenticate', 'listing', 'http', 'render'} <= names
+        http = [span for span in cli.timings.spans if span.name == 'http']
+        # The access token and two pages of posts
+        assert len(http) == 3
+        assert all(span.attributes['status'] == 200 and span.attributes['bytes'] > 0 for span in http)
+
+    def it_reports_at_exit(self, stub_reddit, registered, tmp_path, capsys):
+        trace = tmp_path / 'trace.json'
+        cli = RedditCli(stub_reddit.config_path, timings=True, trace=str(trace))
+        cli.post('aww', limit=1)
+        ((func, args),) = registered
+        func(*args)
+        assert capsys.readouterr().err.startswith('Timings (total ')
+        assert json.loads(trace.read_text())['traceEvents']
+
+    def it_reports_a_trace_it_can_not_write(self, stub_reddit, registered, tmp_path, capsys):
+        cli = RedditCli(stub_reddit.config_path, trace=str(tmp_path / 'missing' / 'trace.json'))
+        cli.post('aww', limit=1)
+        ((func, args),) = registered
+        func(*args)
+        assert capsys.readouterr().err.startswith('ERROR: Could not write the trace to ')
+
+    def it_times_retry_sleeps(self, mock_reddit, registered):
+        cli = RedditCli('tests/.exampleconfig', timings=True)
+        error = RedditAPIException([RedditErrorItem('RATELIMIT', message='slow down')])
+        with patch('time.sleep'):
+            cli._execute_with_retry(Mock(side_effect=[error, 'done']))
+        (span,) = [span for span in cli.timings.spans if span.name == 'retry_sleep']
+        assert span.attributes == {'attempt': 1, 'error': 'RedditAPIException'}
+
+    def it_records_nothing_by_default(self, mock_reddit, registered):
+        cli = RedditCli('tests/.exampleconfig')
+        cli.post('aww', limit=1)
+        assert cli.timings.spans == []
+        assert registered == []
+
+    def it_rejects_unknown_trace_formats(self, mock_reddit):
+        with pytest.raises(fire.core.FireError, match='not a valid trace format'):
+            RedditCli('tests/.exampleconfig', trace='trace.json', trace_format='xml')
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import stat
+import threading
+
+from reddit_get import RedditCli
+from reddit_get.requestor import (
+    RedditGetRequestor,
+    build_response,
+)
+from reddit_get.tokens import (
+    REFRESH_MARGIN,
+    TokenCache,
+    get_token_cache_path,
+)
+
+TOKEN = {'access_token': 'abc', 'token_type': 'bearer', 'expires_in': 3600, 'scope': '*'}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenCache:
+    def it_counts_down_the_lifetime_of_stored_tokens(self, tmp_path):
+        clock = FakeClock()
+        cache = TokenCache(tmp_path / 'tokens.json', clock=clock)
+        cache.set('key', TOKEN, requested_at=clock.now)
+        clock.now += 600
+        assert cache.get('key') == {**TOKEN, 'expires_in': 3000}
+
+    def it_refreshes_tokens_near_expiry(self, tmp_path):
+        clock = FakeClock()
+        cache = TokenCache(tmp_path / 'tokens.json', clock=clock)
+        cache.set('key', TOKEN, requested_at=clock.now)
+        clock.now += 3600 - REFRESH_MARGIN
+        assert cache.get('key') is None
+
+    def it_drops_expired_and_invalidated_tokens(self, tmp_path):
+        clock = FakeClock()
+        cache = TokenCache(tmp_path / 'tokens.json', clock=clock)
+        cache.set('old', TOKEN, requested_at=clock.now)
+        clock.now += 3600
+        cache.set('new', TOKEN, requested_at=clock.now)
+        assert set(json.loads(cache.path.read_text())) == {'new'}
+        cache.invalidate('new')
+        assert cache.get('new') is None
+
+    def it_is_only_readable_by_its_owner(self, tmp_path):
+        cache = TokenCache(tmp_path / 'tokens.json')
+        cache.set('key', TOKEN, requested_at=cache.clock())
+        assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+
+    def it_ignores_a_corrupt_file(self, tmp_path):
+        (tmp_path / 'tokens.json').write_text('{"key": 1')
+        assert TokenCache(tmp_path / 'tokens.json').get('key') is None
+
+    def it_keys_tokens_by_credentials(self):
+        assert TokenCache.key('url', [('grant_type', 'x')], ('id', 'secret')) != TokenCache.key(
+            'url', [('grant_type', 'x')], ('id', 'other secret'),
+        )
+
+    def it_lives_next_to_the_config(self, tmp_path):
+        assert get_token_cache_path(tmp_path / '.redditgetrc') == tmp_path / '.redditgetrc.tokens.json'
+
+
+class TestRequestorTokenSharing:
+    def make_requestor(self, tmp_path, responses):
+        requestor = RedditGetRequestor(
+            'reddit-get tests',
+            oauth_url='https://oauth',
+            reddit_url='https://www',
+            token_cache=TokenCache(tmp_path / 't.json'),
+        )
+        sent = []
+
+        def send(method, url, *args, **kwargs):
+            sent.append(url)
+            return responses.pop(0)
+
+        requestor._send_or_replay = send
+        return requestor, sent
+
+    def it_reuses_tokens_and_forgets_revoked_ones(self, tmp_path):
+        token = build_response(200, {}, json.dumps(TOKEN))
+        requestor, sent = self.make_requestor(tmp_path, [token, build_response(401, {}, '{}')])
+        auth = {'auth': ('id', 'secret'), 'data': [('grant_type', 'client_credentials')]}
+        assert requestor.request('post', 'https://www/api/v1/access_token', **auth).json()['access_token'] == 'abc'
+        assert requestor.request('post', 'https://www/api/v1/access_token', **auth).json()['access_token'] == 'abc'
+        assert sent == ['https://www/api/v1/access_token']
+
+        requestor.request('get', 'https://oauth/r/aww/top')
+        assert requestor.token_cache.get(requestor._token_key) is None
+
+
+class TestSharedTokens:
+    def it_reuses_the_token_of_an_earlier_process(self, stub_reddit):
+        RedditCli(stub_reddit.config_path, no_cache=True).post('aww', limit=1)
+        RedditCli(stub_reddit.config_path, no_cache=True).post('aww', limit=1)
+        assert stub_reddit.requests.count('/api/v1/access_token') == 1
+
+    def it_requests_one_token_between_concurrent_processes(self, stub_reddit):
+        def run():
+            RedditCli(stub_reddit.config_path, no_cache=True).post('aww', limit=1)
+
+        threads = [threading.Thread(target=run) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert stub_reddit.requests.count('/api/v1/access_token') == 1
+
+    def it_can_be_turned_off(self, stub_reddit):
+        for _ in range(2):
+            RedditCli(stub_reddit.config_path, no_cache=True, no_token_cache=True).post('aww', limit=1)
+        assert stub_reddit.requests.count('/api/v1/access_token') == 2
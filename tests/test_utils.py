@@ -10,7 +10,11 @@ from reddit_get import (
     get_post_sorting_option,
     get_reddit_query_function,
 )
-from reddit_get.utils import load_configs
+from reddit_get.utils import (
+    load_configs,
+    parse_submission_ids,
+    parse_subreddits,
+)
 
 
 class TestLoadConfigs:
@@ -89,6 +93,44 @@ class TestLoadConfigs:
                 load_configs('tests/.invalidtomlfile')
 
 
+class TestParseSubreddits:
+    def it_splits_comma_separated_strings(self):
+        assert parse_subreddits('news,worldnews') == ['news', 'worldnews']
+
+    def it_keeps_the_first_of_duplicate_subreddits(self):
+        assert parse_subreddits(('b', 'a', 'r/b')) == ['b', 'a']
+
+    def it_appends_subreddits_from_a_manifest(self, tmp_path):
+        manifest = tmp_path / 'manifest'
+        manifest.write_text('  # ignored\nc\n\n/r/d\n')
+        assert parse_subreddits('a', str(manifest)) == ['a', 'c', 'd']
+
+    def it_raises_a_fireerror_for_a_missing_manifest(self, tmp_path):
+        with pytest.raises(fire.core.FireError, match='Unable to read subreddit manifest'):
+            parse_subreddits('', str(tmp_path / 'missing'))
+
+
+class TestParseSubmissionIds:
+    def it_turns_ids_and_links_into_fullnames(self):
+        assert parse_submission_ids(('1AbCdE', 't3_2fghij', '/r/news/comments/3klmno/')) == [
+            't3_1abcde',
+            't3_2fghij',
+            't3_3klmno',
+        ]
+
+    def it_accepts_ids_fire_turned_into_numbers(self):
+        assert parse_submission_ids(123456) == ['t3_123456']
+
+    def it_appends_ids_from_a_file(self, tmp_path):
+        id_file = tmp_path / 'ids'
+        id_file.write_text('# refreshed daily\nabc\n\nt3_def\nabc\n')
+        assert parse_submission_ids('xyz', str(id_file)) == ['t3_xyz', 't3_abc', 't3_def']
+
+    def it_raises_a_fireerror_for_invalid_ids(self):
+        with pytest.raises(fire.core.FireError, match='not a valid submission id'):
+            parse_submission_ids('t1_abc')
+
+
 class TestUtils:
     class TestErrors:
         class TestGetPostSortingOption:
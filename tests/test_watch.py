@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from reddit_get import RedditCli
+from reddit_get.types import SortingOption
+from reddit_get.watch import (
+    WatchedListing,
+    Watcher,
+)
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_listing(name='aww', limit=10, min_interval=30, max_interval=900):
+    return WatchedListing(name, SortingOption.NEW, limit, min_interval, max_interval)
+
+
+class TestWatchedListing:
+    def it_backs_off_while_nothing_is_posted(self):
+        listing = make_listing()
+        intervals = []
+        for now in (0, 100, 200, 300, 400, 500, 600):
+            listing.polled(0, now)
+            intervals.append(listing.interval)
+        assert intervals == [60, 120, 240, 480, 900, 900, 900]
+
+    def it_polls_often_enough_to_expect_half_a_listing(self):
+        listing = make_listing()
+        listing.polled(0, 0)
+        # 5 posts in 100 seconds, 5 of the 10 posts per poll are expected every 100 seconds
+        listing.polled(5, 100)
+        assert listing.interval == pytest.approx(100)
+        assert listing.next_poll_at == pytest.approx(200)
+
+    def it_polls_as_soon_as_possible_when_the_listing_overflows(self):
+        listing = make_listing()
+        listing.polled(0, 0)
+        listing.polled(10, 500)
+        assert listing.interval == 30
+
+
+class TestWatcher:
+    def it_polls_listings_when_they_are_due(self):
+        clock = FakeTime()
+        listings = [make_listing('busy'), make_listing('quiet')]
+        new_posts = {'busy': 10, 'quiet': 0}
+        polled = []
+
+        def poll(listing):
+            polled.append((listing.subreddit, clock.now))
+            return new_posts[listing.subreddit]
+
+        Watcher(listings, budget=60, clock=clock, sleep=clock.sleep).run(poll, max_polls=5)
+        assert polled == [('busy', 1000), ('quiet', 1001), ('busy', 1030), ('busy', 1060), ('quiet', 1061)]
+
+    def it_spreads_polls_within_the_budget(self):
+        clock = FakeTime()
+        listings = [make_listing(str(index)) for index in range(4)]
+        polled = []
+
+        def poll(listing):
+            polled.append(clock.now)
+            return 10
+
+        Watcher(listings, budget=6, clock=clock, sleep=clock.sleep).run(poll, max_polls=8)
+        assert [later - earlier for earlier, later in zip(polled, polled[1:])] == [10] * 7
+
+
+class TestWatchCommand:
+    def it_prints_new_posts_once(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        cli.watch('aww,news', limit=2, min_interval=0.01, max_interval=0.01, budget=60_000, max_polls=4)
+        assert capsys.readouterr().out.splitlines() == [
+            '- r/aww: Post 1 in r/aww',
+            '- r/aww: Post 0 in r/aww',
+            '- r/news: Post 1 in r/news',
+            '- r/news: Post 0 in r/news',
+        ]
+        assert stub_reddit.requests.count('/api/v1/access_token') == 1
+        assert len([path for path in stub_reddit.requests if path.startswith('/r/aww/new')]) == 2
+
+    def it_keeps_watching_when_a_subreddit_fails(self, stub_reddit, capsys):
+        cli = RedditCli(stub_reddit.config_path, no_token_cache=True)
+        cli.watch(['private', 'aww'], limit=1, min_interval=0.01, max_interval=0.01, budget=60_000, max_polls=2)
+        out, err = capsys.readouterr()
+        assert out.splitlines() == ['- r/aww: Post 0 in r/aww']
+        assert 'Could not poll r/private' in err
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [{'subreddits': ''}, {'limit': 0}, {'min_interval': 10, 'max_interval': 5}, {'budget': 0}],
+    )
+    def it_rejects_invalid_arguments(self, kwargs):
+        from fire.core import FireError
+
+        with pytest.raises(FireError):
+            RedditCli('tests/.exampleconfig').watch(**{'subreddits': 'aww', **kwargs})